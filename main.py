@@ -19,38 +19,53 @@ DEFAULT_STATIC_CSV = RESOURCES_DIR / "static_mapping.csv"
 DEFAULT_STRUCTURAL_CSV = RESOURCES_DIR / "structural_mapping.csv"
 
 
-def run_pipeline(preprocessing_input: Path, base_root: Path, trial: str = "IMPRESS") -> OmopTables:
+def run_pipeline(
+    preprocessing_input: Path | None,
+    base_root: Path,
+    trial: str = "IMPRESS",
+    harmonized_input: Path | None = None,
+) -> OmopTables:
     """
     End-to-end run of OMOP ETL.
+
+    With harmonized_input (a normalized parquet/ipc harmonized output dir), preprocessing and
+    harmonization are skipped and the patients are loaded from that output.
     """
+    if (preprocessing_input is None) == (harmonized_input is None):
+        raise ValueError("Provide exactly one of preprocessing_input or harmonized_input.")
+
     base_root.mkdir(parents=True, exist_ok=True)
 
     # set up configs & meta
-    ecrf_config = make_ecrf_config(trial=trial)
     _meta = RunMetadata.create(trial)
 
-    # run preprocessing
-    preprocessor = PreprocessService(outdir=base_root, layout=Layout.TRIAL_TIMESTAMP_RUN)
-    preprocessing_result: PreprocessResult = preprocessor.run(
-        trial=trial,
-        input_path=preprocessing_input,
-        config=ecrf_config,
-        formats="csv",
-        meta=_meta,
-        combine_key="SubjectId",
-        filter_valid_cohorts=True,
-    )
+    if harmonized_input is not None:
+        harmonized_result = HarmonizedData.from_normalized(harmonized_input)
+    else:
+        ecrf_config = make_ecrf_config(trial=trial)
 
-    # run harmonization
-    harmonizer = HarmonizationService(outdir=base_root, layout=Layout.TRIAL_TIMESTAMP_RUN)
-    harmonized_result: HarmonizedData = harmonizer.run(
-        trial=trial,
-        input_path=preprocessing_result.output_path.data_file,
-        formats="csv",
-        write_wide=True,
-        write_normalized=True,
-        meta=_meta,
-    )
+        # run preprocessing
+        preprocessor = PreprocessService(outdir=base_root, layout=Layout.TRIAL_TIMESTAMP_RUN)
+        preprocessing_result: PreprocessResult = preprocessor.run(
+            trial=trial,
+            input_path=preprocessing_input,
+            config=ecrf_config,
+            formats="csv",
+            meta=_meta,
+            combine_key="SubjectId",
+            filter_valid_cohorts=True,
+        )
+
+        # run harmonization, parquet normalized output so later runs can start from it
+        harmonizer = HarmonizationService(outdir=base_root, layout=Layout.TRIAL_TIMESTAMP_RUN)
+        harmonized_result = harmonizer.run(
+            trial=trial,
+            input_path=preprocessing_result.output_path.data_file,
+            formats=["csv", "parquet"],
+            write_wide=True,
+            write_normalized=True,
+            meta=_meta,
+        )
 
     # print(f"Harmonized: {harmonized_result.patients[0:40]}")
 
@@ -58,7 +73,7 @@ def run_pipeline(preprocessing_input: Path, base_root: Path, trial: str = "IMPRE
     semantic_mapper = SemanticService(outdir=base_root, layout=Layout.TRIAL_TIMESTAMP_RUN)
     semantic_result: SemanticMappingResult = semantic_mapper.run(
         trial=trial,
-        input_path=None,  # todo: test running from just harmonized files later
+        input_path=harmonized_input,
         harmonized_data=harmonized_result,
         meta=_meta,
         write_output=True,
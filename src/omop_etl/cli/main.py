@@ -3,7 +3,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from omop_etl.db.postgres import PostgresOmopWriter
-from omop_etl.harmonization.models import HarmonizedData
+from omop_etl.harmonization.models.harmonized import HarmonizedData
 from omop_etl.harmonization.service import HarmonizationService
 from omop_etl.infra.io.types import Layout
 from omop_etl.infra.utils.run_context import RunMetadata
@@ -18,7 +18,7 @@ from omop_etl.omop.service import OmopService
 from omop_etl.omop.models.tables import OmopTables
 
 
-def run_pipeline(preprocessing_input: Path, base_root: Path, trial: str) -> HarmonizedData:
+def run_pipeline(preprocessing_input: Path, base_root: Path, trial: str, harmonization_cache: Path | None = None) -> HarmonizedData:
     base_root.mkdir(parents=True, exist_ok=True)
 
     ecrf_config = make_ecrf_config(trial=trial)
@@ -43,6 +43,7 @@ def run_pipeline(preprocessing_input: Path, base_root: Path, trial: str) -> Harm
         write_wide=True,
         write_normalized=True,
         meta=meta,
+        cache_dir=harmonization_cache,
     )
     return harmonized_result
 
@@ -74,17 +75,21 @@ def _build_tables(
     )
 
     omop_service = OmopService(concepts=concept_service)
-    return omop_service.build(harmonized.patients)
+    return omop_service.build(harmonized)
 
 
 def cmd_load(args: argparse.Namespace) -> int:
     configure_logger(level=args.log_level)
 
-    harmonized = run_pipeline(
-        preprocessing_input=args.input,
-        base_root=args.outdir,
-        trial=args.trial,
-    )
+    if args.from_harmonized is not None:
+        harmonized = HarmonizedData.from_normalized(args.from_harmonized)
+    else:
+        harmonized = run_pipeline(
+            preprocessing_input=args.input,
+            base_root=args.outdir,
+            trial=args.trial,
+            harmonization_cache=args.harmonization_cache,
+        )
 
     # todo: don't create new run context
     tables = _build_tables(
@@ -112,7 +117,14 @@ def main(argv: list[str] | None = None) -> int:
     sub = p.add_subparsers(dest="cmd", required=True)
 
     load = sub.add_parser("load", help="Run ETL and load OMOP tables into Postgres")
-    load.add_argument("--input", type=Path, required=True)
+    source = load.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=Path, default=None)
+    source.add_argument(
+        "--from-harmonized",
+        type=Path,
+        default=None,
+        help="Skip preprocessing and harmonization, load patients from this normalized parquet/ipc harmonized output dir",
+    )
     load.add_argument("--outdir", type=Path, required=True)
     load.add_argument("--trial", default="IMPRESS")
     load.add_argument("--static-mapping", type=Path, required=True)
@@ -122,6 +134,12 @@ def main(argv: list[str] | None = None) -> int:
     load.add_argument("--truncate", action="store_true")
     load.add_argument("--with-semantic", action="store_true", help="Enable semantic mapping")
     load.add_argument("--log-level", default="INFO")
+    load.add_argument(
+        "--harmonization-cache",
+        type=Path,
+        default=None,
+        help="Reuse harmonized output for unchanged preprocessed input from this cache dir",
+    )
     load.set_defaults(func=cmd_load)
 
     # allow DATABASE_URL env without forcing python-dotenv to be present in prod,
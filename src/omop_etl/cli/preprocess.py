@@ -19,7 +19,7 @@ def run_preprocessing(
     base_root: Path,
     trial: str = "IMPRESS",
     combine_key: str = "SubjectId",
-    output_format: Literal["csv", "tsv", "parquet"] = "csv",
+    output_format: Literal["csv", "tsv", "parquet", "ipc"] = "csv",
     only_cohort: bool | None = True,
     config: Path | None = None,
 ) -> PreprocessResult:
@@ -7,7 +7,7 @@ import polars as pl
 from omop_etl.infra.io.types import Layout, WideFormat, WIDE_FORMATS
 from omop_etl.infra.io.options import WriterOptions
 from omop_etl.infra.io.manifest_builder import build_manifest
-from omop_etl.infra.io.io_core import write_frame, write_manifest, write_json
+from omop_etl.infra.io.io_core import write_frame, write_manifest, write_json, write_ndjson
 from omop_etl.infra.io.path_planner import plan_single_file, WriterContext
 from omop_etl.infra.logging.scoped import file_logging
 from omop_etl.infra.logging.adapters import with_extra
@@ -94,14 +94,18 @@ class ConceptLookupExporter:
                     missed_dict = [asdict(m) for m in missed_list]
                     missed_result = write_json(missed_dict, missed_path, opts.json)
                     missed_count = len(missed_dict)
+                elif fmt == "ndjson":
+                    missed_dict = [asdict(m) for m in missed_list]
+                    missed_result = write_ndjson(missed_dict, missed_path, opts.json)
+                    missed_count = len(missed_dict)
                 elif fmt in {"csv", "tsv"}:
                     missed_df = self._missed_to_df(missed_list)
                     format_opts = opts.csv if fmt == "csv" else opts.tsv
                     missed_result = write_frame(missed_df, missed_path, fmt, format_opts)
                     missed_count = missed_df.height
-                elif fmt == "parquet":
+                elif fmt in {"parquet", "ipc"}:
                     missed_df = self._missed_to_df(missed_list)
-                    missed_result = write_frame(missed_df, missed_path, fmt, opts.parquet)
+                    missed_result = write_frame(missed_df, missed_path, fmt, opts.parquet if fmt == "parquet" else opts.ipc)
                     missed_count = missed_df.height
                 else:
                     raise AssertionError(f"unhandled fmt: {fmt}")
@@ -169,7 +169,7 @@ class ConceptLookupService:
 
         Args:
             meta: Run metadata (uses instance meta if not provided)
-            formats: Output formats (csv, json, parquet, tsv, or "all")
+            formats: Output formats (csv, ipc, json, ndjson, parquet, tsv, or "all")
             write_output: Whether to write output files
 
         Returns:
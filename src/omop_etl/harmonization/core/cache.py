@@ -0,0 +1,76 @@
+import hashlib
+import shutil
+import tempfile
+from logging import getLogger
+from pathlib import Path
+from typing import Iterable
+
+import polars as pl
+
+from omop_etl.harmonization.core.rehydrate import patients_from_normalized
+from omop_etl.harmonization.core.serialize import build_nested_df, to_normalized
+from omop_etl.harmonization.models.harmonized import HarmonizedData
+from omop_etl.harmonization.models.patient import Patient
+
+log = getLogger(__name__)
+
+_CHUNK_SIZE = 1 << 20
+
+
+class HarmonizationCache:
+    """
+    Content-addressed store of harmonized outputs, as normalized Parquet snapshots.
+
+    Entries are keyed on the preprocessed input bytes, the harmonizer class and its VERSION, so a
+    cached output is only reused for identical input and harmonizer code. Bump the harmonizer's
+    VERSION when its output changes for the same input.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @staticmethod
+    def key(input_path: Path, harmonizer: type) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{harmonizer.__module__}.{harmonizer.__qualname__}:{getattr(harmonizer, 'VERSION', '')}".encode("utf-8"))
+        for path in _input_files(input_path):
+            digest.update(str(path.relative_to(input_path) if input_path.is_dir() else path.name).encode("utf-8"))
+            with open(path, "rb") as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self, key: str, trial_id: str) -> HarmonizedData | None:
+        entry = self.directory / key
+        if not entry.is_dir():
+            return None
+
+        frames = {path.stem: pl.read_parquet(path) for path in entry.glob("*.parquet")}
+        log.info("harmonize.cache_hit", extra={"key": key, "entry": str(entry)})
+        return HarmonizedData(trial_id=trial_id, patients=patients_from_normalized(frames))
+
+    def store(self, key: str, harmonized_data: HarmonizedData) -> Path:
+        """Write the snapshot to a scratch dir first and move it in place, readers never see partial entries"""
+        entry = self.directory / key
+        if entry.is_dir():
+            return entry
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=f".{key}_", dir=self.directory))
+        try:
+            for name, frame in to_normalized(build_nested_df(list(harmonized_data), Patient)).items():
+                frame.write_parquet(scratch / f"{name}.parquet")
+            scratch.rename(entry)
+        except OSError:
+            # another run stored the same key meanwhile
+            if not entry.is_dir():
+                raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        return entry
+
+
+def _input_files(input_path: Path) -> Iterable[Path]:
+    if not input_path.is_dir():
+        return [input_path]
+    return sorted(p for p in input_path.rglob("*") if p.is_file() and not p.name.endswith("_manifest.json"))
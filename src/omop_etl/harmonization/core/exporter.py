@@ -1,9 +1,12 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Sequence
 import logging
+import os
+import polars as pl
 
 from omop_etl.infra.logging.scoped import file_logging
-from omop_etl.infra.logging.adapters import with_extra
+from omop_etl.infra.logging.adapters import ExtraAdapter, with_extra
 from omop_etl.harmonization.models.harmonized import HarmonizedData
 from omop_etl.infra.io.options import WriterOptions
 from omop_etl.infra.io.manifest_builder import build_manifest
@@ -15,10 +18,12 @@ from omop_etl.infra.io.types import (
     WideFormat,
 )
 from omop_etl.infra.io.io_core import (
+    sink_frame,
     write_frame,
     write_frames_dir,
-    write_json,
+    write_json_stream,
     write_manifest,
+    write_ndjson,
 )
 from omop_etl.infra.io.path_planner import (
     plan_single_file,
@@ -28,6 +33,9 @@ from omop_etl.infra.io.path_planner import (
 
 log = logging.getLogger(__name__)
 
+# table writers shared by all concurrently exported formats, on top of the Polars thread pool
+_WRITE_WORKERS = os.cpu_count() or 1
+
 
 class HarmonizedExporter:
     def __init__(self, base_out: Path, layout: Layout = Layout.TRIAL_RUN):
@@ -42,9 +50,13 @@ class HarmonizedExporter:
         input_path: Path,
         formats: Sequence[WideFormat],
         opts: WriterOptions | None = None,
+        timings: pl.DataFrame | None = None,
     ) -> Dict[str, WriterContext]:
         out: Dict[str, WriterContext] = {}
         opts = opts or WriterOptions()
+        # a single tabular format is streamed from the lazy plan, several share one frame built on first use
+        stream = sum(fmt in TABULAR_FORMATS for fmt in formats) == 1
+        wide: pl.DataFrame | None = None
 
         for fmt in formats:
             if fmt not in WIDE_FORMATS:
@@ -77,15 +89,18 @@ class HarmonizedExporter:
                     extra={"input": str(input_path), "output_dir": str(ctx.base_dir)},
                 )
 
-                if fmt in {"csv", "tsv"}:
-                    df = hd.to_dataframe_wide()
-                    opt = opts.csv if fmt == "csv" else opts.tsv
-                    result = write_frame(df, ctx.data_path, fmt, opt)
-                elif fmt == "parquet":
-                    df = hd.to_dataframe_wide()
-                    result = write_frame(df, ctx.data_path, fmt, opts.parquet)
+                if fmt in TABULAR_FORMATS:
+                    opt = {"csv": opts.csv, "tsv": opts.tsv, "parquet": opts.parquet, "ipc": opts.ipc}[fmt]
+                    if stream:
+                        result = sink_frame(hd.to_lazyframe_wide(), ctx.data_path, fmt, opt)
+                    else:
+                        wide = wide if wide is not None else hd.to_dataframe_wide()
+                        result = write_frame(wide, ctx.data_path, fmt, opt)
                 elif fmt == "json":
-                    result = write_json(hd.to_dict(), ctx.data_path, opts.json)
+                    # streamed patient by patient, same document as hd.to_dict()
+                    result = write_json_stream({"trial_id": hd.trial_id}, "patients", hd.ndjson_iter(), ctx.data_path, opts.json)
+                elif fmt == "ndjson":
+                    result = write_ndjson(hd.ndjson_iter(), ctx.data_path, opts.json)
                 else:
                     raise AssertionError(f"unhandled fmt: {fmt}")
 
@@ -100,12 +115,14 @@ class HarmonizedExporter:
                     result=result,
                 )
                 write_manifest(manifest, ctx.manifest_path)
+                if timings is not None:
+                    write_frame(timings, _timings_path(ctx), "csv")
 
                 run_log.info(
                     "harmonize.export_wide.done",
                     extra={
-                        "rows": (df.height if fmt != "json" else len(hd.patients)),
-                        "cols": (df.width if fmt != "json" else None),
+                        "rows": (len(hd) if fmt in {"json", "ndjson"} else result.tables["wide"].rows),
+                        "cols": (None if fmt in {"json", "ndjson"} else result.tables["wide"].cols),
                         "data_path": str(ctx.data_path),
                         "manifest_path": str(ctx.manifest_path),
                         "log_path": str(ctx.log_path),
@@ -123,18 +140,20 @@ class HarmonizedExporter:
         input_path: Path,
         formats: Sequence[TabularFormat],
         opts: WriterOptions | None = None,
+        timings: pl.DataFrame | None = None,
     ) -> Dict[str, WriterContext]:
         out: Dict[str, WriterContext] = {}
         opts = opts or WriterOptions()
         frames = hd.to_frames_normalized()
 
+        contexts: Dict[str, WriterContext] = {}
         for fmt in formats:
             if fmt not in TABULAR_FORMATS:
                 raise ValueError(
                     f"Unsupported fmt:{fmt}. HarmonizedExporter.export_normalized supports: {TABULAR_FORMATS}",
                 )
 
-            ctx = plan_table_dir(
+            contexts[fmt] = plan_table_dir(
                 base_out=self.base_out,
                 meta=meta,
                 module=self.module_name,
@@ -143,53 +162,68 @@ class HarmonizedExporter:
                 fmt=fmt,
             )
 
-            with file_logging(ctx.log_path) as root_logger:
-                run_log = with_extra(
-                    root_logger,
-                    {
-                        "trial": meta.trial,
-                        "run_id": meta.run_id,
-                        "timestamp": meta.started_at,
-                        "fmt": fmt,
-                        "mode": "normalized",
-                        "component": self.module_name,
-                    },
-                )
-                run_log.info(
-                    "harmonize.export_normalized.start",
-                    extra={"input": str(input_path), "output_dir": str(ctx.base_dir)},
-                )
-
-                if fmt == "csv":
-                    result = write_frames_dir(frames, ctx.data_dir, fmt, opts.csv)
-                elif fmt == "tsv":
-                    result = write_frames_dir(frames, ctx.data_dir, fmt, opts.tsv)
-                elif fmt == "parquet":
-                    result = write_frames_dir(frames, ctx.data_dir, fmt, opts.parquet)
-                else:
+        # all formats are written concurrently and share one budget of table writers, the file log handlers
+        # stay scoped to one format at a time: start is logged on submit, manifest and done once the write completed
+        table_workers = max(_WRITE_WORKERS // max(len(contexts), 1), 1)
+        with ThreadPoolExecutor(max_workers=max(len(contexts), 1), thread_name_prefix="export_normalized") as pool:
+            writes: Dict[str, Future] = {}
+            fmt_opts = {"csv": opts.csv, "tsv": opts.tsv, "parquet": opts.parquet, "ipc": opts.ipc}
+            for fmt, ctx in contexts.items():
+                if fmt not in fmt_opts:
                     raise AssertionError(f"unhandled fmt: {fmt}")
 
-                manifest = build_manifest(
-                    trial=meta.trial,
-                    run_id=meta.run_id,
-                    started_at=meta.started_at,
-                    input_path=input_path,
-                    directory=ctx.base_dir,
-                    fmt=fmt,
-                    mode="normalized",
-                    result=result,
-                )
-                write_manifest(manifest, ctx.manifest_path)
-                run_log.info(
-                    "harmonize.export_normalized.done",
-                    extra={
-                        "tables": list(result.table_files.keys()),
-                        "data_dir": str(ctx.data_dir),
-                        "manifest_path": str(ctx.manifest_path),
-                        "log_path": str(ctx.log_path),
-                    },
-                )
-
-            out[fmt] = ctx
+                with file_logging(ctx.log_path) as root_logger:
+                    self._normalized_log(root_logger, meta, fmt).info(
+                        "harmonize.export_normalized.start",
+                        extra={"input": str(input_path), "output_dir": str(ctx.base_dir)},
+                    )
+                writes[fmt] = pool.submit(write_frames_dir, frames, ctx.data_dir, fmt, fmt_opts[fmt], table_workers)
+
+            for fmt, ctx in contexts.items():
+                result = writes[fmt].result()
+
+                with file_logging(ctx.log_path) as root_logger:
+                    manifest = build_manifest(
+                        trial=meta.trial,
+                        run_id=meta.run_id,
+                        started_at=meta.started_at,
+                        input_path=input_path,
+                        directory=ctx.base_dir,
+                        fmt=fmt,
+                        mode="normalized",
+                        result=result,
+                    )
+                    write_manifest(manifest, ctx.manifest_path)
+                    if timings is not None:
+                        write_frame(timings, _timings_path(ctx), "csv")
+                    self._normalized_log(root_logger, meta, fmt).info(
+                        "harmonize.export_normalized.done",
+                        extra={
+                            "tables": list(result.table_files.keys()),
+                            "data_dir": str(ctx.data_dir),
+                            "manifest_path": str(ctx.manifest_path),
+                            "log_path": str(ctx.log_path),
+                        },
+                    )
+
+                out[fmt] = ctx
 
         return out
+
+    def _normalized_log(self, root_logger: logging.Logger, meta, fmt: str) -> ExtraAdapter:
+        return with_extra(
+            root_logger,
+            {
+                "trial": meta.trial,
+                "run_id": meta.run_id,
+                "timestamp": meta.started_at,
+                "fmt": fmt,
+                "mode": "normalized",
+                "component": self.module_name,
+            },
+        )
+
+
+def _timings_path(ctx: WriterContext) -> Path:
+    """Per-run harmonizer timing table, next to the manifest"""
+    return ctx.manifest_path.with_name(ctx.manifest_path.name.removesuffix("_manifest.json") + "_timings.csv")
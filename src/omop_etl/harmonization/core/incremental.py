@@ -0,0 +1,92 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, List
+
+import polars as pl
+
+from omop_etl.harmonization.models.harmonized import HarmonizedData
+from omop_etl.harmonization.models.patient import Patient
+
+log = getLogger(__name__)
+
+STATE_SUFFIX = "_subject_hashes.json"
+
+
+@dataclass(frozen=True)
+class IncrementalState:
+    """
+    Per-subject content hashes of the input a normalized output was harmonized from.
+
+    The fingerprint covers the input schema, the harmonizer and its VERSION, and the Polars version (row
+    hashes are not stable across Polars versions); previous outputs are only reused when it matches, so
+    bumping a harmonizer's VERSION re-harmonizes every subject.
+    """
+
+    fingerprint: str
+    subject_hashes: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_input(cls, df: pl.DataFrame, harmonizer: type, subject_col: str = "SubjectId") -> IncrementalState:
+        return cls(fingerprint=input_fingerprint(df, harmonizer), subject_hashes=subject_hashes(df, subject_col))
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"fingerprint": self.fingerprint, "subjects": self.subject_hashes}), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path) -> IncrementalState | None:
+        state_files = list(directory.glob(f"*{STATE_SUFFIX}"))
+        if len(state_files) != 1:
+            log.warning(f"Could not find subject hashes in previous harmonized output {directory}, harmonizing all subjects.")
+            return None
+
+        loaded = json.loads(state_files[0].read_text(encoding="utf-8"))
+        return cls(fingerprint=loaded["fingerprint"], subject_hashes=loaded["subjects"])
+
+
+@dataclass(frozen=True)
+class IncrementalPlan:
+    changed: List[str]
+    unchanged: List[str]
+
+
+def subject_hashes(df: pl.DataFrame, subject_col: str = "SubjectId") -> Dict[str, int]:
+    """Content hash per subject over all of its input rows, in input order."""
+    hashed = (
+        df.select(pl.col(subject_col), df.hash_rows(seed=0).alias("_row_hash"))
+        .group_by(subject_col, maintain_order=True)
+        .agg(pl.col("_row_hash").cast(pl.Utf8).str.join(",").hash(seed=0).alias("_subject_hash"))
+    )
+    return dict(zip(hashed.get_column(subject_col).to_list(), hashed.get_column("_subject_hash").to_list()))
+
+
+def input_fingerprint(df: pl.DataFrame, harmonizer: type) -> str:
+    doc = {
+        "schema": {col: str(dtype) for col, dtype in df.schema.items()},
+        "harmonizer": f"{harmonizer.__module__}.{harmonizer.__qualname__}",
+        "version": getattr(harmonizer, "VERSION", None),
+        "polars": pl.__version__,
+    }
+    return hashlib.sha256(json.dumps(doc, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def plan_incremental(current: IncrementalState, previous: IncrementalState | None) -> IncrementalPlan:
+    """Split subjects into changed/new ones to harmonize and unchanged ones to reuse."""
+    if previous is None or previous.fingerprint != current.fingerprint:
+        return IncrementalPlan(changed=list(current.subject_hashes), unchanged=[])
+
+    changed: List[str] = []
+    unchanged: List[str] = []
+    for sid, digest in current.subject_hashes.items():
+        (unchanged if previous.subject_hashes.get(sid) == digest else changed).append(sid)
+    return IncrementalPlan(changed=changed, unchanged=unchanged)
+
+
+def load_previous_patients(directory: Path, subjects: List[str]) -> List[Patient]:
+    """Rehydrate the given subjects from a previous normalized Parquet or IPC output, located by its manifest."""
+    if not subjects:
+        return []
+    return HarmonizedData.from_normalized(directory, subjects=subjects).patients
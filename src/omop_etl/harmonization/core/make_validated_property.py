@@ -1,5 +1,8 @@
-def make_validated_property(name: str, validator):
-    """Factory for creating validated properties for questionnaire fields."""
+def make_validated_property(name: str, validator, value_type: type | None = None):
+    """
+    Factory for creating validated properties for questionnaire fields.
+    If value_type is given it is exposed as the setter's value annotation, so the field has a declared type.
+    """
     private_attr = f"_{name}"
 
     def getter(self):
@@ -8,6 +11,9 @@ def make_validated_property(name: str, validator):
     def setter(self, value):
         validated = validator(value=value, field_name=name)
         setattr(self, private_attr, validated)
-        self.updated_fields.add(name)
+        self._mark_updated(name)
+
+    if value_type is not None:
+        setter.__annotations__ = {"value": value_type | None, "return": None}
 
     return property(getter, setter)
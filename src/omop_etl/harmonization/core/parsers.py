@@ -62,8 +62,44 @@ class PolarsParsers:
 
     @staticmethod
     def to_optional_date(x: StrOrExprOrScalar, default_day: int = 15, default_month: int = 7) -> pl.Expr:
-        """Vectorized date parser for Polars columns"""
-        col = PolarsParsers._as_expr(x)
+        """
+        Vectorized date parser for Polars columns.
+
+        Date/Datetime columns pass through, strings get a single ISO `strptime` first and only the
+        rows that fail it go through NA handling and partial date/NK imputation.
+        """
+        return PolarsParsers._as_expr(x).map_batches(
+            lambda s: PolarsParsers._parse_date_series(s, default_day, default_month),
+            return_dtype=pl.Date,
+            is_elementwise=True,
+        )
+
+    @staticmethod
+    def _parse_date_series(s: pl.Series, default_day: int, default_month: int) -> pl.Series:
+        if s.dtype == pl.Date:
+            return s
+        if s.dtype == pl.Datetime:
+            return s.dt.date()
+        if s.dtype == pl.Null:
+            return s.cast(pl.Date)
+        if s.dtype != pl.Utf8:
+            s = s.cast(pl.Utf8, strict=False)
+
+        parsed = s.str.strptime(pl.Date, "%Y-%m-%d", strict=False)
+        failed = parsed.is_null() & s.is_not_null()
+        if not failed.any():
+            return parsed
+
+        imputed = (
+            pl.DataFrame({"x": s.filter(failed)})
+            .select(PolarsParsers._impute_partial_date(pl.col("x"), default_day, default_month))
+            .to_series()
+        )
+        return parsed.scatter(failed.arg_true(), imputed)
+
+    @staticmethod
+    def _impute_partial_date(col: pl.Expr, default_day: int, default_month: int) -> pl.Expr:
+        """NA handling and partial date/NK imputation, for values that are not already YYYY-MM-DD"""
         col = pl.when(col.is_in(PolarsParsers.NA_VALUES)).then(None).otherwise(col)
 
         standardized = (
@@ -1,17 +1,29 @@
 import json
 from pathlib import Path
-from typing import Sequence, Callable
+from typing import Sequence, Callable, Iterator, List
 import polars as pl
 from logging import getLogger
 
-from omop_etl.harmonization.models.harmonized import HarmonizedData
+from omop_etl.harmonization.models.harmonized import HarmonizedData, SpilledHarmonizedData
+from omop_etl.harmonization.core.cache import HarmonizationCache
 from omop_etl.harmonization.core.dispatch import resolve_harmonizer
+from omop_etl.harmonization.core.incremental import (
+    IncrementalState,
+    STATE_SUFFIX,
+    load_previous_patients,
+    plan_incremental,
+)
+from omop_etl.harmonization.core.profiling import HarmonizerProfiler
+from omop_etl.harmonization.core.spill import PatientSpillStore
+from omop_etl.infra.logging.adapters import with_extra
 from omop_etl.infra.utils.run_context import RunMetadata
 from omop_etl.harmonization.core.exporter import HarmonizedExporter
+from omop_etl.infra.io.options import WriterOptions
 from omop_etl.infra.io.types import (
     Layout,
     WideFormat,
     TabularFormat,
+    IPC_SUFFIXES,
     NAME_TO_POLARS_DTYPE,
 )
 
@@ -46,16 +58,87 @@ class HarmonizationPipeline:
         tabular_formats: Sequence[TabularFormat],
         write_wide: bool = True,
         write_normalized: bool = True,
+        profile: bool = False,
+        incremental_from: Path | None = None,
+        spill_batch_size: int | None = None,
+        spill_dir: Path | None = None,
+        cache_dir: Path | None = None,
+        writer_options: WriterOptions | None = None,
     ) -> HarmonizedData:
-        schema = HarmonizationPipeline._get_preprocessed_schema(input_path)
-        df = HarmonizationPipeline._read_input(input_path, schema)
+        """
+        Harmonize the preprocessed input and export it.
+
+        With incremental_from (a previous normalized parquet or ipc output dir), subjects whose input rows
+        are unchanged since that run are rehydrated from its tables, only new/changed ones are harmonized.
+
+        With spill_batch_size, subjects are harmonized spill_batch_size at a time and each batch of
+        patients is spilled to a scratch dir (under spill_dir, default system temp), the result is a
+        SpilledHarmonizedData that exports and iterates one batch at a time. Subjects reused by an
+        incremental run are read back from the previous output in batches of the same size.
 
+        With cache_dir, a full in-memory run is looked up in a HarmonizationCache keyed on the input
+        file(s) and harmonizer version. On a hit the patients are rehydrated from the cached snapshot
+        instead of harmonized, on a miss the result is stored. Ignored for incremental and spilled runs.
+
+        writer_options are passed to the exporter, e.g. ParquetOptions(partition_by=...) for
+        hive-partitioned Parquet output.
+        """
         harmonizer = self._resolver(self.trial)
+        profiler = self._make_profiler() if profile else None
+        harmonizer_kwargs = {"profiler": profiler} if profiler is not None else {}
+
+        cache: HarmonizationCache | None = None
+        cache_key: str | None = None
+        cached: HarmonizedData | None = None
+        if cache_dir is not None and incremental_from is None and spill_batch_size is None:
+            cache = HarmonizationCache(cache_dir)
+            cache_key = cache.key(input_path, harmonizer)
+            cached = cache.load(cache_key, trial_id=self.trial.upper())
+
+        # the cache key hashes the raw input bytes, on a hit the input is only parsed for the subject hashes below
+        df = HarmonizationPipeline._load_input(input_path, harmonizer) if cached is None else None
+
+        state: IncrementalState | None = None
+        unchanged: List[str] = []
+        if incremental_from is not None:
+            state = IncrementalState.from_input(df, harmonizer)
+            plan = plan_incremental(state, IncrementalState.load(incremental_from))
+            unchanged = plan.unchanged
+            df = df.filter(pl.col("SubjectId").is_in(plan.changed))
+            log.info(
+                "harmonize.incremental",
+                extra={"changed": len(plan.changed), "unchanged": len(plan.unchanged), "previous": str(incremental_from)},
+            )
+
+        if cached is not None:
+            harmonized_data = cached
+        elif spill_batch_size is not None:
+            store = PatientSpillStore(batch_size=spill_batch_size, directory=spill_dir)
+            # reused subjects are read back a batch at a time too, so at most one batch of them is in memory
+            for start in range(0, len(unchanged), spill_batch_size):
+                store.append(load_previous_patients(incremental_from, unchanged[start : start + spill_batch_size]))
+            for batch in _subject_batches(df, spill_batch_size):
+                store.append(harmonizer(batch, trial_id=self.trial.upper(), **harmonizer_kwargs).process())
+            store.flush()
+            harmonized_data = SpilledHarmonizedData(trial_id=self.trial.upper(), store=store)
+        elif state is not None and df.height == 0:
+            harmonized_data = HarmonizedData(trial_id=self.trial.upper())
+        else:
+            harmonized_data = harmonizer(
+                df,
+                trial_id=self.trial.upper(),
+                **harmonizer_kwargs,
+            ).process()
+
+        if cache is not None and cached is None:
+            cache.store(cache_key, harmonized_data)
+
+        if spill_batch_size is None:
+            # sorted in full runs too, so a full and an incremental run write the same rows in the same order
+            reused = load_previous_patients(incremental_from, unchanged) if unchanged else []
+            harmonized_data.patients = sorted([*reused, *harmonized_data.patients], key=lambda p: p.patient_id)
 
-        harmonized_data: HarmonizedData = harmonizer(
-            df,
-            trial_id=self.trial.upper(),
-        ).process()
+        timings = profiler.to_frame() if profiler is not None else None
 
         if write_wide and wide_formats:
             self.exporter.export_wide(
@@ -63,44 +146,83 @@ class HarmonizationPipeline:
                 meta=self.meta,
                 input_path=input_path,
                 formats=wide_formats,
+                opts=writer_options,
+                timings=timings,
             )
 
         if write_normalized and tabular_formats:
-            self.exporter.export_normalized(
+            contexts = self.exporter.export_normalized(
                 harmonized_data,
                 meta=self.meta,
                 input_path=input_path,
                 formats=tabular_formats,
+                opts=writer_options,
+                timings=timings,
             )
+            # subject hashes next to the parquet/ipc manifests, so the next run can reuse this output
+            for fmt in ("parquet", "ipc"):
+                if fmt in contexts:
+                    if df is None:
+                        df = HarmonizationPipeline._load_input(input_path, harmonizer)
+                    state = state or IncrementalState.from_input(df, harmonizer)
+                    manifest_path = contexts[fmt].manifest_path
+                    state.write(manifest_path.with_name(manifest_path.name.removesuffix("_manifest.json") + STATE_SUFFIX))
 
         return harmonized_data
 
+    def _make_profiler(self) -> HarmonizerProfiler:
+        run_log = with_extra(
+            log,
+            {
+                "trial": self.meta.trial,
+                "run_id": self.meta.run_id,
+                "timestamp": self.meta.started_at,
+                "component": "harmonized",
+            },
+        )
+        return HarmonizerProfiler(logger=run_log)
+
+    @staticmethod
+    def _load_input(path: Path, harmonizer: type) -> pl.DataFrame:
+        schema = HarmonizationPipeline._get_preprocessed_schema(path)
+        return HarmonizationPipeline._read_input(path, schema, columns=getattr(harmonizer, "INPUT_COLUMNS", None)).collect()
+
     @staticmethod
-    def _read_input(path: Path, schema: pl.Schema | None = None) -> pl.DataFrame:
-        suf = path.suffix.lower()
+    def _read_input(path: Path, schema: pl.Schema | None = None, columns: Sequence[str] | None = None) -> pl.LazyFrame:
+        """
+        Lazily scan the preprocessed input: a single file, a glob, or a directory of (partitioned) files.
+        `columns` prunes the scan to these column names or `^...$` patterns, pushed down to the reader.
+        """
+        suf = _input_suffix(path)
 
         if suf == ".parquet":
+            # directories are scanned as (hive-)partitioned datasets with their own parquet schema
+            lf = pl.scan_parquet(path) if path.is_dir() else pl.scan_parquet(path, schema=schema)
+        elif suf in IPC_SUFFIXES:
+            # Polars memory-maps local IPC files, uncompressed ones are read without decoding
+            source = sorted(p for s in IPC_SUFFIXES for p in path.rglob(f"*{s}")) if path.is_dir() else path
+            lf = pl.scan_ipc(source)
+        elif suf in (".csv", ".tsv"):
+            separator = "\t" if suf == ".tsv" else ","
+            source = sorted(path.rglob(f"*{suf}")) if path.is_dir() else path
             if schema is None:
-                return pl.read_parquet(path)
-            if schema is not None:
-                return pl.read_parquet(path, schema=schema)
-        if suf == ".csv":
-            if schema is None:
-                return pl.read_csv(path, infer_schema_length=None)
-            if schema is not None:
-                return pl.read_csv(path, schema=schema)
-        if suf == ".tsv":
-            if schema is None:
-                return pl.read_csv(path, separator="\t", infer_schema_length=None)
-            if schema is not None:
-                return pl.read_csv(path, separator="\t", schema=schema)
-        raise ValueError(f"Unsupported input file type: {suf} for harmonization.")
+                lf = pl.scan_csv(source, separator=separator, infer_schema_length=None)
+            else:
+                lf = pl.scan_csv(source, separator=separator, schema=schema)
+        else:
+            raise ValueError(f"Unsupported input file type: {suf} for harmonization.")
+
+        if columns:
+            lf = lf.select(pl.col(*columns))
+        return lf
 
     @staticmethod
     def _get_preprocessed_schema(path: Path) -> pl.Schema | None:
-        manifest_file = list(path.parent.glob(pattern="*_manifest*.json"))
+        directory = path if path.is_dir() else path.parent
+        sibling = path.with_name(f"{path.stem}_manifest.json")
+        manifest_file = [sibling] if sibling.is_file() else list(directory.glob(pattern="*_manifest*.json"))
         if len(manifest_file) != 1:
-            log.warning(f"Could not find manifest file in pre-processing input dir {path.parent}. Will infer schema from entire dataset.")
+            log.warning(f"Could not find manifest file in pre-processing input dir {directory}. Will infer schema from entire dataset.")
             return None
 
         with open(str(manifest_file[0]), "r") as f:
@@ -110,6 +232,23 @@ class HarmonizationPipeline:
         return _schema_from_manifest(schema)
 
 
+def _subject_batches(df: pl.DataFrame, batch_size: int, subject_col: str = "SubjectId") -> Iterator[pl.DataFrame]:
+    """Input rows split into frames of at most batch_size subjects, all rows of a subject in one frame"""
+    subjects = df.get_column(subject_col).unique().sort()
+    for start in range(0, subjects.len(), batch_size):
+        yield df.filter(pl.col(subject_col).is_in(subjects.slice(start, batch_size).implode()))
+
+
+def _input_suffix(path: Path) -> str:
+    """File suffix of the input, for directories the suffix of the data files inside."""
+    if not path.is_dir():
+        return path.suffix.lower()
+    for suf in (".parquet", *IPC_SUFFIXES, ".csv", ".tsv"):
+        if next(path.rglob(f"*{suf}"), None) is not None:
+            return suf
+    raise ValueError(f"No parquet, ipc, csv or tsv files in input dir {path} for harmonization.")
+
+
 def _schema_from_manifest(manifest_schema: dict[str, str]) -> pl.Schema:
     """
     Convert {column_name: type_name} from JSON to pl.Schema.
@@ -0,0 +1,116 @@
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterator, List
+
+import polars as pl
+
+from omop_etl.harmonization.core.track_validated import mutation_count
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+log = logging.getLogger(__name__)
+
+TIMING_SCHEMA = pl.Schema(
+    {
+        "processor": pl.Utf8,
+        "wall_s": pl.Float64,
+        "cpu_s": pl.Float64,
+        "rows_in": pl.Int64,
+        "rows_out": pl.Int64,
+        "objects_created": pl.Int64,
+        "peak_python_bytes": pl.Int64,
+        "max_rss_bytes": pl.Int64,
+    }
+)
+
+
+@dataclass(frozen=True)
+class ProcessorTiming:
+    """
+    Measurements for one harmonizer processor.
+
+    rows_in is the height of the input frame the processor reads. rows_out is the number of records
+    the step created plus the change in `mutation_count()` across it (one per record a bulk assignment
+    fills, one per setter call), a cheap proxy for the harmonized values it wrote.
+    objects_created is the net change in allocated Python memory blocks, an approximation of the
+    Python objects left alive by the step.
+    peak_python_bytes is only recorded when tracing memory, max_rss_bytes is the process high-water
+    mark after the step and includes memory held by Polars.
+    """
+
+    processor: str
+    wall_s: float
+    cpu_s: float
+    rows_in: int | None
+    rows_out: int
+    objects_created: int
+    peak_python_bytes: int | None
+    max_rss_bytes: int | None
+
+
+class HarmonizerProfiler:
+    """
+    Collects per-processor timings for one harmonizer run and emits each as a structured log record.
+
+    Tracing Python memory with tracemalloc slows the run down noticeably, so it is opt-in.
+    """
+
+    def __init__(self, trace_memory: bool = False, logger: logging.Logger | logging.LoggerAdapter | None = None):
+        self.trace_memory = trace_memory
+        self.timings: List[ProcessorTiming] = []
+        self._log = logger or log
+
+    @contextmanager
+    def measure(self, processor: str, rows_in: int | None = None, count_records: Callable[[], int] | None = None) -> Iterator[None]:
+        """Measure one step, count_records is an O(1) count of the records held (e.g. patients), its change adds to rows_out"""
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        out_before = mutation_count() + (count_records() if count_records is not None else 0)
+        blocks_before = sys.getallocatedblocks()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_before
+            cpu = time.process_time() - cpu_before
+            blocks = sys.getallocatedblocks() - blocks_before
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+
+            timing = ProcessorTiming(
+                processor=processor,
+                wall_s=wall,
+                cpu_s=cpu,
+                rows_in=rows_in,
+                rows_out=mutation_count() + (count_records() if count_records is not None else 0) - out_before,
+                objects_created=blocks,
+                peak_python_bytes=peak,
+                max_rss_bytes=_max_rss_bytes(),
+            )
+            self.timings.append(timing)
+            self._log.info("harmonize.processor", extra=asdict(timing))
+
+    def to_frame(self) -> pl.DataFrame:
+        """Timing table, one row per processor in run order."""
+        return pl.DataFrame([asdict(t) for t in self.timings], schema=TIMING_SCHEMA)
+
+
+def _max_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
@@ -0,0 +1,77 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
+
+@dataclass(frozen=True)
+class QuestionColumns:
+    """Source columns for one questionnaire question, either may be absent from the input."""
+
+    index: int
+    text_col: str | None = None
+    code_col: str | None = None
+
+    @property
+    def text_attr(self) -> str:
+        return f"q{self.index}"
+
+    @property
+    def code_attr(self) -> str:
+        return f"q{self.index}_code"
+
+
+@dataclass(frozen=True)
+class QuestionnaireSchema:
+    """
+    Question index -> source text/code columns for a questionnaire, resolved once per input schema.
+    """
+
+    questions: tuple[QuestionColumns, ...]
+
+    @property
+    def text_cols(self) -> list[str]:
+        return [q.text_col for q in self.questions if q.text_col is not None]
+
+    @property
+    def code_cols(self) -> list[str]:
+        return [q.code_col for q in self.questions if q.code_col is not None]
+
+    def text_renames(self) -> dict[str, str]:
+        """Source text column -> model attribute (q{i})"""
+        return {q.text_col: q.text_attr for q in self.questions if q.text_col is not None}
+
+    def code_renames(self) -> dict[str, str]:
+        """Source code column -> model attribute (q{i}_code)"""
+        return {q.code_col: q.code_attr for q in self.questions if q.code_col is not None}
+
+    def attributes(self) -> list[str]:
+        """Model attributes populated by this schema, texts first then codes."""
+        return [*self.text_renames().values(), *self.code_renames().values()]
+
+
+def resolve_questionnaire_schema(columns: Sequence[str], text_pattern: str, code_pattern: str) -> QuestionnaireSchema:
+    """
+    Match column names against the question patterns, the first group of each pattern must capture the question index.
+    If several columns map to the same question, the last one in column order wins.
+    """
+    return _resolve_questionnaire_schema(tuple(columns), text_pattern, code_pattern)
+
+
+@lru_cache(maxsize=64)
+def _resolve_questionnaire_schema(columns: tuple[str, ...], text_pattern: str, code_pattern: str) -> QuestionnaireSchema:
+    text_re = re.compile(text_pattern)
+    code_re = re.compile(code_pattern)
+
+    text_cols: dict[int, str] = {}
+    code_cols: dict[int, str] = {}
+    for col in columns:
+        if m := text_re.fullmatch(col):
+            text_cols[int(m.group(1))] = col
+        if m := code_re.fullmatch(col):
+            code_cols[int(m.group(1))] = col
+
+    questions = tuple(
+        QuestionColumns(index=i, text_col=text_cols.get(i), code_col=code_cols.get(i)) for i in sorted(text_cols.keys() | code_cols.keys())
+    )
+    return QuestionnaireSchema(questions=questions)
@@ -0,0 +1,126 @@
+import json
+import typing
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+import polars as pl
+
+from omop_etl.harmonization.core.serialize import _public_properties, _property_return_type, _py_to_pl
+from omop_etl.harmonization.core.track_validated import TrackedValidated
+from omop_etl.harmonization.models.patient import Patient
+from omop_etl.infra.io.types import SerializeTypes
+from omop_etl.infra.utils.types import unwrap_optional, is_sequence_origin
+
+
+def patients_from_normalized(frames: Mapping[str, pl.DataFrame], patient_cls: type[Patient] = Patient) -> List[Patient]:
+    """
+    Rebuild patient objects from normalized tables, as written by `to_normalized`.
+
+    Table columns are cast to the declared model types and verified once per table, values are then
+    assigned without per-value validation. Singletons and collections are attached through the
+    patient setters. Leaf fields without a setter are derived and not restored.
+    """
+    patients_frame = frames["patients"]
+    patients: Dict[str, Patient] = {
+        pid: patient_cls(patient_id=pid, trial_id=tid) for pid, tid in patients_frame.select(SerializeTypes.ID_COLUMNS).iter_rows()
+    }
+    if not patients:
+        return []
+
+    declared = patient_cls.field_types()
+    scalar_fields = {
+        col: col
+        for col in patients_frame.columns
+        if col not in SerializeTypes.IDENTITY_FIELDS and col in declared and _is_scalar_type(declared[col])
+    }
+    _assign_frame(patient_cls, list(patients.values()), patients_frame, scalar_fields)
+
+    for prop_name in _public_properties(patient_cls):
+        table = frames.get(prop_name)
+        if table is None or table.height == 0:
+            continue
+
+        return_type = _property_return_type(patient_cls, prop_name)
+        base_type = unwrap_optional(return_type) if return_type is not None else None
+        is_collection = is_sequence_origin(base_type)
+        leaf_cls = unwrap_optional(typing.get_args(base_type)[0]) if is_collection else base_type
+        if not (isinstance(leaf_cls, type) and issubclass(leaf_cls, TrackedValidated)):
+            continue
+
+        if is_collection:
+            table = table.sort("patient_id", "row_index")
+        leaf_declared = leaf_cls.field_types()
+        prefix = f"{prop_name}{SerializeTypes.COL_SEP}"
+        fields = {
+            col: col.removeprefix(prefix) for col in table.columns if col.startswith(prefix) and col.removeprefix(prefix) in leaf_declared
+        }
+
+        pids: List[str] = table.get_column("patient_id").to_list()
+        objs = _assign_frame(leaf_cls, [leaf_cls(pid) for pid in pids], table, fields)  # type: ignore[call-arg]
+
+        if is_collection:
+            grouped: Dict[str, List[Any]] = {}
+            for pid, obj in zip(pids, objs):
+                grouped.setdefault(pid, []).append(obj)
+            for pid, items in grouped.items():
+                if pid in patients:
+                    setattr(patients[pid], prop_name, items)
+        else:
+            for pid, obj in zip(pids, objs):
+                if pid in patients:
+                    setattr(patients[pid], prop_name, obj)
+
+    return list(patients.values())
+
+
+def read_manifest(directory: Path) -> dict:
+    """The single `*_manifest.json` of an output directory."""
+    manifest_files = list(directory.glob("*_manifest.json"))
+    if len(manifest_files) != 1:
+        raise FileNotFoundError(f"Expected one manifest in harmonized output {directory}, found {len(manifest_files)}")
+    return json.loads(manifest_files[0].read_text(encoding="utf-8"))
+
+
+def scan_normalized(directory: Path, manifest: dict | None = None) -> Dict[str, pl.LazyFrame]:
+    """
+    Lazy tables of a normalized Parquet or IPC output, located by its manifest.
+    IPC files are memory-mapped by Polars' scan, so a filtered read only pages in what it needs.
+    """
+    manifest = manifest if manifest is not None else read_manifest(directory)
+    fmt = manifest.get("format")
+    if fmt not in ("parquet", "ipc") or manifest.get("mode") != "normalized":
+        raise ValueError(f"Harmonized output {directory} is not normalized parquet or ipc")
+
+    # partitioned tables are read as written, without the hive directory values as extra columns
+    scan = partial(pl.scan_parquet, hive_partitioning=False) if fmt == "parquet" else pl.scan_ipc
+    return {name: scan(directory / Path(table["file"]).name) for name, table in manifest["tables"].items()}
+
+
+def _assign_frame(cls: type[TrackedValidated], objs: List[Any], frame: pl.DataFrame, fields: Mapping[str, str]) -> List[Any]:
+    if not fields:
+        return objs
+    typed = frame.select([_cast_to_declared(frame.schema[source], source, cls.field_types()[attr]) for source, attr in fields.items()])
+    cls.verify_struct_schema(typed.schema, fields)
+    return cls.assign_columns(objs, {source: typed.get_column(source).to_list() for source in fields}, fields)
+
+
+def _cast_to_declared(dtype: pl.DataType, source: str, py_type: Any) -> pl.Expr:
+    """Cast a column read back from disk to the dtype accepted for the declared model type."""
+    col = pl.col(source)
+    if isinstance(py_type, type) and issubclass(py_type, Enum):
+        return col.cast(pl.Utf8).cast(pl.Enum([member.value for member in py_type]))
+    if py_type is bool and dtype == pl.Utf8:
+        return col.str.to_lowercase().replace_strict({"true": True, "false": False}, default=None, return_dtype=pl.Boolean)
+    target = _py_to_pl(py_type)
+    # string -> temporal casts are not supported on newer Polars, parse instead
+    if dtype == pl.Utf8 and target == pl.Date:
+        return col.str.to_date(strict=False)
+    if dtype == pl.Utf8 and target == pl.Datetime:
+        return col.str.to_datetime(strict=False)
+    return col.cast(target)
+
+
+def _is_scalar_type(tp: Any) -> bool:
+    return tp in (str, int, float, bool) or (isinstance(tp, type) and issubclass(tp, Enum)) or _py_to_pl(tp) != pl.Utf8
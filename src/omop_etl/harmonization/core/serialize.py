@@ -1,13 +1,16 @@
 import datetime as dt
 import inspect
 import typing
-from typing import Any, Sequence, MutableSequence
+from typing import Any, Callable, Iterable, Literal, NamedTuple, Sequence, MutableSequence
 from functools import lru_cache
 import polars as pl
 from polars._typing import PolarsDataType as polars_data_type
 
+from omop_etl.harmonization.core.track_validated import TrackedValidated, tracked_bits
 from omop_etl.infra.io.types import SerializeTypes
-from omop_etl.infra.utils.types import unwrap_optional
+from omop_etl.infra.utils.types import is_sequence_origin, unwrap_optional
+
+_WIDE_KEY = "__wide_key"
 
 
 def to_wide(df_nested: pl.DataFrame, prefix_sep: str = SerializeTypes.COL_SEP) -> pl.DataFrame:
@@ -17,48 +20,100 @@ def to_wide(df_nested: pl.DataFrame, prefix_sep: str = SerializeTypes.COL_SEP) -
       - one row per item per collection (ids + row_index + collection fields)
       - row_type marks base or collection name
     """
-    df = df_nested
+    lf, n_patients = _with_wide_key(df_nested)
+    return _wide_plan(lf, df_nested.schema, prefix_sep).collect()
+
+
+def to_wide_lazy(df_nested: pl.DataFrame, prefix_sep: str = SerializeTypes.COL_SEP, chunk_size: int = 5000) -> pl.LazyFrame:
+    """
+    `to_wide` as a lazy plan that can be sunk to a file without materializing the wide frame.
+
+    Patients are keyed and put in output order once, then taken chunk_size at a time. Each chunk is flattened
+    and sorted on its own and the chunks are concatenated in order, so no global sort over the wide rows is
+    needed and a sink holds at most a few chunks.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    lf, n_patients = _with_wide_key(df_nested)
+    keyed = lf.sort(_WIDE_KEY).collect()
+    chunks = [
+        _wide_plan(keyed.slice(start, chunk_size).lazy(), df_nested.schema, prefix_sep)
+        for start in range(0, max(n_patients, 1), chunk_size)
+    ]
+    return pl.concat(chunks)
+
+
+def _wide_key_step(schema: pl.Schema) -> int:
+    return sum(isinstance(dtype, pl.List) for dtype in schema.values()) + 1
+
+
+def _with_wide_key(df_nested: pl.DataFrame) -> tuple[pl.LazyFrame, int]:
+    """
+    Nested frame with a `_WIDE_KEY` column: the patient's position in (patient_id, trial_id) order,
+    spaced by the number of wide parts, so `key + part rank` orders the wide rows.
+    """
+    rank = pl.arg_sort_by(list(SerializeTypes.ID_COLUMNS), maintain_order=True).arg_sort().cast(pl.UInt64)
+    return df_nested.lazy().with_columns((rank * _wide_key_step(df_nested.schema)).alias(_WIDE_KEY)), df_nested.height
+
+
+def _wide_plan(lf: pl.LazyFrame, schema: pl.Schema, prefix_sep: str) -> pl.LazyFrame:
+    """
+    Wide rows of the (keyed) nested frame: the base and collection parts are built separately,
+    concatenated diagonally and put in output order by one stable sort on the integer key.
+    """
+    id_cols = list(SerializeTypes.ID_COLUMNS)
 
     # unnest singletons
-    for col_name, col_dtype in list(df.schema.items()):
+    for col_name, col_dtype in schema.items():
         if col_dtype == pl.Struct:
-            before = set(df.columns)
-            df = df.unnest(col_name)
-            new_cols = [col for col in df.columns if col not in before]
-            if new_cols:
-                df = df.rename({col: f"{col_name}{prefix_sep}{col}" for col in new_cols})
+            new_cols = [f.name for f in col_dtype.fields if f.name not in schema and f.name != _WIDE_KEY]
+            lf = lf.unnest(col_name).rename({col: f"{col_name}{prefix_sep}{col}" for col in new_cols})
+    flat = lf.collect_schema()
 
     # base branch: IDs + primitives + flattened singletons
-    base_cols = [col for col, dtype in df.schema.items() if dtype not in (pl.Struct,) and not isinstance(dtype, pl.List)]
+    base_cols = [col for col, dtype in flat.items() if dtype not in (pl.Struct,) and not isinstance(dtype, pl.List) and col != _WIDE_KEY]
     base_only = [col for col in base_cols if col not in SerializeTypes.ID_COLUMNS]
+    collections = [col for col, dtype in flat.items() if isinstance(dtype, pl.List)]
+    part_rank = {name: rank for rank, name in enumerate(sorted(collections), start=1)}
 
     # build base rows
-    base_sel = df.select([*SerializeTypes.ID_COLUMNS, *base_only])
-    base_sel = _filter_nonempty_rows(base_sel, base_only)
-
-    base = base_sel.with_columns(
+    base = _filter_nonempty_rows(lf.select([*id_cols, _WIDE_KEY, *base_only]), base_only).select(
+        *id_cols,
         pl.lit(None, dtype=pl.Int64).alias("row_index"),
         pl.lit("base").alias("row_type"),
+        *base_only,
+        _WIDE_KEY,
     )
-    base = _reorder_wide_columns(df=base, id_cols=SerializeTypes.ID_COLUMNS)
+    parts: list[pl.LazyFrame] = [base]
 
     # collection parts: ids + row_index + fields + row_type with no scalar duplication
-    parts: list[pl.DataFrame] = []
-    for col_name, col_dtype in df.schema.items():
-        if isinstance(col_dtype, pl.List):
-            part = _explode_collection_into(df, col_name, SerializeTypes.ID_COLUMNS, sep=prefix_sep)
-            if part is not None:
-                part = part.with_columns(pl.lit(col_name).alias("row_type"))
-                parts.append(_reorder_wide_columns(part, SerializeTypes.ID_COLUMNS))
+    for col_name in collections:
+        inner = flat[col_name].inner
+        fields = [f.name for f in inner.fields if f.name not in (*id_cols, "row_index", col_name)] if inner == pl.Struct else []
+        if not fields:
+            continue
+        parts.append(
+            lf.select(*id_cols, _WIDE_KEY, col_name)
+            .explode(col_name)
+            .filter(pl.col(col_name).is_not_null())
+            .select(
+                *id_cols,
+                pl.int_range(0, pl.len()).over(_WIDE_KEY).alias("row_index"),
+                pl.lit(col_name).alias("row_type"),
+                *[pl.col(col_name).struct.field(name).alias(f"{col_name}{prefix_sep}{name}") for name in fields],
+                pl.col(_WIDE_KEY) + part_rank[col_name],
+            )
+        )
 
-    wide = pl.concat([base, *parts], how="diagonal_relaxed") if parts else base
+    wide = pl.concat(parts, how="diagonal_relaxed")
 
     # ensure flat
-    nested = [col for col, dtype in wide.schema.items() if dtype == pl.Struct or isinstance(dtype, pl.List)]
+    nested = [col for col, dtype in wide.collect_schema().items() if dtype == pl.Struct or isinstance(dtype, pl.List)]
     if nested:
         raise RuntimeError(f"wide contains nested columns: {nested}")
 
-    return _sort_wide(wide)
+    return wide.sort(_WIDE_KEY, maintain_order=True).drop(_WIDE_KEY)
 
 
 def to_normalized(df_nested: pl.DataFrame) -> dict[str, pl.DataFrame]:
@@ -112,42 +167,244 @@ def build_nested_df(patients: list, patient_cls: type) -> pl.DataFrame:
       - singleton Struct columns
       - collection List[Struct] columns
     with a deterministic schema and no dtype inference.
-    """
-    schema = build_nested_schema(patients, patient_cls)
-    rows: list[dict] = []
 
-    for patient in patients:
-        row: dict[str, Any] = {}
-        for prop_name, prop in _public_properties(patient_cls).items():
-            value = getattr(patient, prop_name, None)
-            return_type = _property_return_type(patient_cls, prop_name)
-            base_type = unwrap_optional(return_type) if return_type else None
-            origin = typing.get_origin(base_type) if base_type else None
+    Built column by column: struct and list[struct] columns are assembled from per-field child
+    columns, no per-patient row dicts are materialized. Leaf fields are exported once, the struct
+    dtypes of `build_nested_schema` are inferred from the same child columns.
+    """
+    class_schema = _patient_class_schema(patient_cls)
+    plan = {field.name: field for field in _serialization_plan(patient_cls)}
+    masks = [getattr(patient, "_updated_mask", 0) for patient in patients]
+
+    columns: list[pl.Series] = []
+    for name, dtype in class_schema.items():
+        field = plan.get(name)
+        if field is None:
+            columns.append(pl.Series(name, [None] * len(patients), dtype=dtype))
+            continue
 
-            if value is None:
-                row[prop_name] = [] if origin in (list, tuple, Sequence, MutableSequence) else None
+        bit = field.bit
+        values = [
+            None if bit is not None and not mask >> bit & 1 else getattr(patient, name, None) for patient, mask in zip(patients, masks)
+        ]
+        if field.kind == "singleton":
+            leaf = _leaf_columns(values)
+            struct_dtype = leaf.dtype or dtype
+            if _struct_fields(struct_dtype):
+                columns.append(_struct_series(name, leaf, struct_dtype))
+                continue
+        elif field.kind == "collection" and isinstance(dtype, pl.List):
+            owners, items = _flatten_items(values)
+            leaf = _leaf_columns(items, infer=_is_empty_struct(dtype.inner))
+            list_dtype = pl.List(leaf.dtype) if _is_empty_struct(dtype.inner) and leaf.dtype else dtype
+            if _struct_fields(list_dtype.inner):
+                columns.append(_list_of_struct_series(name, owners, len(values), leaf, list_dtype))
                 continue
 
-            if origin in (list, tuple, Sequence, MutableSequence):
-                row[prop_name] = [export_leaf_object(item) for item in list(value)]
-            elif isinstance(base_type, type) and schema.get(prop_name) == pl.Struct:
-                row[prop_name] = export_leaf_object(value)
-            else:
-                row[prop_name] = _to_polars_primitive(value)
+        exported = [field.empty() if value is None else field.export(value) for value in values]
+        columns.append(pl.Series(name, exported, dtype=dtype, strict=False))
 
-        rows.append(row)
+    return pl.DataFrame(columns)
 
-    return pl.DataFrame(rows, schema=schema, strict=False, infer_schema_length=0)
 
+class _LeafColumns(NamedTuple):
+    objs: list[Any]
+    values: dict[str, list[Any]]
+    dtype: pl.Struct | None
 
-def _filter_nonempty_rows(df: pl.DataFrame, data_columns: list[str]) -> pl.DataFrame:
-    """Remove rows where all data columns are null or empty strings."""
+
+def _leaf_columns(objs: list[Any], infer: bool = True) -> _LeafColumns:
+    """
+    Exported leaf fields as child columns aligned with objs (None objs give nulls), in one pass.
+    With `infer`, the struct dtype folds the value dtypes of each field over the present objects like
+    `_enrich_schema_from_data` always did, None when no object exports any field.
+    """
+    values: dict[str, list[Any]] = {}
+    dtypes: dict[str, polars_data_type] = {}
+    present = [idx for idx, obj in enumerate(objs) if obj is not None]
+    classes = {type(objs[idx]) for idx in present}
+    bits = _leaf_field_bits(classes.pop()) if len(classes) == 1 else None
+
+    if bits is not None:
+        # one tracked leaf class: column by column
+        for field_name, bit in bits.items():
+            column = values[field_name] = [None] * len(objs)
+            for idx in present:
+                obj = objs[idx]
+                if bit is None or obj._updated_mask >> bit & 1:
+                    value = getattr(obj, field_name)
+                    column[idx] = value if type(value) in _PRIMITIVE_TYPES else _to_polars_primitive(value)
+            if infer and present:
+                dtypes[field_name] = _fold_dtypes(column[idx] for idx in present)
+    else:
+        for idx in present:
+            obj = objs[idx]
+            for field_name in _leaf_field_names(obj):
+                value = _leaf_value(obj, field_name)
+                inferred = _value_dtype(value)
+                column = values.get(field_name)
+                if column is None:
+                    column = values[field_name] = [None] * len(objs)
+                    dtypes[field_name] = inferred
+                elif dtypes[field_name] is not inferred:
+                    dtypes[field_name] = _unify_dtypes(dtypes[field_name], inferred)
+                column[idx] = value
+
+    dtype = pl.Struct({f: (pl.Utf8 if d == pl.Null else d) for f, d in dtypes.items()}) if infer and dtypes else None
+    return _LeafColumns(objs, values, dtype)
+
+
+_PRIMITIVE_TYPES = frozenset({type(None), str, int, float, bool, dt.date, dt.datetime})
+
+
+def _fold_dtypes(values: Iterable[Any]) -> polars_data_type:
+    folded: polars_data_type | None = None
+    for value in values:
+        inferred = _value_dtype(value)
+        if folded is None:
+            folded = inferred
+        elif folded is not inferred:
+            folded = _unify_dtypes(folded, inferred)
+    return folded if folded is not None else pl.Null
+
+
+def _value_dtype(value: Any) -> polars_data_type:
+    return _py_to_pl(type(value)) if value is not None else pl.Null
+
+
+def _flatten_items(values: list[Any]) -> tuple[list[int], list[Any]]:
+    owners: list[int] = []
+    items: list[Any] = []
+    for idx, value in enumerate(values):
+        if value:
+            owners.extend([idx] * len(value))
+            items.extend(value)
+    return owners, items
+
+
+def _struct_fields(dtype: polars_data_type) -> list[pl.Field]:
+    return list(dtype.fields) if isinstance(dtype, pl.Struct) else []
+
+
+def _is_empty_struct(dtype: polars_data_type) -> bool:
+    return isinstance(dtype, pl.Struct) and not dtype.fields
+
+
+def _struct_series(name: str, leaf: _LeafColumns, dtype: pl.Struct) -> pl.Series:
+    """Struct column from leaf child columns, one child Series per struct field, None objects are null rows"""
+    n = len(leaf.objs)
+    children = pl.DataFrame(
+        [pl.Series(child.name, leaf.values.get(child.name, [None] * n), dtype=child.dtype, strict=False) for child in dtype.fields]
+    )
+    valid = pl.Series("__valid", [obj is not None for obj in leaf.objs], dtype=pl.Boolean)
+    return children.select(pl.when(valid).then(pl.struct(pl.all())).alias(name)).to_series()
+
+
+def _list_of_struct_series(name: str, owners: list[int], n: int, leaf: _LeafColumns, dtype: pl.List) -> pl.Series:
+    """List[Struct] column from flattened leaf items and their owning row: one struct column, regrouped per row"""
+    flat = _struct_series(name, leaf, dtype.inner)
+    grouped = pl.DataFrame([pl.Series("__owner", owners, dtype=pl.Int64), flat]).group_by("__owner", maintain_order=True).agg(pl.col(name))
+    return (
+        pl.DataFrame({"__owner": pl.int_range(0, n, eager=True, dtype=pl.Int64)})
+        .join(grouped, on="__owner", how="left", maintain_order="left")
+        .select(pl.col(name).fill_null(pl.lit([], dtype=dtype)))
+        .to_series()
+        .cast(dtype)
+    )
+
+
+def _leaf_field_names(obj: Any) -> Iterable[str]:
+    """Field names export_leaf_object produces for obj"""
+    bits = _leaf_field_bits(obj.__class__)
+    if bits is not None:
+        return bits.keys()
+    return [name for name in getattr(obj, "__dict__", {}) if not name.startswith("_") and name not in SerializeTypes.IDENTITY_FIELDS]
+
+
+def _leaf_value(obj: Any, field_name: str) -> Any:
+    """Exported value of a single leaf field, as export_leaf_object would produce it"""
+    bits = _leaf_field_bits(obj.__class__)
+    if bits is None:
+        if field_name.startswith("_") or field_name in SerializeTypes.IDENTITY_FIELDS:
+            return None
+        return _to_polars_primitive(getattr(obj, "__dict__", {}).get(field_name))
+    if field_name not in bits:
+        return None
+    bit = bits[field_name]
+    if bit is not None and not getattr(obj, "_updated_mask", 0) >> bit & 1:
+        return None
+    return _to_polars_primitive(getattr(obj, field_name))
+
+
+@lru_cache(maxsize=512)
+def _leaf_field_bits(cls: type) -> dict[str, int | None] | None:
+    """Exported leaf fields (identity excluded) with their update bits, None for dynamic leaves"""
+    plan = _leaf_export_plan(cls)
+    if plan is None:
+        return None
+    return {prop_name: bit for prop_name, bit in plan if prop_name not in SerializeTypes.IDENTITY_FIELDS}
+
+
+class _FieldPlan(NamedTuple):
+    name: str
+    kind: Literal["scalar", "singleton", "collection"]
+    bit: int | None
+    export: Callable[[Any], Any]
+    empty: Callable[[], Any]
+
+
+@lru_cache(maxsize=512)
+def _serialization_plan(patient_cls: type) -> tuple[_FieldPlan, ...]:
+    """
+    Per-class nested row plan, resolved once from the class schema: property name, kind,
+    update bit (clear bit reads as None without calling the getter) and value exporter.
+    """
+    class_schema = _patient_class_schema(patient_cls)
+    skippable = _skippable_bits(patient_cls)
+    plan: list[_FieldPlan] = []
+    for prop_name in _public_properties(patient_cls):
+        return_type = _property_return_type(patient_cls, prop_name)
+        base_type = unwrap_optional(return_type) if return_type else None
+        origin = typing.get_origin(base_type) if base_type else None
+        bit = skippable.get(prop_name)
+
+        if origin in (list, tuple, Sequence, MutableSequence):
+            plan.append(_FieldPlan(prop_name, "collection", bit, _export_collection, list))
+        elif isinstance(base_type, type) and class_schema.get(prop_name) == pl.Struct:
+            plan.append(_FieldPlan(prop_name, "singleton", bit, export_leaf_object, _none))
+        else:
+            plan.append(_FieldPlan(prop_name, "scalar", bit, _to_polars_primitive, _none))
+    return tuple(plan)
+
+
+def _export_collection(value: Any) -> list[dict[str, Any]]:
+    return [export_leaf_object(item) for item in value]
+
+
+def _none() -> None:
+    return None
+
+
+def _filter_nonempty_rows(df: pl.DataFrame | pl.LazyFrame, data_columns: list[str]) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Remove rows where all data columns are null or blank strings.
+    Only string-like columns are stripped, other dtypes are empty only when null.
+    """
     if not data_columns:
         return df.head(0)
-    nonempty = pl.any_horizontal([pl.col(col).is_not_null() & (pl.col(col).cast(pl.Utf8).str.strip_chars() != "") for col in data_columns])
-    return df.filter(nonempty)
+    schema = df.collect_schema()
+    return df.filter(pl.any_horizontal([_is_nonempty(col, schema[col]) for col in data_columns]))
 
 
+def _is_nonempty(col: str, dtype: pl.DataType) -> pl.Expr:
+    if dtype == pl.Utf8:
+        return pl.col(col).str.strip_chars() != ""
+    if isinstance(dtype, (pl.Categorical, pl.Enum)):
+        return pl.col(col).cast(pl.Utf8).str.strip_chars() != ""
+    return pl.col(col).is_not_null()
+
+
+@lru_cache(maxsize=512)
 def _py_to_pl(tp: Any) -> polars_data_type:
     tp = unwrap_optional(tp)
     if tp is bool:
@@ -188,6 +445,7 @@ def _public_properties(cls: type) -> dict[str, property]:
     return {name: prop for name, prop in inspect.getmembers(cls, lambda o: isinstance(o, property)) if not name.startswith("_")}
 
 
+@lru_cache(maxsize=4096)
 def _property_return_type(cls: type, name: str) -> Any | None:
     """
     Return the property's annotated return type, if not present, fall back to
@@ -211,6 +469,7 @@ def _property_return_type(cls: type, name: str) -> Any | None:
     return None
 
 
+@lru_cache(maxsize=512)
 def _leaf_field_hints(leaf_cls: type) -> dict[str, Any]:
     """
     Collect field type hints from @property returns and class __annotations__.
@@ -249,23 +508,53 @@ def _to_polars_primitive(value: Any) -> Any:
     if hasattr(value, "to_dict") and callable(value.to_dict):
         return _to_polars_primitive(value.to_dict())
     if hasattr(value, "__dict__"):
-        return {key.lstrip("_"): _to_polars_primitive(val) for key, val in value.__dict__.items() if not key.startswith("__")}
+        return {
+            key.lstrip("_"): _to_polars_primitive(val)
+            for key, val in value.__dict__.items()
+            if not key.startswith("__") and key != "_updated_mask"
+        }
     return str(value)
 
 
+@lru_cache(maxsize=512)
+def _skippable_bits(cls: type) -> dict[str, int]:
+    """
+    Update bits of settable non-identity fields whose unset value is None, a clear bit means the field
+    was never set and reads as None. Collections read as empty when unset and are always read.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, TrackedValidated)):
+        return {}
+    return {
+        name: bit
+        for name, bit in tracked_bits(cls).items()
+        if name not in SerializeTypes.IDENTITY_FIELDS and not is_sequence_origin(unwrap_optional(_property_return_type(cls, name)))
+    }
+
+
+@lru_cache(maxsize=512)
+def _leaf_export_plan(cls: type) -> tuple[tuple[str, int | None], ...] | None:
+    """Readable public properties with their update bits in export order, None without public properties"""
+    if not _public_properties(cls):
+        return None
+    skippable = _skippable_bits(cls)
+    return tuple((prop_name, skippable.get(prop_name)) for prop_name, prop in _public_properties(cls).items() if prop.fget)
+
+
 def export_leaf_object(obj: Any, *, exclude: set[str] = SerializeTypes.IDENTITY_FIELDS) -> dict[str, Any]:
     """
     Export an object as a dict. Prefer public @properties, if none, fall back
     to __dict__ for dynamic leaves (like C30/EQ5D).
     Identity fields are dropped.
     """
-    props = _public_properties(obj.__class__)
-    if props:
-        return {
-            prop_name: _to_polars_primitive(getattr(obj, prop_name))
-            for prop_name, prop in props.items()
-            if prop.fget and prop_name not in exclude
-        }
+    plan = _leaf_export_plan(obj.__class__)
+    if plan is not None:
+        mask = getattr(obj, "_updated_mask", 0)
+        out: dict[str, Any] = {}
+        for prop_name, bit in plan:
+            if prop_name in exclude:
+                continue
+            out[prop_name] = None if bit is not None and not mask >> bit & 1 else _to_polars_primitive(getattr(obj, prop_name))
+        return out
     if hasattr(obj, "__dict__"):
         result: dict[str, Any] = {}
         for attr_name, attr_value in obj.__dict__.items():
@@ -319,56 +608,21 @@ def _patient_class_schema(patient_cls: type) -> dict[str, polars_data_type]:
 
 def _enrich_schema_from_data(patients: list, patient_cls: type, schema: dict[str, polars_data_type]) -> dict[str, polars_data_type]:
     """
-    If any leaf Struct/List(Struct) is empty, derive fields from actual data.
+    Singleton Structs take their fields from the exported data, empty leaf List(Struct)s learn them from the items.
     """
     enriched_schema = dict(schema)
 
-    for prop_name, prop in _public_properties(patient_cls).items():
-        return_type = _property_return_type(patient_cls, prop_name)
-        base_type = unwrap_optional(return_type) if return_type else None
-        origin = typing.get_origin(base_type) if base_type else None
-
-        if isinstance(base_type, type) and enriched_schema.get(prop_name) == pl.Struct:
-            fields: dict[str, pl.DataType] = {}
-            for patient in patients:
-                value = getattr(patient, prop_name, None)
-                if value is None:
-                    continue
-                exported = export_leaf_object(value)
-                for field_name, field_value in exported.items():
-                    inferred_dtype = _py_to_pl(type(field_value)) if field_value is not None else pl.Null
-                    fields[field_name] = (
-                        _unify_dtypes(fields.get(field_name, inferred_dtype), inferred_dtype) if field_name in fields else inferred_dtype
-                    )
-
-            if fields:
-                enriched_schema[prop_name] = pl.Struct(
-                    {field_name: (pl.Utf8 if field_dtype == pl.Null else field_dtype) for field_name, field_dtype in fields.items()}
-                )
-
-        # collections with empty inner struct: learn fields from data
-        current_dtype = enriched_schema.get(prop_name)
-        if origin in (list, tuple, Sequence, MutableSequence) and isinstance(current_dtype, pl.List):
-            inner = current_dtype.inner
-            if str(inner) == "Struct({})":
-                fields: dict[str, pl.DataType] = {}
-                for patient in patients:
-                    sequence = getattr(patient, prop_name, ()) or ()
-                    for item in sequence:
-                        exported = export_leaf_object(item)
-                        for field_name, field_value in exported.items():
-                            inferred_dtype = _py_to_pl(type(field_value)) if field_value is not None else pl.Null
-                            fields[field_name] = (
-                                _unify_dtypes(fields.get(field_name, inferred_dtype), inferred_dtype)
-                                if field_name in fields
-                                else inferred_dtype
-                            )
-                if fields:
-                    enriched_schema[prop_name] = pl.List(
-                        pl.Struct(
-                            {field_name: (pl.Utf8 if field_dtype == pl.Null else field_dtype) for field_name, field_dtype in fields.items()}
-                        )
-                    )
+    for field in _serialization_plan(patient_cls):
+        current_dtype = enriched_schema.get(field.name)
+        if field.kind == "singleton":
+            inferred = _leaf_columns([getattr(patient, field.name, None) for patient in patients]).dtype
+            if inferred is not None:
+                enriched_schema[field.name] = inferred
+        elif field.kind == "collection" and isinstance(current_dtype, pl.List) and _is_empty_struct(current_dtype.inner):
+            _, items = _flatten_items([getattr(patient, field.name, ()) for patient in patients])
+            inferred = _leaf_columns(items).dtype
+            if inferred is not None:
+                enriched_schema[field.name] = pl.List(inferred)
 
     enriched_schema.setdefault("patient_id", pl.Utf8)
     enriched_schema.setdefault("trial_id", pl.Utf8)
@@ -380,14 +634,11 @@ def _unnest_singleton_into(df: pl.DataFrame, struct_col: str, id_cols: Sequence[
     if struct_col not in df.columns or not df.schema[struct_col] == pl.Struct:
         return df.select(id_cols)
 
-    selected = df.select([*id_cols, struct_col])
-    cols_before = set(selected.columns)
-    unnested = selected.unnest(struct_col)
-    new_fields = [col for col in unnested.columns if col not in cols_before]
-    if not new_fields:
+    # fields are taken by name, a field named like its struct (lost_to_followup.lost_to_followup) is kept
+    fields = [f.name for f in df.schema[struct_col].fields if f.name not in id_cols]
+    if not fields:
         return df.select(id_cols)
-    rename_map = {col: f"{struct_col}{sep}{col}" for col in new_fields}
-    return unnested.rename(rename_map).select([*id_cols, *rename_map.values()])
+    return df.select(*id_cols, *[pl.col(struct_col).struct.field(name).alias(f"{struct_col}{sep}{name}") for name in fields])
 
 
 def _explode_collection_into(df: pl.DataFrame, list_col: str, id_cols: Sequence[str], sep: str) -> pl.DataFrame | None:
@@ -401,21 +652,11 @@ def _explode_collection_into(df: pl.DataFrame, list_col: str, id_cols: Sequence[
     # per-patient row_index
     exploded = exploded.with_columns(pl.int_range(0, pl.len()).over(id_cols).alias("row_index"))
 
-    cols_before = set(exploded.columns)
-    unnested = exploded.unnest(list_col)
-    new_fields = [col for col in unnested.columns if col not in cols_before]
-    if not new_fields:
+    inner = df.schema[list_col].inner
+    fields = [f.name for f in inner.fields if f.name not in (*id_cols, "row_index")] if isinstance(inner, pl.Struct) else []
+    if not fields:
         return None
-
-    rename_map = {col: f"{list_col}{sep}{col}" for col in new_fields}
-    return unnested.rename(rename_map).select([*id_cols, "row_index", *rename_map.values()])
-
-
-def _reorder_wide_columns(df: pl.DataFrame, id_cols: Sequence[str]) -> pl.DataFrame:
-    """Place ids & row_index & row_type first"""
-    front = [*id_cols, "row_index", "row_type"]
-    rest = [col for col in df.columns if col not in front]
-    return df.select([*front, *rest])
+    return exploded.select(*id_cols, "row_index", *[pl.col(list_col).struct.field(name).alias(f"{list_col}{sep}{name}") for name in fields])
 
 
 def _sort_wide(
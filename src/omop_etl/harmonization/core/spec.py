@@ -0,0 +1,155 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Literal, Mapping, Sequence
+
+import polars as pl
+
+from omop_etl.harmonization.core.track_validated import TrackedValidated
+
+Aggregation = Literal["first", "last", "min", "max", "any", "sum"]
+
+
+@dataclass(frozen=True)
+class ScalarSpec:
+    """
+    Patient scalar computed per subject.
+
+    `source` is evaluated per input row (source columns + parser), aggregated over the rows where `where`
+    holds (default: non-null source) in input order, then `parser` is applied to the aggregated value.
+    Targets starting with "_" are intermediates for DerivedSpecs and are not assigned.
+    """
+
+    target: str
+    source: pl.Expr
+    agg: Aggregation = "last"
+    where: pl.Expr | None = None
+    parser: Callable[[pl.Expr], pl.Expr] | None = None
+
+
+@dataclass(frozen=True)
+class DerivedSpec:
+    """Patient scalar computed from aggregated scalars (referenced by target name in `inputs`)."""
+
+    target: str
+    expr: pl.Expr
+    inputs: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """
+    Patient collection: one model object per input row with any non-null field, packed per subject.
+
+    `fields` maps model attribute -> row expression, `where` filters rows on the parsed attribute
+    columns, `order_by` sorts items within a subject by attribute columns.
+    """
+
+    target: str
+    model: type[TrackedValidated]
+    fields: Mapping[str, pl.Expr]
+    where: pl.Expr | None = None
+    order_by: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class HarmonizerSpec:
+    """Declarative harmonizer fields, compiled into lazy plans that are collected together."""
+
+    scalars: Sequence[ScalarSpec] = ()
+    derived: Sequence[DerivedSpec] = ()
+    collections: Sequence[CollectionSpec] = ()
+    subject_col: str = "SubjectId"
+    items_col: str = "items"
+    assign: frozenset[str] | None = None
+
+    def select(self, *targets: str) -> HarmonizerSpec:
+        """Sub-spec computing only `targets` and the scalars they are derived from."""
+        wanted = set(targets)
+        derived = [d for d in self.derived if d.target in wanted]
+        needed = wanted | {name for d in derived for name in d.inputs}
+        return HarmonizerSpec(
+            scalars=[s for s in self.scalars if s.target in needed],
+            derived=derived,
+            collections=[c for c in self.collections if c.target in wanted],
+            subject_col=self.subject_col,
+            items_col=self.items_col,
+            assign=frozenset(wanted),
+        )
+
+    @property
+    def assigned_scalars(self) -> list[str]:
+        """Scalar targets assigned to patients: public targets, restricted to the selected ones."""
+        return [
+            s.target
+            for s in [*self.scalars, *self.derived]
+            if not s.target.startswith("_") and (self.assign is None or s.target in self.assign)
+        ]
+
+
+@dataclass
+class CompiledSpec:
+    spec: HarmonizerSpec
+    scalar_plan: pl.LazyFrame | None
+    collection_plans: Dict[str, pl.LazyFrame] = field(default_factory=dict)
+
+    def collect(self) -> tuple[pl.DataFrame | None, Dict[str, pl.DataFrame]]:
+        """Run all plans in one pass so common input scans are shared."""
+        plans = [*([self.scalar_plan] if self.scalar_plan is not None else []), *self.collection_plans.values()]
+        frames = pl.collect_all(plans)
+        scalars = frames.pop(0) if self.scalar_plan is not None else None
+        return scalars, dict(zip(self.collection_plans, frames))
+
+
+def compile_spec(spec: HarmonizerSpec, data: pl.DataFrame | pl.LazyFrame) -> CompiledSpec:
+    lf = data.lazy()
+    subject = spec.subject_col
+    scalar_plan = _compile_scalars(spec, lf) if spec.scalars else None
+    collection_plans = {c.target: _compile_collection(c, lf, subject, spec.items_col) for c in spec.collections}
+    return CompiledSpec(spec=spec, scalar_plan=scalar_plan, collection_plans=collection_plans)
+
+
+def _compile_scalars(spec: HarmonizerSpec, lf: pl.LazyFrame) -> pl.LazyFrame:
+    # row level: evaluate each source once, aggregate plain columns per subject, then parse the aggregates
+    row_exprs: list[pl.Expr] = []
+    agg_exprs: list[pl.Expr] = []
+    parse_exprs: list[pl.Expr] = []
+    for s in spec.scalars:
+        value_col, where_col = f"__{s.target}", f"__{s.target}__where"
+        row_exprs.append(s.source.alias(value_col))
+        row_exprs.append((s.where if s.where is not None else s.source.is_not_null()).alias(where_col))
+        agg_exprs.append(_aggregate(pl.col(value_col).filter(pl.col(where_col)), s.agg).alias(s.target))
+        if s.parser is not None:
+            parse_exprs.append(s.parser(pl.col(s.target)).alias(s.target))
+
+    plan = lf.select(pl.col(spec.subject_col), *row_exprs).group_by(spec.subject_col, maintain_order=True).agg(agg_exprs)
+    if parse_exprs:
+        plan = plan.with_columns(parse_exprs)
+    if spec.derived:
+        plan = plan.with_columns([d.expr.alias(d.target) for d in spec.derived])
+    return plan.select(spec.subject_col, *spec.assigned_scalars)
+
+
+def _compile_collection(c: CollectionSpec, lf: pl.LazyFrame, subject_col: str, items_col: str) -> pl.LazyFrame:
+    attrs = list(c.fields)
+    plan = lf.select(pl.col(subject_col), *[expr.alias(attr) for attr, expr in c.fields.items()])
+    if c.where is not None:
+        plan = plan.filter(c.where)
+    plan = plan.filter(pl.any_horizontal(pl.col(attrs).is_not_null()))
+    if c.order_by:
+        plan = plan.sort([subject_col, *c.order_by], maintain_order=True)
+    return plan.group_by(subject_col, maintain_order=True).agg(pl.struct(attrs).alias(items_col))
+
+
+def _aggregate(expr: pl.Expr, agg: Aggregation) -> pl.Expr:
+    if agg == "first":
+        return expr.first()
+    if agg == "last":
+        return expr.last()
+    if agg == "min":
+        return expr.min()
+    if agg == "max":
+        return expr.max()
+    if agg == "any":
+        return expr.any()
+    if agg == "sum":
+        return expr.sum()
+    raise ValueError(f"Unsupported aggregation: {agg}")
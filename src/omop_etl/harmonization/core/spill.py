@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+import polars as pl
+
+from omop_etl.harmonization.core.rehydrate import patients_from_normalized
+from omop_etl.harmonization.core.serialize import build_nested_df, to_normalized
+from omop_etl.harmonization.models.patient import Patient
+
+
+class PatientSpillStore:
+    """
+    Patients spilled to disk as normalized Parquet batches, read back one batch at a time.
+
+    Appended patients are buffered until `batch_size` is reached, then written to a batch directory
+    with one file per normalized table and dropped from memory. The scratch directory is removed on
+    `close()` or when the store is garbage collected.
+    """
+
+    def __init__(self, batch_size: int = 1000, directory: Path | None = None, patient_cls: type[Patient] = Patient):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        self.batch_size = batch_size
+        self.patient_cls = patient_cls
+        self.directory = Path(tempfile.mkdtemp(prefix="harmonized_spill_", dir=directory))
+        self._batches: List[Path] = []
+        self._table_files: Dict[str, List[Path]] = {}
+        self._buffer: List[Patient] = []
+        self._spilled = 0
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._buffer)
+
+    def append(self, patients: Iterable[Patient]) -> None:
+        for patient in patients:
+            self._buffer.append(patient)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered patients as a new batch"""
+        if not self._buffer:
+            return
+
+        batch_dir = self.directory / f"batch_{len(self._batches):05d}"
+        batch_dir.mkdir()
+        for name, frame in to_normalized(build_nested_df(self._buffer, self.patient_cls)).items():
+            path = batch_dir / f"{name}.parquet"
+            frame.write_parquet(path)
+            self._table_files.setdefault(name, []).append(path)
+
+        self._batches.append(batch_dir)
+        self._spilled += len(self._buffer)
+        self._buffer = []
+
+    def iter_batches(self) -> Iterator[List[Patient]]:
+        """Rehydrated patients, one spilled batch at a time"""
+        self.flush()
+        for batch_dir in self._batches:
+            frames = {path.stem: pl.read_parquet(path) for path in batch_dir.glob("*.parquet")}
+            yield patients_from_normalized(frames, self.patient_cls)
+
+    def scan_normalized(self) -> Dict[str, pl.LazyFrame]:
+        """Normalized tables over all batches, batch columns are aligned by name"""
+        self.flush()
+        return {
+            name: pl.concat([pl.scan_parquet(path) for path in paths], how="diagonal_relaxed") for name, paths in self._table_files.items()
+        }
+
+    def close(self) -> None:
+        self._finalizer()
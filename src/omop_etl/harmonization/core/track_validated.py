@@ -1,9 +1,91 @@
+import datetime as dt
+import typing
+from collections.abc import MutableSet
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Sequence, Self
+
+import polars as pl
+
+from omop_etl.infra.utils.types import unwrap_optional
+
+# bumped on every tracked field update of any TrackedValidated object (once per object in bulk assignments),
+# cheap staleness check for derived caches and the profiler's per-processor row counts
+_mutations = 0
+
+
+def mutation_count() -> int:
+    return _mutations
+
+
+def _bump(n: int = 1) -> None:
+    global _mutations
+    _mutations += n
+
+
+class UpdatedFields(MutableSet):
+    """Set-like view of the fields set on a TrackedValidated object, backed by its bitmask"""
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: TrackedValidated):
+        self._obj = obj
+
+    def __contains__(self, name: object) -> bool:
+        bit = _FIELD_INDEX.get(type(self._obj), {}).get(name)  # type: ignore[call-overload]
+        return bit is not None and bool(self._obj._updated_mask >> bit & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        mask = self._obj._updated_mask
+        names = list(_FIELD_INDEX.get(type(self._obj), {}))
+        return iter([names[bit] for bit in range(mask.bit_length()) if mask >> bit & 1])
+
+    def __len__(self) -> int:
+        return self._obj._updated_mask.bit_count()
+
+    def add(self, name: str) -> None:
+        self._obj._updated_mask |= 1 << field_bit(type(self._obj), name)
+        _bump()
+
+    def discard(self, name: str) -> None:
+        bit = _FIELD_INDEX.get(type(self._obj), {}).get(name)
+        if bit is not None:
+            self._obj._updated_mask &= ~(1 << bit)
+            _bump()
+
+    def update(self, *names: Iterable[str]) -> None:
+        for group in names:
+            self._obj._updated_mask |= field_mask(type(self._obj), group)
+        _bump()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({set(self)!r})"
+
+
+class _UpdatedFieldsDescriptor:
+    """`obj.updated_fields` as a set-like view, assigning an iterable of names replaces the mask"""
+
+    def __get__(self, obj: TrackedValidated | None, objtype: type | None = None) -> Any:
+        return self if obj is None else UpdatedFields(obj)
+
+    def __set__(self, obj: TrackedValidated, names: Iterable[str]) -> None:
+        obj._updated_mask = field_mask(type(obj), names)
+        _bump()
+
+
 class TrackedValidated:
     """
     Set and validate scalars with StrictValidators.
+
+    Bulk construction from already-typed Polars structs can skip per-value validation
+    with `from_struct`, once the struct schema is verified with `verify_struct_schema`.
+
+    Set fields are tracked as bits in `_updated_mask` (bit positions from a per-class field index),
+    `updated_fields` is a set-like view of it. Every update also bumps the global `mutation_count()`.
     """
 
-    updated_fields: set[str]
+    _updated_mask: int = 0
+    updated_fields = _UpdatedFieldsDescriptor()
 
     def _set_validated_prop(
         self,
@@ -15,4 +97,164 @@ class TrackedValidated:
         name = prop.fset.__name__
         private_attr = f"_{name}"
         setattr(self, private_attr, validator(value=value, field_name=name, **validator_kwargs))
-        self.updated_fields.add(name)
+        self._mark_updated(name)
+
+    def _mark_updated(self, name: str) -> None:
+        """Set the tracked bit of `name`, for setters that assign their value themselves"""
+        self._updated_mask |= 1 << field_bit(type(self), name)
+        _bump()
+
+    @classmethod
+    def field_types(cls) -> dict[str, Any]:
+        """Declared (non-optional) value type per settable property, from the setter value annotations."""
+        return _declared_field_types(cls)
+
+    @classmethod
+    def verify_struct_schema(
+        cls,
+        schema: pl.Struct | Mapping[str, pl.DataType],
+        fields: Mapping[str, str],
+    ) -> None:
+        """
+        Check once per batch that every source column in `fields` (source -> attribute) has a
+        dtype whose values pass the attribute's StrictValidator, raises TypeError otherwise.
+        """
+        source_schema = schema.to_schema() if isinstance(schema, pl.Struct) else schema
+        declared = cls.field_types()
+
+        for source, attr in fields.items():
+            if source not in source_schema:
+                raise TypeError(f"{cls.__name__}.{attr}: source column {source!r} missing from struct schema")
+            if attr not in declared:
+                raise TypeError(f"{cls.__name__}.{attr}: no declared type, cannot be built without validation")
+            dtype = source_schema[source]
+            if not _dtype_matches(dtype, declared[attr]):
+                raise TypeError(f"{cls.__name__}.{attr}: source column {source!r} has dtype {dtype}, expected {declared[attr]}")
+
+    @classmethod
+    def from_struct(
+        cls,
+        patient_id: str,
+        struct: Mapping[str, Any],
+        fields: Mapping[str, str],
+    ) -> Self:
+        """
+        Trusted constructor: assigns struct values (source -> attribute) without per-value validation.
+        Only use after `verify_struct_schema` succeeded for the batch the struct comes from.
+        """
+        return cls.from_columns([patient_id], {source: [struct[source]] for source in fields}, fields)[0]
+
+    @classmethod
+    def from_columns(
+        cls,
+        patient_ids: Sequence[str],
+        columns: Mapping[str, Sequence[Any]],
+        fields: Mapping[str, str],
+    ) -> list[Self]:
+        """
+        Trusted bulk constructor: builds one object per position in the column lists (source -> attribute),
+        without per-value validation. Only use after `verify_struct_schema` succeeded for the batch.
+        """
+        return cls.assign_columns([cls(pid) for pid in patient_ids], columns, fields)  # type: ignore[call-arg]
+
+    @classmethod
+    def assign_columns(
+        cls,
+        objs: Sequence[Self],
+        columns: Mapping[str, Sequence[Any]],
+        fields: Mapping[str, str],
+    ) -> list[Self]:
+        """
+        Trusted bulk assignment onto existing objects, one position in the column lists per object
+        (source -> attribute). Only use after `verify_struct_schema` succeeded for the batch.
+        """
+        coercers = _enum_coercers(cls)
+        private_attrs = [f"_{attr}" for attr in fields.values()]
+        updated = field_mask(cls, fields.values())
+
+        value_lists: list[Sequence[Any]] = []
+        for source, attr in fields.items():
+            values = columns[source]
+            coerce = coercers.get(attr)
+            if coerce is not None:
+                values = [coerce(v) if v is not None else None for v in values]
+            value_lists.append(values)
+
+        for obj, values in zip(objs, zip(*value_lists)):
+            obj.__dict__.update(zip(private_attrs, values))
+            obj._updated_mask |= updated
+        _bump(len(objs))
+        return list(objs)
+
+
+# per-class field name -> bit, seeded with the settable properties and extended with other tracked names
+_FIELD_INDEX: Dict[type, Dict[str, int]] = {}
+
+
+def field_index(cls: type) -> Dict[str, int]:
+    index = _FIELD_INDEX.get(cls)
+    if index is None:
+        settable = sorted(name for name in dir(cls) if not name.startswith("_") and isinstance(getattr(cls, name, None), property))
+        index = _FIELD_INDEX.setdefault(cls, {name: bit for bit, name in enumerate(n for n in settable if getattr(cls, n).fset)})
+    return index
+
+
+def field_bit(cls: type, name: str) -> int:
+    index = field_index(cls)
+    bit = index.get(name)
+    if bit is None:
+        bit = index.setdefault(name, len(index))
+    return bit
+
+
+def field_mask(cls: type, names: Iterable[str]) -> int:
+    mask = 0
+    for name in names:
+        mask |= 1 << field_bit(cls, name)
+    return mask
+
+
+@lru_cache(maxsize=128)
+def tracked_bits(cls: type) -> Mapping[str, int]:
+    """Bits of the settable properties, whose unset values are None and can be skipped by serialization"""
+    return {name: bit for name, bit in field_index(cls).items() if getattr(getattr(cls, name, None), "fset", None) is not None}
+
+
+@lru_cache(maxsize=128)
+def _declared_field_types(cls: type) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for name in dir(cls):
+        prop = getattr(cls, name, None)
+        if name.startswith("_") or not isinstance(prop, property) or prop.fset is None:
+            continue
+        value_type = typing.get_type_hints(prop.fset).get("value")
+        if value_type is not None:
+            out[name] = unwrap_optional(value_type)
+    return out
+
+
+@lru_cache(maxsize=128)
+def _enum_coercers(cls: type) -> dict[str, Callable[[Any], Any]]:
+    return {name: tp for name, tp in _declared_field_types(cls).items() if isinstance(tp, type) and issubclass(tp, Enum)}
+
+
+def _dtype_matches(dtype: pl.DataType, py_type: Any) -> bool:
+    """True if every non-null value of `dtype` converts to a Python value accepted for `py_type`."""
+    if dtype == pl.Null:
+        return True
+    if isinstance(py_type, type) and issubclass(py_type, Enum):
+        if isinstance(dtype, pl.Enum):
+            valid = {member.value for member in py_type}
+            return set(dtype.categories.to_list()) <= valid
+        return False
+    if py_type is bool:
+        return dtype == pl.Boolean
+    if py_type is int:
+        return dtype.is_integer()
+    if py_type is float:
+        return dtype in (pl.Float32, pl.Float64)
+    if py_type is str:
+        return dtype == pl.String or dtype == pl.Categorical
+    if py_type is dt.date:
+        return dtype == pl.Date
+    return False
@@ -7,7 +7,11 @@ from typing import (
     Sequence,
     Mapping,
     Any,
+    ClassVar,
 )
+from omop_etl.harmonization.core.profiling import HarmonizerProfiler
+from omop_etl.harmonization.core.spec import HarmonizerSpec, compile_spec
+from omop_etl.harmonization.core.track_validated import TrackedValidated
 from omop_etl.harmonization.models.patient import Patient
 from omop_etl.harmonization.models.harmonized import HarmonizedData
 
@@ -22,11 +26,27 @@ class BaseHarmonizer(ABC):
     Each processing methods updates the corresponding instance attributes.
     The return objects are iteratively built during processing and returned
     as one instance of the HarmonizedData class storing the harmonized data.
+
+    Pass a HarmonizerProfiler to record wall/CPU time, rows and memory per processing method,
+    processing methods run through `_run_processors` are measured.
+
+    INPUT_COLUMNS declares the input columns (names or `^...$` patterns) the harmonizer reads,
+    the pipeline prunes its input scan to these. None reads every column.
+
+    SPEC declares fields as source expressions + aggregations instead of processing methods,
+    `_apply_spec` compiles (parts of) it into lazy plans that are collected in one pass.
+
+    VERSION is part of the harmonization cache key, bump it when the output changes for the same input.
     """
 
-    def __init__(self, data: pl.DataFrame, trial_id: str):
+    VERSION: ClassVar[str] = "1"
+    INPUT_COLUMNS: ClassVar[Sequence[str] | None] = None
+    SPEC: ClassVar[HarmonizerSpec | None] = None
+
+    def __init__(self, data: pl.DataFrame, trial_id: str, profiler: HarmonizerProfiler | None = None):
         self.data = data
         self.trial_id = trial_id
+        self.profiler = profiler
         self.patient_data: Dict[str, Patient] = {}
         self.medical_histories: List | None = []
         self.previous_treatment_lines: List | None = []
@@ -41,6 +61,56 @@ class BaseHarmonizer(ABC):
         """Processes all data and returns a complete, harmonized structure"""
         pass
 
+    def _run_processors(self, processors: Sequence[Callable[[], None]]) -> None:
+        """Run processing methods in order, measuring each one when profiling"""
+        if self.profiler is None:
+            for processor in processors:
+                processor()
+            return
+
+        for processor in processors:
+            with self.profiler.measure(processor.__name__, rows_in=self.data.height, count_records=self.patient_data.__len__):
+                processor()
+
+    def _apply_spec(self, *targets: str) -> None:
+        """Compute the declared fields (all of SPEC if no targets are given) and assign them to the patients"""
+        if self.SPEC is None:
+            raise ValueError(f"{type(self).__name__} does not declare a SPEC")
+
+        spec = self.SPEC.select(*targets) if targets else self.SPEC
+        scalars, collections = compile_spec(spec, self.data).collect()
+
+        if scalars is not None:
+            self._hydrate_scalars(scalars, subject_col=spec.subject_col, targets=spec.assigned_scalars)
+
+        for c in spec.collections:
+            self.hydrate_list_field(
+                collections[c.target],
+                model=c.model,
+                fields={attr: attr for attr in c.fields},
+                subject_col=spec.subject_col,
+                items_col=spec.items_col,
+                target_attr=c.target,
+                patients=self.patient_data,
+            )
+
+    def _hydrate_scalars(self, frame: pl.DataFrame, *, subject_col: str, targets: Sequence[str]) -> None:
+        """Assign per-subject scalar columns to the patients, verified once per column, nulls are left unset"""
+        Patient.verify_struct_schema(frame.schema, {t: t for t in targets})
+
+        for target in targets:
+            present = frame.select(subject_col, target).filter(pl.col(target).is_not_null())
+            sids: List[str] = present.get_column(subject_col).to_list()
+            missing = next((sid for sid in sids if sid not in self.patient_data), None)
+            if missing is not None:
+                raise KeyError(f"Patient {missing} not found in patients mapping")
+
+            Patient.assign_columns(
+                [self.patient_data[sid] for sid in sids],
+                {target: present.get_column(target).to_list()},
+                {target: target},
+            )
+
     # scalars
     @abstractmethod
     def _process_patient_id(self) -> None:
@@ -156,6 +226,8 @@ class BaseHarmonizer(ABC):
         packed: pl.DataFrame,
         *,
         builder: Callable[[str, Mapping[str, Any]], Any] | None = None,
+        model: type[TrackedValidated] | None = None,
+        fields: Mapping[str, str] | None = None,
         skip_missing: bool | None = False,
         subject_col: str = "SubjectId",
         items_col: str = "items",
@@ -164,16 +236,35 @@ class BaseHarmonizer(ABC):
     ) -> None:
         """
         Hydrate a list-valued patient field from a packed List[Struct] col: multiple instances per patient.
-        Iterates each subject row from packed: [subject_col, items_col], for each struct in items, builds a Python model object.
         Allows instantiation of many-to-one fields in collection models.
 
+        Two ways to build the model objects:
+          - declarative: model + fields (struct column -> model attribute). The struct schema is verified
+            once against the model's declared types, then all objects are built in bulk from column lists.
+          - builder: a closure called per struct, for special cases that need per-item logic.
+
         Defaults to raising error for missing patients.
         """
         if target_attr is None:
             raise ValueError("Provide either target_attr to attach objects to the patient")
 
-        if builder is None:
-            raise ValueError("Provide builder")
+        if (builder is None) == (fields is None):
+            raise ValueError("Provide either builder or fields")
+
+        if fields is not None:
+            if model is None:
+                raise ValueError("Provide model when hydrating from fields")
+            BaseHarmonizer._hydrate_list_field_bulk(
+                packed,
+                model=model,
+                fields=fields,
+                skip_missing=skip_missing,
+                subject_col=subject_col,
+                items_col=items_col,
+                target_attr=target_attr,
+                patients=patients,
+            )
+            return
 
         for sid, items in packed.select(subject_col, items_col).iter_rows():
             patient = patients.get(sid)
@@ -185,6 +276,39 @@ class BaseHarmonizer(ABC):
             objs: List[Any] = [builder(sid, s) for s in items]
             setattr(patient, target_attr, objs)
 
+    @staticmethod
+    def _hydrate_list_field_bulk(
+        packed: pl.DataFrame,
+        *,
+        model: type[TrackedValidated],
+        fields: Mapping[str, str],
+        skip_missing: bool | None,
+        subject_col: str,
+        items_col: str,
+        target_attr: str,
+        patients: Dict[str, Any],
+    ) -> None:
+        """Build every object of a packed collection from flat column lists, then slice per subject."""
+        model.verify_struct_schema(packed.schema[items_col].inner, fields)
+
+        sids: List[str] = packed.get_column(subject_col).to_list()
+        lengths: List[int] = packed.get_column(items_col).list.len().fill_null(0).to_list()
+
+        flat = packed.filter(pl.col(items_col).list.len() > 0).select(pl.col(items_col).explode()).unnest(items_col)
+        owners = [sid for sid, n in zip(sids, lengths) for _ in range(n)]
+        objs = model.from_columns(owners, {source: flat.get_column(source).to_list() for source in fields}, fields)
+
+        offset = 0
+        for sid, n in zip(sids, lengths):
+            items = objs[offset : offset + n]
+            offset += n
+            patient = patients.get(sid)
+            if patient is None:
+                if skip_missing:
+                    continue
+                raise KeyError(f"Patient {sid} not found in patients mapping")
+            setattr(patient, target_attr, items)
+
     @staticmethod
     def hydrate_singleton(
         frame: pl.DataFrame,
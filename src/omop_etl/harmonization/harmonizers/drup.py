@@ -1,15 +1,15 @@
 import polars as pl
+from omop_etl.harmonization.core.profiling import HarmonizerProfiler
 from omop_etl.harmonization.harmonizers.base import BaseHarmonizer
 from omop_etl.harmonization.models import HarmonizedData, Patient
 
 
 class DrupHarmonizer(BaseHarmonizer):
-    def __init__(self, data: pl.DataFrame, trial_id: str):
-        super().__init__(data, trial_id)
+    def __init__(self, data: pl.DataFrame, trial_id: str, profiler: HarmonizerProfiler | None = None):
+        super().__init__(data, trial_id, profiler)
 
     def process(self) -> HarmonizedData:
-        self._process_patient_id()
-        self._process_cohort_name()
+        self._run_processors([self._process_patient_id, self._process_cohort_name])
 
         # flatten patient values
         patients = list(self.patient_data.values())
@@ -1,10 +1,12 @@
-import re
 from typing import Mapping, Any
 from deprecated import deprecated
 import polars as pl
 from logging import getLogger
 
 from omop_etl.harmonization.core.parsers import PolarsParsers
+from omop_etl.harmonization.core.profiling import HarmonizerProfiler
+from omop_etl.harmonization.core.questionnaire import resolve_questionnaire_schema
+from omop_etl.harmonization.core.spec import CollectionSpec, DerivedSpec, HarmonizerSpec, ScalarSpec
 from omop_etl.harmonization.harmonizers.base import BaseHarmonizer
 from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent
 from omop_etl.harmonization.models.domain.best_overall_response import BestOverallResponse
@@ -28,47 +30,199 @@ log = getLogger(__name__)
 
 
 class ImpressHarmonizer(BaseHarmonizer):
-    def __init__(self, data: pl.DataFrame, trial_id: str):
-        super().__init__(data, trial_id)
+    # eCRF sheets read by the processors, every column of a used sheet is kept
+    INPUT_SHEETS = (
+        "AE",
+        "C30",
+        "CM",
+        "COH",
+        "CT",
+        "DM",
+        "ECOG",
+        "EOS",
+        "EOT",
+        "EQ5D",
+        "FU",
+        "MH",
+        "RA",
+        "RCNT",
+        "RNRSP",
+        "RNTMNT",
+        "TR",
+        "VI",
+    )
+    INPUT_COLUMNS = ("SubjectId", f"^({'|'.join(INPUT_SHEETS)})_.*$")
+
+    # fields declared as per-subject aggregations, applied by their _process_* methods
+    SPEC = HarmonizerSpec(
+        scalars=[
+            ScalarSpec(
+                "cohort_name",
+                source=pl.col("COH_COHORTNAME"),
+                where=PolarsParsers.to_optional_utf8(pl.col("COH_COHORTNAME")).is_not_null(),
+            ),
+            ScalarSpec(
+                "sex",
+                source=(
+                    pl.when(PolarsParsers.to_optional_utf8(pl.col("DM_SEX")).str.to_lowercase().is_in(["m", "male"]))
+                    .then(pl.lit("male"))
+                    .when(PolarsParsers.to_optional_utf8(pl.col("DM_SEX")).str.to_lowercase().is_in(["f", "female"]))
+                    .then(pl.lit("female"))
+                    .otherwise(None)
+                ),
+                where=PolarsParsers.to_optional_utf8(pl.col("DM_SEX")).is_not_null(),
+            ),
+            ScalarSpec("date_of_birth", source=pl.col("DM_BRTHDAT"), agg="first", parser=PolarsParsers.to_optional_date),
+            ScalarSpec("_last_treatment", source=pl.col("TR_TRC1_DT"), agg="max", parser=PolarsParsers.to_optional_date),
+            ScalarSpec(
+                "date_of_death",
+                source=pl.max_horizontal(
+                    PolarsParsers.to_optional_date(pl.col("EOS_DEATHDTC")),
+                    PolarsParsers.to_optional_date(pl.col("FU_FUPDEDAT")),
+                ),
+                agg="max",
+            ),
+            ScalarSpec(
+                "has_any_adverse_events",
+                source=pl.any_horizontal(
+                    PolarsParsers.to_optional_utf8("AE_AECTCAET").str.len_chars().fill_null(0) > 0,
+                    PolarsParsers.to_optional_utf8("AE_AESTDAT").str.len_chars().fill_null(0) > 0,
+                    PolarsParsers.to_optional_utf8("AE_AETOXGRECD").str.len_chars().fill_null(0) > 0,
+                ),
+                agg="any",
+            ),
+            ScalarSpec(
+                "number_of_adverse_events",
+                source=pl.any_horizontal(
+                    PolarsParsers.to_optional_utf8(pl.col("AE_AECTCAET")).str.len_chars().fill_null(0) > 0,
+                    PolarsParsers.to_optional_utf8(pl.col("AE_AESTDAT")).str.len_chars().fill_null(0) > 0,
+                    PolarsParsers.to_optional_utf8(pl.col("AE_AETOXGRECD")).str.len_chars().fill_null(0),
+                ),
+                agg="sum",
+                parser=lambda e: e.cast(pl.Int64),
+            ),
+            ScalarSpec(
+                "number_of_serious_adverse_events",
+                source=(PolarsParsers.to_optional_int64("AE_AESERCD") == 1).fill_null(False),
+                agg="sum",
+                parser=lambda e: e.cast(pl.Int64),
+            ),
+            ScalarSpec("end_of_treatment_reason", source=PolarsParsers.to_optional_utf8(pl.col("EOT_EOTREOT")).str.strip_chars()),
+            # Docs mention progression date and EventDate as well, but all patients in EOT source have EOTDAT,
+            # EventDate is the date recorded and progression date is tracked in TumorAssessment.
+            # fixme: EOT + other sources of EOTs are in treatment_end_date method, so this should probably be removed
+            ScalarSpec(
+                "end_of_treatment_date",
+                source=PolarsParsers.to_optional_date(pl.col("EOT_EOTDAT")),
+                where=pl.col("EOT_EOTDAT").is_not_null(),
+            ),
+            ScalarSpec(
+                "treatment_start_date",
+                source=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")),
+                # keep only rows with real treatment names: non-null & len > 0
+                where=PolarsParsers.to_optional_utf8(pl.col("TR_TRNAME")).str.strip_chars().str.len_chars().fill_null(0).gt(0)
+                & PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")).is_not_null(),
+                agg="min",
+            ),
+            # treatment end candidates, oral stop and IV start only from valid TR rows
+            ScalarSpec("_last_eot", source=PolarsParsers.to_optional_date(pl.col("EOT_EOTDAT")), agg="max"),
+            ScalarSpec(
+                "_last_oral",
+                source=PolarsParsers.to_optional_date(pl.col("TR_TROSTPDT")),
+                where=PolarsParsers.to_optional_int64(pl.col("TR_TRCYNCD")).eq(1).fill_null(False),
+                agg="max",
+            ),
+            ScalarSpec(
+                "_last_iv",
+                source=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")),
+                where=PolarsParsers.to_optional_int64(pl.col("TR_TRCYNCD")).eq(1).fill_null(False),
+                agg="max",
+            ),
+            # not filtering for valid cycles, just selecting the latest treatment start
+            ScalarSpec("treatment_start_last_cycle", source=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")), agg="max"),
+        ],
+        derived=[
+            DerivedSpec(
+                "treatment_end_date",
+                # precedence: EOT > oral > IV
+                expr=pl.coalesce(pl.col("_last_eot"), pl.col("_last_oral"), pl.col("_last_iv")),
+                inputs=("_last_eot", "_last_oral", "_last_iv"),
+            ),
+            DerivedSpec(
+                "age",
+                expr=((pl.col("_last_treatment") - pl.col("date_of_birth")).dt.total_days().cast(pl.Int64) / 365.25).cast(pl.Int64),
+                inputs=("date_of_birth", "_last_treatment"),
+            ),
+        ],
+        collections=[
+            CollectionSpec(
+                "medical_histories",
+                model=MedicalHistory,
+                fields={
+                    "term": PolarsParsers.to_optional_utf8(pl.col("MH_MHTERM")).str.strip_chars(),
+                    "sequence_id": PolarsParsers.to_optional_int64(pl.col("MH_MHSPID")),
+                    "start_date": PolarsParsers.to_optional_date(pl.col("MH_MHSTDAT")),
+                    "end_date": PolarsParsers.to_optional_date(pl.col("MH_MHENDAT")),
+                    "status": PolarsParsers.to_optional_utf8(pl.col("MH_MHONGO")).str.strip_chars(),
+                    "status_code": PolarsParsers.to_optional_int64(pl.col("MH_MHONGOCD")),
+                },
+                where=pl.col("term").is_not_null(),
+                order_by=("sequence_id", "start_date"),
+            ),
+            CollectionSpec(
+                "previous_treatments",
+                model=PreviousTreatments,
+                fields={
+                    "treatment": PolarsParsers.to_optional_utf8(pl.col("CT_CTTYPE")).str.strip_chars(),
+                    "treatment_code": PolarsParsers.to_optional_int64(pl.col("CT_CTTYPECD")),
+                    "treatment_sequence_number": PolarsParsers.to_optional_int64(pl.col("CT_CTSPID")),
+                    "start_date": PolarsParsers.to_optional_date(pl.col("CT_CTSTDAT")),
+                    "end_date": PolarsParsers.to_optional_date(pl.col("CT_CTENDAT")),
+                    "additional_treatment": PolarsParsers.to_optional_utf8(pl.col("CT_CTTYPESP")).str.strip_chars(),
+                },
+                where=pl.col("treatment").is_not_null(),
+                order_by=("treatment_sequence_number", "start_date"),
+            ),
+        ],
+    )
+
+    def __init__(self, data: pl.DataFrame, trial_id: str, profiler: HarmonizerProfiler | None = None):
+        super().__init__(data, trial_id, profiler)
+        self._treatment_cycle_base: pl.DataFrame | None = None
 
     def process(self) -> HarmonizedData:
-        self._process_patient_id()
-        self._process_cohort_name()
-        self._process_gender()
-        self._process_age()
-        self._process_date_of_birth()
-        self._process_tumor_type()
-        self._process_study_drugs()
-        self._process_biomarkers()
-        self._process_date_of_death()
-        self._process_date_lost_to_followup()
-        self._process_evaluability()
-        self._process_ecog_baseline()
-        self._process_previous_treatments()
-        self._process_medical_histories()
-        self._process_treatment_start_date()
-        self._process_treatment_stop_date()
-        self._process_start_last_cycle()
-        self._process_treatment_cycle()
-        self._process_concomitant_medication()
-        self._process_has_any_adverse_events()
-        self._process_number_of_adverse_events()
-        self._process_number_of_serious_adverse_events()
-        self._process_adverse_events()
-        self._process_baseline_tumor_assessment()
-        self._process_tumor_assessments()
-        self._process_c30()
-        self._process_eq5d()
-        self._process_best_overall_response()
-        self._process_clinical_benefit()
-        self._process_eot_reason()
-        self._process_eot_date()
+        self._run_processors(
+            [
+                self._process_patient_id,
+                self._process_declared_fields,
+                self._process_tumor_type,
+                self._process_study_drugs,
+                self._process_biomarkers,
+                self._process_date_lost_to_followup,
+                self._process_evaluability,
+                self._process_ecog_baseline,
+                self._process_treatment_cycle,
+                self._process_concomitant_medication,
+                self._process_adverse_events,
+                self._process_baseline_tumor_assessment,
+                self._process_tumor_assessments,
+                self._process_c30,
+                self._process_eq5d,
+                self._process_best_overall_response,
+                self._process_clinical_benefit,
+            ]
+        )
 
         patients = list(self.patient_data.values())
         output = HarmonizedData(patients=patients, trial_id=self.trial_id)
 
         return output
 
+    def _process_declared_fields(self) -> None:
+        """Process all fields declared in SPEC in one pass"""
+        self._apply_spec()
+        self._warn_missing_treatment_end()
+
     def _process_patient_id(self) -> None:
         """Process patient ID and create patient object"""
         patient_ids = self.data.select("SubjectId").unique().to_series().to_list()
@@ -78,67 +232,18 @@ class ImpressHarmonizer(BaseHarmonizer):
 
     def _process_cohort_name(self) -> None:
         """Process cohort names and update patient objects"""
-        cohort_data = self.data.filter(PolarsParsers.to_optional_utf8(pl.col("COH_COHORTNAME")).is_not_null())
-
-        for row in cohort_data.iter_rows(named=True):
-            pid = row["SubjectId"]
-            cohort_name = row["COH_COHORTNAME"]
-            self.patient_data[pid].cohort_name = cohort_name
+        self._apply_spec("cohort_name")
 
     def _process_gender(self) -> None:
-        gender_data = (self.data.lazy().select(["SubjectId", "DM_SEX"])).filter(
-            PolarsParsers.to_optional_utf8(pl.col("DM_SEX")).is_not_null()
-        )
-        gender_data = gender_data.with_columns(
-            processed_sex=(
-                pl.when(PolarsParsers.to_optional_utf8(pl.col("DM_SEX")).str.to_lowercase().is_in(["m", "male"]))
-                .then(pl.lit("male"))
-                .when(PolarsParsers.to_optional_utf8(pl.col("DM_SEX")).str.to_lowercase().is_in(["f", "female"]))
-                .then(pl.lit("female"))
-                .otherwise(None)
-            ),
-        ).collect()
-
-        for row in gender_data.iter_rows(named=True):
-            pid = row["SubjectId"]
-            sex = row["processed_sex"]
-            self.patient_data[pid].sex = sex
+        self._apply_spec("sex")
 
     def _process_date_of_birth(self) -> None:
         """Process date of birth and update patient objects"""
-        birth_data = (
-            self.data.group_by("SubjectId")
-            .agg(pl.col("DM_BRTHDAT").drop_nulls().first().alias("birth_date"))
-            .with_columns(birth_date=(PolarsParsers.to_optional_date(pl.col("birth_date"))))
-        )
-
-        for row in birth_data.iter_rows(named=True):
-            pid = row["SubjectId"]
-            birth_date = row["birth_date"]
-            self.patient_data[pid].date_of_birth = birth_date
+        self._apply_spec("date_of_birth")
 
     def _process_age(self) -> None:
         """Process and calculate age at treatment start and update patient object"""
-        age_data = (
-            self.data.group_by("SubjectId")
-            .agg(
-                [
-                    pl.col("DM_BRTHDAT").drop_nulls().first().alias("birth_date"),
-                    pl.col("TR_TRC1_DT").drop_nulls().max().alias("last_treatment"),
-                ],
-            )
-            .with_columns(
-                birth_date=(PolarsParsers.to_optional_date(pl.col("birth_date"))),
-                last_treatment=(PolarsParsers.to_optional_date(pl.col("last_treatment"))),
-            )
-            .with_columns(
-                age=((pl.col("last_treatment") - pl.col("birth_date")).dt.total_days().cast(pl.Int64) / 365.25).cast(pl.Int64),
-            )
-        )
-
-        for row in age_data.iter_rows(named=True):
-            pid = row["SubjectId"]
-            self.patient_data[pid].age = row["age"]
+        self._apply_spec("age")
 
     # todo: start date (or just leave to builder)
     def _process_tumor_type(self) -> None:
@@ -340,80 +445,16 @@ class ImpressHarmonizer(BaseHarmonizer):
             self.patient_data[pid].biomarkers = bm
 
     def _process_date_of_death(self) -> None:
-        death_df = (
-            self.data.select(
-                "SubjectId",
-                eos=PolarsParsers.to_optional_date(pl.col("EOS_DEATHDTC")),
-                fu=PolarsParsers.to_optional_date(pl.col("FU_FUPDEDAT")),
-            )
-            .with_columns(
-                date_of_death=pl.max_horizontal("eos", "fu"),
-            )
-            .group_by("SubjectId")
-            .agg(pl.max("date_of_death").alias("date_of_death"))
-            .filter(pl.col("date_of_death").is_not_null())
-            .select("SubjectId", "date_of_death")
-        )
-
-        for pid, dod in death_df.iter_rows():
-            self.patient_data[pid].date_of_death = dod
+        self._apply_spec("date_of_death")
 
     def _process_has_any_adverse_events(self) -> None:
-        ae_status = (
-            self.data.with_columns(
-                ae_text_present=PolarsParsers.to_optional_utf8("AE_AECTCAET").str.len_chars().fill_null(0) > 0,
-                ae_date_present=PolarsParsers.to_optional_utf8("AE_AESTDAT").str.len_chars().fill_null(0) > 0,
-                ae_grade_present=PolarsParsers.to_optional_utf8("AE_AETOXGRECD").str.len_chars().fill_null(0) > 0,
-            )
-            .with_columns(
-                row_has_ae=pl.any_horizontal(
-                    [
-                        pl.col("ae_text_present"),
-                        pl.col("ae_date_present"),
-                        pl.col("ae_grade_present"),
-                    ],
-                ),
-            )
-            .group_by("SubjectId")
-            .agg(has_ae=pl.col("row_has_ae").any())
-        )
-
-        for row in ae_status.iter_rows(named=True):
-            pid = row["SubjectId"]
-            if pid in self.patient_data:
-                self.patient_data[pid].has_any_adverse_events = bool(row["has_ae"])
+        self._apply_spec("has_any_adverse_events")
 
     def _process_number_of_adverse_events(self) -> None:
-        ae_num = (
-            self.data.with_columns(
-                ae_num=pl.any_horizontal(
-                    [
-                        (PolarsParsers.to_optional_utf8(pl.col("AE_AECTCAET")).str.len_chars().fill_null(0) > 0),
-                        (PolarsParsers.to_optional_utf8(pl.col("AE_AESTDAT")).str.len_chars().fill_null(0) > 0),
-                        (PolarsParsers.to_optional_utf8(pl.col("AE_AETOXGRECD")).str.len_chars().fill_null(0)),
-                    ],
-                ),
-            )
-            .group_by("SubjectId")
-            .agg(ae_number=pl.col("ae_num").sum())
-        )
-
-        for row in ae_num.iter_rows(named=True):
-            pid = row["SubjectId"]
-            if pid in self.patient_data:
-                self.patient_data[pid].number_of_adverse_events = int(row["ae_number"])
+        self._apply_spec("number_of_adverse_events")
 
     def _process_number_of_serious_adverse_events(self) -> None:
-        sae_counts = (
-            self.data.with_columns(
-                is_serious=(PolarsParsers.to_optional_int64("AE_AESERCD") == 1).fill_null(False),
-            )
-            .group_by("SubjectId")
-            .agg(sae_number=pl.col("is_serious").sum().cast(pl.Int64))
-        )
-
-        for row in sae_counts.iter_rows(named=True):
-            self.patient_data[row["SubjectId"]].number_of_serious_adverse_events = row["sae_number"]
+        self._apply_spec("number_of_serious_adverse_events")
 
     def _process_date_lost_to_followup(self) -> None:
         lost_to_followup = (
@@ -460,70 +501,26 @@ class ImpressHarmonizer(BaseHarmonizer):
                 - tumor assessment after week 4 (patient has any tumor assessment with EventId==V04 in RA, RCNT, RTNTMNT, RNRSP)
                 - clinical assessment (patient has stopped treatment: EventDate from EOT sheet)
         """
-        evaluability_data = self.data.select(
-            "SubjectId",
-            "TR_TROSTPDT",
-            "TR_TRO_STDT",
-            "TR_TRTNO",
-            "TR_TRC1_DT",
-            "TR_TRCYNCD",
-            # not currently used:
-            # "RA_EventDate",
-            # "RA_EventId",
-            # "RNRSP_EventDate",
-            # "RNRSP_EventId",
-            # "RCNT_EventDate",
-            # "RCNT_EventId",
-            # "RNTMNT_EventDate",
-            # "RNTMNT_EventId",
-            # "EOT_EventDate",
-        )
+        evaluability_data = self.data
 
-        def oral_treatment_lengths() -> pl.DataFrame:
-            oral_sufficient_treatment_length = (
-                evaluability_data.select(["SubjectId", "TR_TRO_STDT", "TR_TROSTPDT", "TR_TRCYNCD"])
+        def treatment_lengths() -> pl.DataFrame:
+            """
+            Oral: any received cycle with stop - start >= 28 days.
+            IV: received cycles without oral dates, any gap to the next start within the same treatment >= 21 days.
+            """
+            sufficient_treatment_length = (
+                self._treatment_cycles_frame()
                 .with_columns(
-                    start=PolarsParsers.to_optional_utf8(pl.col("TR_TRO_STDT")).str.strptime(pl.Date, strict=False),
-                    stop=PolarsParsers.to_optional_utf8(pl.col("TR_TROSTPDT")).str.strptime(pl.Date, strict=False),
-                    not_recieved_treatment_this_cycle=pl.col("TR_TRCYNCD") != 1,
+                    oral_days=(pl.col("oral_stop") - pl.col("oral_start")).dt.total_days(),
+                    gap_days=(pl.col("iv_next_start") - pl.col("iv_start")).dt.total_days(),
                 )
-                .filter(~pl.col("not_recieved_treatment_this_cycle"))
-                .with_columns(treatment_duration=((pl.col("stop") - pl.col("start")).dt.total_days()))
                 .group_by("SubjectId")
-                .agg((pl.col("treatment_duration").fill_null(-1) >= 28).any().alias("oral_sufficient_treatment_length"))
-            )
-            return oral_sufficient_treatment_length
-
-        def iv_treatment_lengths() -> pl.DataFrame:
-            iv_sufficient_treatment_length = (
-                evaluability_data.select(
-                    "SubjectId",
-                    "TR_TRTNO",
-                    "TR_TRC1_DT",
-                    "TR_TRO_STDT",
-                    "TR_TROSTPDT",
-                    "TR_TRCYNCD",
+                .agg(
+                    (pl.col("received") & (pl.col("oral_days").fill_null(-1) >= 28)).any().alias("oral_sufficient_treatment_length"),
+                    (pl.col("iv_row") & pl.col("gap_days").ge(21).fill_null(False)).any().alias("iv_sufficient_treatment_length"),
                 )
-                # remove oral treatment rows
-                .with_columns(
-                    oral_present=pl.any_horizontal(
-                        PolarsParsers.to_optional_utf8(pl.col(["TR_TRO_STDT", "TR_TROSTPDT"])).str.len_bytes().fill_null(0) > 0,
-                    ),
-                    start=PolarsParsers.to_optional_utf8(pl.col("TR_TRC1_DT")).str.strptime(pl.Date, strict=False),
-                    not_recieved_treatment_this_cycle=pl.col("TR_TRCYNCD") != 1,
-                )
-                .filter(~pl.col("oral_present") & ~pl.col("not_recieved_treatment_this_cycle"))
-                .drop_nulls("start")
-                .sort(["SubjectId", "TR_TRTNO", "start"])
-                # partitioned shift to make next start
-                .with_columns(pl.col("start").shift(-1).over(["SubjectId", "TR_TRTNO"]).alias("next_start"))
-                # compute gap days
-                .with_columns((pl.col("next_start") - pl.col("start")).dt.total_days().alias("gap_days"))
-                .group_by("SubjectId")
-                .agg(pl.col("gap_days").ge(21).fill_null(False).any().alias("iv_sufficient_treatment_length"))
             )
-
-            return iv_sufficient_treatment_length
+            return sufficient_treatment_length
 
         @deprecated
         def eot_filter() -> pl.DataFrame:
@@ -559,8 +556,7 @@ class ImpressHarmonizer(BaseHarmonizer):
         def _merge_evaluability() -> pl.DataFrame:
             base = evaluability_data.select("SubjectId").unique()
             _merged_df: pl.DataFrame = (
-                base.join(oral_treatment_lengths(), on="SubjectId", how="left")
-                .join(iv_treatment_lengths(), on="SubjectId", how="left")
+                base.join(treatment_lengths(), on="SubjectId", how="left")
                 .with_columns(
                     pl.col("oral_sufficient_treatment_length").fill_null(False),
                     pl.col("iv_sufficient_treatment_length").fill_null(False),
@@ -626,242 +622,84 @@ class ImpressHarmonizer(BaseHarmonizer):
         )
 
     def _process_medical_histories(self) -> None:
-        mh_base = self.data.select(
-            "SubjectId",
-            "MH_MHSPID",
-            "MH_MHTERM",
-            "MH_MHSTDAT",
-            "MH_MHENDAT",
-            "MH_MHONGO",
-            "MH_MHONGOCD",
-        )
-
-        def filter_medical_histories(data: pl.DataFrame) -> pl.DataFrame:
-            filtered_data = data.with_columns(
-                term=PolarsParsers.to_optional_utf8(pl.col("MH_MHTERM")).str.strip_chars(),
-                sequence_id=PolarsParsers.to_optional_int64(pl.col("MH_MHSPID")),
-                start_date=PolarsParsers.to_optional_date(pl.col("MH_MHSTDAT")),
-                end_date=PolarsParsers.to_optional_date(pl.col("MH_MHENDAT")),
-                status=PolarsParsers.to_optional_utf8(pl.col("MH_MHONGO")).str.strip_chars(),
-                status_code=PolarsParsers.to_optional_int64(pl.col("MH_MHONGOCD")),
-            ).filter(pl.col("term").is_not_null())
-
-            return filtered_data
-
-        def merge_medical_history(base: pl.DataFrame, processed: pl.DataFrame) -> pl.DataFrame:
-            subjects = base.select("SubjectId").unique()
-            _merged = subjects.join(processed, on="SubjectId", how="left").filter(
-                pl.any_horizontal(
-                    pl.col(
-                        [
-                            "term",
-                            "sequence_id",
-                            "start_date",
-                            "end_date",
-                            "status",
-                            "status_code",
-                        ],
-                    ).is_not_null(),
-                ),
-            )
-            return _merged
-
-        filtered = filter_medical_histories(mh_base)
-        merged = merge_medical_history(base=mh_base, processed=filtered)
-
-        # pack to structs grouped by SubjectId
-        packed = self.pack_structs(
-            merged,
-            subject_col="SubjectId",
-            value_cols=merged.select(pl.all().exclude("SubjectId")).columns,
-            order_by_cols=["sequence_id", "start_date"],
-        )
-
-        # build mh objects
-        def build_mh(pid: str, s: Mapping[str, Any]) -> MedicalHistory:
-            obj = MedicalHistory(pid)
-            obj.term = s["term"]
-            obj.sequence_id = s["sequence_id"]
-            obj.start_date = s["start_date"]
-            obj.end_date = s["end_date"]
-            obj.status = s["status"]
-            obj.status_code = s["status_code"]
-            return obj
-
-        # hydrate to Patient class
-        self.hydrate_list_field(
-            packed,
-            builder=build_mh,
-            patients=self.patient_data,
-            target_attr="medical_histories",
-            skip_missing=False,
-        )
+        self._apply_spec("medical_histories")
 
     def _process_previous_treatments(self) -> None:
-        ct_base = self.data.select(
-            "SubjectId",
-            "CT_CTTYPE",
-            "CT_CTTYPECD",
-            "CT_CTSPID",
-            "CT_CTSTDAT",
-            "CT_CTENDAT",
-            "CT_CTTYPESP",
-        )
-
-        def filter_previous_treatments(data: pl.DataFrame) -> pl.DataFrame:
-            filtered_data = data.with_columns(
-                treatment=PolarsParsers.to_optional_utf8(pl.col("CT_CTTYPE")).str.strip_chars(),
-                treatment_code=PolarsParsers.to_optional_int64(pl.col("CT_CTTYPECD")),
-                sequence_id=PolarsParsers.to_optional_int64(pl.col("CT_CTSPID")),
-                start_date=PolarsParsers.to_optional_date(pl.col("CT_CTSTDAT")),
-                end_date=PolarsParsers.to_optional_date(pl.col("CT_CTENDAT")),
-                additional_treatment=PolarsParsers.to_optional_utf8(pl.col("CT_CTTYPESP")).str.strip_chars(),
-            ).filter(pl.col("treatment").is_not_null())
-            return filtered_data
-
-        def merge_previous_treatments(base: pl.DataFrame, processed: pl.DataFrame) -> pl.DataFrame:
-            subjects = base.select("SubjectId").unique()
-            _merged = subjects.join(processed, on="SubjectId", how="left").filter(
-                pl.any_horizontal(
-                    pl.col(
-                        [
-                            "treatment",
-                            "treatment_code",
-                            "sequence_id",
-                            "start_date",
-                            "end_date",
-                            "additional_treatment",
-                        ],
-                    ).is_not_null(),
-                ),
-            )
-            return _merged
-
-        filtered = filter_previous_treatments(ct_base)
-        merged = merge_previous_treatments(base=ct_base, processed=filtered)
-
-        # pack
-        packed = self.pack_structs(
-            merged,
-            subject_col="SubjectId",
-            value_cols=merged.select(pl.all().exclude("SubjectId")).columns,
-            order_by_cols=["sequence_id", "start_date"],
-        )
-
-        def build_ct(pid: str, s: Mapping[str, Any]) -> PreviousTreatments:
-            obj = PreviousTreatments(pid)
-            obj.treatment = s["treatment"]
-            obj.treatment_code = s["treatment_code"]
-            obj.treatment_sequence_number = s["sequence_id"]
-            obj.start_date = s["start_date"]
-            obj.end_date = s["end_date"]
-            obj.additional_treatment = s["additional_treatment"]
-            return obj
-
-        self.hydrate_list_field(
-            packed,
-            builder=build_ct,
-            patients=self.patient_data,
-            target_attr="previous_treatments",
-            skip_missing=False,
-        )
+        self._apply_spec("previous_treatments")
 
     def _process_treatment_start_date(self) -> None:
-        treatment_start_data = (
-            self.data.lazy()
-            .select(["SubjectId", "TR_TRNAME", "TR_TRC1_DT"])
-            .with_columns(
-                tr_name=PolarsParsers.to_optional_utf8(pl.col("TR_TRNAME")).str.strip_chars(),
-                treatment_start_date=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")),
-            )
-            # keep only real names: non-null & len > 0
-            .filter(pl.col("tr_name").is_not_null() & (pl.col("tr_name").str.len_chars() > 0))
-            .group_by("SubjectId")
-            .agg(pl.col("treatment_start_date").drop_nulls().min().alias("treatment_start_date"))
-            .collect()
-            .select(["SubjectId", "treatment_start_date"])
-        )
-
-        for row in treatment_start_data.iter_rows(named=True):
-            patient_id = row["SubjectId"]
-            self.patient_data[patient_id].treatment_start_date = row["treatment_start_date"]
+        self._apply_spec("treatment_start_date")
 
     def _process_treatment_stop_date(self) -> None:
-        treatment_stop_data = (
-            self.data.select(
-                "SubjectId",
-                "TR_TRCYNCD",
-                "TR_TROSTPDT",
-                "TR_TRC1_DT",
-                "EOT_EOTDAT",
-            )
-            .with_columns(
-                valid=PolarsParsers.to_optional_int64(pl.col("TR_TRCYNCD")).eq(1),
-                eot_date=PolarsParsers.to_optional_date(pl.col("EOT_EOTDAT").cast(pl.Utf8)),
-                oral_stop=PolarsParsers.to_optional_date(pl.col("TR_TROSTPDT").cast(pl.Utf8)),
-                iv_start=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT").cast(pl.Utf8)),
-            )
-            # only valid TR rows for oral/IV
-            .with_columns(
-                oral_stop_valid=pl.when(pl.col("valid")).then(pl.col("oral_stop")).otherwise(None),
-                iv_start_valid=pl.when(pl.col("valid")).then(pl.col("iv_start")).otherwise(None),
-            )
-            .group_by("SubjectId")
-            .agg(
-                last_eot=pl.col("eot_date").max(),
-                last_oral=pl.col("oral_stop_valid").max(),
-                last_iv=pl.col("iv_start_valid").max(),
-            )
-            .with_columns(
-                # precedence: EOT > oral > IV
-                treatment_end=pl.coalesce([pl.col("last_eot"), pl.col("last_oral"), pl.col("last_iv")]),
-                treatment_end_source=(
-                    pl.when(pl.col("last_eot").is_not_null())
-                    .then(pl.lit("EOT"))
-                    .when(pl.col("last_oral").is_not_null())
-                    .then(pl.lit("ORAL_STOP"))
-                    .when(pl.col("last_iv").is_not_null())
-                    .then(pl.lit("IV_START"))
-                    .otherwise(pl.lit(None))
-                ),
-            )
-        )
-
-        # log no ends
-        subjects = self.data.select("SubjectId").unique()
-        df_all = subjects.join(treatment_stop_data, on="SubjectId", how="left")
-        no_end = df_all.filter(pl.col("treatment_end").is_null()).get_column("SubjectId").to_list()
-        for pid in no_end:
-            log.warning(f"No treatment end found for SubjectId={pid}")
+        self._apply_spec("treatment_end_date")
+        self._warn_missing_treatment_end()
 
-        # hydrate
-        for pid, end_date in treatment_stop_data.select("SubjectId", "treatment_end").iter_rows():
-            self.patient_data[pid].treatment_end_date = end_date
+    def _warn_missing_treatment_end(self) -> None:
+        for pid, patient in self.patient_data.items():
+            if patient.treatment_end_date is None:
+                log.warning(f"No treatment end found for SubjectId={pid}")
 
     def _process_start_last_cycle(self) -> None:
         """
         Note: currently not filtering for valid cycles, just selecting latest treatment starts.
-        Set enforce_valid=True if TR_TRCYNCD must be 1 (i.e. filtering for valid cycles only)
+        Add a `where` on TR_TRCYNCD == 1 to its ScalarSpec to filter for valid cycles only.
+        """
+        self._apply_spec("treatment_start_last_cycle")
+
+    def _treatment_cycles_frame(self) -> pl.DataFrame:
         """
-        enforce_valid = False
+        TR rows shared by evaluability and treatment cycle hydration, built once per harmonizer:
+        typed cycle dates, treatment type and received flag, sorted by SubjectId, TR_TRTNO, start, with
+          - next_start: next cycle start within the treatment, for IV rows
+          - iv_next_start: next start among received IV rows (no oral dates) within the treatment, used for evaluability
+        """
+        if self._treatment_cycle_base is not None:
+            return self._treatment_cycle_base
+
+        tr = self.data.select("SubjectId", pl.col("^TR_.*$"))
+
+        def row_has_any(cols: list[str]) -> pl.Expr:
+            """If any bytes in any of the present cols"""
+            cols = [c for c in cols if c in tr.columns]
+            if not cols:
+                return pl.lit(False)
+            return pl.any_horizontal(pl.col(cols).cast(pl.Utf8).str.strip_chars().str.len_bytes().fill_null(0) > 0)
+
+        def strict_date(col: str) -> pl.Expr:
+            return PolarsParsers.to_optional_utf8(pl.col(col)).str.strptime(pl.Date, strict=False)
 
-        last_cycle_data = (
-            self.data.select("SubjectId", "TR_TRC1_DT", "TR_TRCYNCD")
+        oral_dates_present = pl.any_horizontal(
+            PolarsParsers.to_optional_utf8(pl.col(["TR_TRO_STDT", "TR_TROSTPDT"])).str.len_bytes().fill_null(0) > 0,
+        )
+        per_treatment = ["SubjectId", "TR_TRTNO"]
+
+        self._treatment_cycle_base = (
+            tr.lazy()
             .with_columns(
-                cycle_start=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")),
-                valid=PolarsParsers.to_optional_int64(pl.col("TR_TRCYNCD")).eq(1),
+                # oral if any oral-only col has bytes, IV if any IV-only col has, else None
+                treatment_type=pl.when(row_has_any(["TR_TRO_YN", "TR_TRODSTOT", "TR_TRO_STDT", "TR_TROSTPDT"]))
+                .then(pl.lit("oral"))
+                .when(row_has_any(["TR_TRIVDS1", "TR_TRIVU1", "TR_TRIVDELYN1"]))
+                .then(pl.lit("IV"))
+                .otherwise(pl.lit(None, dtype=pl.Utf8)),
+                start=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")),
+                oral_cycle_end=PolarsParsers.to_optional_date(pl.col("TR_TROSTPDT")),
+                iv_start=strict_date("TR_TRC1_DT"),
+                oral_start=strict_date("TR_TRO_STDT"),
+                oral_stop=strict_date("TR_TROSTPDT"),
+                received=(PolarsParsers.to_optional_int64(pl.col("TR_TRCYNCD")) == 1).fill_null(False),
             )
-            # null-out only if enforce_valid and row invalid
+            .with_columns(iv_row=pl.col("received") & ~oral_dates_present & pl.col("iv_start").is_not_null())
+            .sort(["SubjectId", "TR_TRTNO", "start"], maintain_order=True)
             .with_columns(
-                cycle_start=pl.when(pl.lit(enforce_valid) & ~pl.col("valid")).then(None).otherwise(pl.col("cycle_start")),
+                next_start=pl.when(pl.col("treatment_type") == "IV").then(pl.col("start").shift(-1).over(per_treatment)).otherwise(None),
+                iv_next_start=pl.when(pl.col("iv_row"))
+                .then(pl.when(pl.col("iv_row")).then(pl.col("iv_start")).shift(-1).backward_fill().over(per_treatment))
+                .otherwise(None),
             )
-            .group_by("SubjectId")
-            .agg(treatment_start_last_cycle=pl.col("cycle_start").max())
-            .select("SubjectId", "treatment_start_last_cycle")
+            .collect()
         )
-
-        for pid, end_date in last_cycle_data.select("SubjectId", "treatment_start_last_cycle").iter_rows():
-            self.patient_data[pid].treatment_start_last_cycle = end_date
+        return self._treatment_cycle_base
 
     def _process_treatment_cycle(self) -> None:
         treatment_cycle_cols = [
@@ -891,57 +729,15 @@ class ImpressHarmonizer(BaseHarmonizer):
             "TR_TROSPE",
         ]
 
-        cycle_base = self.data.select(treatment_cycle_cols)
-
-        def add_treatment_type(frame: pl.DataFrame) -> pl.DataFrame:
-            """
-            If any bytes in any oral-only cols, set to `oral`, if any in iv-only cols, set to `IV` else `None`.
-            """
-
-            oral_only_cols = ["TR_TRO_YN", "TR_TRODSTOT", "TR_TRO_STDT", "TR_TROSTPDT"]
-            iv_only_cols = ["TR_TRIVDS1", "TR_TRIVU1", "TR_TRIVDELYN1"]
-
-            oral_cols = [c for c in oral_only_cols if c in frame.columns]
-            iv_cols = [c for c in iv_only_cols if c in frame.columns]
-
-            def row_has_any(cols: list[str]) -> pl.Expr:
-                if not cols:
-                    return pl.lit(False)
-
-                return pl.any_horizontal(pl.col(cols).cast(pl.Utf8).str.strip_chars().str.len_bytes().fill_null(0) > 0)
-
-            has_oral = row_has_any(oral_cols)
-            has_iv = row_has_any(iv_cols)
-
-            return frame.with_columns(
-                pl.when(has_oral)
-                .then(pl.lit("oral"))
-                .when(has_iv)
-                .then(pl.lit("IV"))
-                .otherwise(pl.lit(None, dtype=pl.Utf8))
-                .alias("treatment_type"),
-            )
+        cycle_base = self._treatment_cycles_frame()
 
         def add_iv_cycle_stop_dates(frame: pl.DataFrame) -> pl.DataFrame:
             """
             For IV cycles, selects next cycle start date - 1 day as current cycle end, set to `None` for last cycle.
             """
-            iv_cycle_ends = (
-                frame.with_columns(start=PolarsParsers.to_optional_date(pl.col("TR_TRC1_DT")))
-                .sort(["SubjectId", "TR_TRTNO", "start"])
-                .with_columns(
-                    # apply shift to IV rows, others get None
-                    next_start=pl.when(pl.col("treatment_type") == "IV")
-                    .then(pl.col("start").shift(-1).over(["SubjectId", "TR_TRTNO"]))
-                    .otherwise(None),
-                )
-                .with_columns(
-                    # calculate end date where next_start exists
-                    iv_cycle_end=pl.when(pl.col("next_start").is_not_null())
-                    .then(pl.col("next_start") - pl.duration(days=1))
-                    .otherwise(None),
-                )
-                .drop(["start", "next_start"])
+            iv_cycle_ends = frame.with_columns(
+                # calculate end date where next_start exists
+                iv_cycle_end=pl.when(pl.col("next_start").is_not_null()).then(pl.col("next_start") - pl.duration(days=1)).otherwise(None),
             )
             return iv_cycle_ends
 
@@ -950,8 +746,6 @@ class ImpressHarmonizer(BaseHarmonizer):
             Coalesces IV and oral cycle end dates.
             """
             coalesced = frame.with_columns(
-                oral_cycle_end=PolarsParsers.to_optional_date("TR_TROSTPDT").alias("oral_cycle_end")
-            ).with_columns(
                 # conflict = both present
                 end_date_conflict=(pl.col("oral_cycle_end").is_not_null() & pl.col("iv_cycle_end").is_not_null()),
                 # mutually exclusive coalesced result; None if both or neither
@@ -993,9 +787,8 @@ class ImpressHarmonizer(BaseHarmonizer):
 
             return _coerced
 
-        coerced = coerce_types(cycle_base)
-        treatment_typed = add_treatment_type(coerced)
-        iv_cycle_end_dates = add_iv_cycle_stop_dates(treatment_typed)
+        coerced = coerce_types(cycle_base.select(*treatment_cycle_cols, "treatment_type", "next_start", "oral_cycle_end"))
+        iv_cycle_end_dates = add_iv_cycle_stop_dates(coerced).drop("next_start")
         combined_end_dates = coalesce_cycle_ends(iv_cycle_end_dates)
         filtered = filter_parse_treatment_cycles(combined_end_dates)
 
@@ -1007,38 +800,32 @@ class ImpressHarmonizer(BaseHarmonizer):
             order_by_cols=["TR_TRTNO", "TR_TRCNO1", "TR_TRC1_DT"],
         )
 
-        # build TreatmentCycle objects
-        def build_tc(pid: str, s: Mapping[str, Any]) -> TreatmentCycle:
-            obj = TreatmentCycle(pid)
-            # core
-            obj.cycle_type = s["treatment_type"]
-            obj.treatment_name = s["TR_TRNAME"]
-            obj.treatment_number = s["TR_TRTNO"]
-            obj.cycle_number = s["TR_TRCNO1"]
-            obj.start_date = s["cycle_start_date"]
-            obj.recieved_treatment_this_cycle = s["recieved_treatment_this_cycle"]
-            obj.was_total_dose_delivered = s["was_total_dose_delivered"]
-            obj.end_date = s["cycle_end"]
-
-            # iv
-            obj.iv_dose_prescribed = s["TR_TRIVDS1"]
-            obj.iv_dose_prescribed_unit = s["TR_TRIVU1"]
-
-            # oral
-            obj.was_dose_administered_to_spec = s["was_dose_administered_to_spec"]
-            obj.oral_dose_prescribed_per_day = s["TR_TRODSTOT"]
-            obj.oral_dose_unit = s["TR_TRODSU"]
-            obj.was_tablet_taken_to_prescription_in_previous_cycle = s["was_tablet_taken_to_prescription_in_previous_cycle"]
-            obj.reason_not_administered_to_spec = s["TR_TROREA"]
-            obj.reason_tablet_not_taken = s["TR_TROSPE"]
-            obj.number_of_days_tablet_not_taken = s["TR_TROTABNO"]
-
-            return obj
-
-        # hydrate to Patient class
+        # hydrate TreatmentCycle objects to Patient class
         self.hydrate_list_field(
             packed,
-            builder=build_tc,
+            model=TreatmentCycle,
+            fields={
+                # core
+                "treatment_type": "cycle_type",
+                "TR_TRNAME": "treatment_name",
+                "TR_TRTNO": "treatment_number",
+                "TR_TRCNO1": "cycle_number",
+                "cycle_start_date": "start_date",
+                "recieved_treatment_this_cycle": "recieved_treatment_this_cycle",
+                "was_total_dose_delivered": "was_total_dose_delivered",
+                "cycle_end": "end_date",
+                # iv
+                "TR_TRIVDS1": "iv_dose_prescribed",
+                "TR_TRIVU1": "iv_dose_prescribed_unit",
+                # oral
+                "was_dose_administered_to_spec": "was_dose_administered_to_spec",
+                "TR_TRODSTOT": "oral_dose_prescribed_per_day",
+                "TR_TRODSU": "oral_dose_unit",
+                "was_tablet_taken_to_prescription_in_previous_cycle": "was_tablet_taken_to_prescription_in_previous_cycle",
+                "TR_TROREA": "reason_not_administered_to_spec",
+                "TR_TROSPE": "reason_tablet_not_taken",
+                "TR_TROTABNO": "number_of_days_tablet_not_taken",
+            },
             patients=self.patient_data,
             target_attr="treatment_cycles",
             skip_missing=False,
@@ -1079,21 +866,19 @@ class ImpressHarmonizer(BaseHarmonizer):
             order_by_cols=["sequence_id", "start_date"],
         )
 
-        def build_cm(pid: str, s: Mapping[str, Any]) -> ConcomitantMedication:
-            obj = ConcomitantMedication(pid)
-            obj.medication_name = s["medication_name"]
-            obj.medication_ongoing = s["medication_ongoing"]
-            obj.was_taken_due_to_medical_history_event = s["was_taken_due_to_medical_history_event"]
-            obj.was_taken_due_to_adverse_event = s["was_taken_due_to_adverse_event"]
-            obj.is_adverse_event_ongoing = s["is_adverse_event_ongoing"]
-            obj.start_date = s["start_date"]
-            obj.end_date = s["end_date"]
-            obj.sequence_id = s["sequence_id"]
-            return obj
-
         self.hydrate_list_field(
             packed,
-            builder=build_cm,
+            model=ConcomitantMedication,
+            fields={
+                "medication_name": "medication_name",
+                "medication_ongoing": "medication_ongoing",
+                "was_taken_due_to_medical_history_event": "was_taken_due_to_medical_history_event",
+                "was_taken_due_to_adverse_event": "was_taken_due_to_adverse_event",
+                "is_adverse_event_ongoing": "is_adverse_event_ongoing",
+                "start_date": "start_date",
+                "end_date": "end_date",
+                "sequence_id": "sequence_id",
+            },
             patients=self.patient_data,
             target_attr="concomitant_medications",
             skip_missing=False,
@@ -1186,6 +971,7 @@ class ImpressHarmonizer(BaseHarmonizer):
             return frame.with_columns(
                 pl.col("AE_AECTCAET").cast(pl.Utf8),
                 pl.col("AE_AETOXGRECD").cast(pl.Int64),
+                pl.col("AE_AEOUT").cast(pl.Utf8),
                 pl.col("AE_AETRT1").cast(pl.Utf8),
                 pl.col("AE_AETRT2").cast(pl.Utf8),
             )
@@ -1195,27 +981,25 @@ class ImpressHarmonizer(BaseHarmonizer):
         coerced = coerce(annot)
         packed = self.pack_structs(df=coerced, value_cols=annot.select(pl.all().exclude("SubjectId")).columns)
 
-        def build_ae(pid: str, s: Mapping[str, Any]) -> AdverseEvent:
-            obj = AdverseEvent(pid)
-            obj.term = s["AE_AECTCAET"]
-            obj.grade = s["AE_AETOXGRECD"]
-            obj.outcome = s["AE_AEOUT"]
-            obj.was_serious = s["was_serious"]
-            obj.turned_serious_date = s["serious_date"]
-            obj.related_to_treatment_1_status = s["related_status_1"]
-            obj.related_to_treatment_2_status = s["related_status_2"]
-            obj.was_serious_grade_expected_treatment_1 = s["ser_expected_treatment_1"]
-            obj.was_serious_grade_expected_treatment_2 = s["ser_expected_treatment_2"]
-            obj.treatment_1_name = s["AE_AETRT1"]
-            obj.treatment_2_name = s["AE_AETRT2"]
-            obj.start_date = s["start_date"]
-            obj.end_date = s["end_date"]
-            return obj
-
         self.hydrate_list_field(
             patients=self.patient_data,
             packed=packed,
-            builder=build_ae,
+            model=AdverseEvent,
+            fields={
+                "AE_AECTCAET": "term",
+                "AE_AETOXGRECD": "grade",
+                "AE_AEOUT": "outcome",
+                "was_serious": "was_serious",
+                "serious_date": "turned_serious_date",
+                "related_status_1": "related_to_treatment_1_status",
+                "related_status_2": "related_to_treatment_2_status",
+                "ser_expected_treatment_1": "was_serious_grade_expected_treatment_1",
+                "ser_expected_treatment_2": "was_serious_grade_expected_treatment_2",
+                "AE_AETRT1": "treatment_1_name",
+                "AE_AETRT2": "treatment_2_name",
+                "start_date": "start_date",
+                "end_date": "end_date",
+            },
             skip_missing=False,
             target_attr="adverse_events",
         )
@@ -1485,58 +1269,51 @@ class ImpressHarmonizer(BaseHarmonizer):
             value_cols=processed.select(pl.all().exclude("SubjectId")).columns,
         )
 
-        def build_ta(pid: str, s: Mapping[str, Any]) -> TumorAssessment | None:
-            obj = TumorAssessment(pid)
-            obj.assessment_type = s["assessment_type"]
-            obj.target_lesion_change_from_baseline = s["target_lesion_change_from_baseline"]
-            obj.target_lesion_change_from_nadir = s["target_lesion_change_from_nadir"]
-            obj.was_new_lesions_registered_after_baseline = s["new_lesions_after_baseline"]
-            obj.date = s["date"]
-            obj.recist_response = s["recist_response"]
-            obj.irecist_response = s["irecist_response"]
-            obj.rano_response = s["rano_response"]
-            obj.recist_date_of_progression = s["recist_progression_date"]
-            obj.irecist_date_of_progression = s["irecist_progression_date"]
-            obj.event_id = s["event_id"]
-            return obj
-
         self.hydrate_list_field(
             patients=self.patient_data,
             packed=packed,
-            builder=build_ta,
+            model=TumorAssessment,
+            fields={
+                "assessment_type": "assessment_type",
+                "target_lesion_change_from_baseline": "target_lesion_change_from_baseline",
+                "target_lesion_change_from_nadir": "target_lesion_change_from_nadir",
+                "new_lesions_after_baseline": "was_new_lesions_registered_after_baseline",
+                "date": "date",
+                "recist_response": "recist_response",
+                "irecist_response": "irecist_response",
+                "rano_response": "rano_response",
+                "recist_progression_date": "recist_date_of_progression",
+                "irecist_progression_date": "irecist_date_of_progression",
+                "event_id": "event_id",
+            },
             skip_missing=False,
             target_attr="tumor_assessments",
         )
 
-    # TODO: refactor to not use regex later
+    C30_TEXT_PATTERN = r"^(?:C30_)?C30_?Q([1-9]|[12]\d|30)$"
+    C30_CODE_PATTERN = r"^(?:C30_)?C30_?Q([1-9]|[12]\d|30)CD$"
+    EQ5D_TEXT_PATTERN = r"^EQ5D_EQ5D([1-5])$"
+    EQ5D_CODE_PATTERN = r"^(?:EQ5D_)?EQ5D([1-5])CD$"
+
     def _process_c30(self):
-        question_text_re = re.compile(r"^(?:C30_)?C30_?Q([1-9]|[12]\d|30)$")
-        question_code_re = re.compile(r"^(?:C30_)?C30_?Q([1-9]|[12]\d|30)CD$")
+        questions = resolve_questionnaire_schema(self.data.columns, self.C30_TEXT_PATTERN, self.C30_CODE_PATTERN)
 
-        base = self.data.select(
-            pl.col(["SubjectId", "C30_EventName", "C30_EventDate"]),
-            pl.selectors.matches(question_text_re.pattern),
-            pl.selectors.matches(question_code_re.pattern),
-        )
+        base = self.data.select("SubjectId", "C30_EventName", "C30_EventDate", *questions.text_cols, *questions.code_cols)
 
         def process_c30(frame: pl.DataFrame) -> pl.DataFrame:
-            text_cols = [c for c in frame.columns if question_text_re.fullmatch(c)]
-            code_cols = [c for c in frame.columns if question_code_re.fullmatch(c)]
-
+            # question columns are renamed to their C30 attribute (q{i}, q{i}_code)
             out = (
                 frame.filter(pl.any_horizontal(pl.all().exclude("SubjectId").is_not_null()))
                 .with_columns(
                     event_name=PolarsParsers.to_optional_utf8(pl.col("C30_EventName")).str.strip_chars(),
                     date=PolarsParsers.to_optional_date(pl.col("C30_EventDate")),
-                    *[PolarsParsers.to_optional_utf8(pl.col(c)).str.strip_chars().alias(c) for c in text_cols],
-                    *[PolarsParsers.to_optional_int64(pl.col(c)).alias(c) for c in code_cols],
                 )
                 .select(
                     "SubjectId",
                     "date",
                     "event_name",
-                    *text_cols,
-                    *code_cols,
+                    *[PolarsParsers.to_optional_utf8(pl.col(c)).str.strip_chars().alias(a) for c, a in questions.text_renames().items()],
+                    *[PolarsParsers.to_optional_int64(pl.col(c)).alias(a) for c, a in questions.code_renames().items()],
                 )
             )
 
@@ -1553,59 +1330,36 @@ class ImpressHarmonizer(BaseHarmonizer):
             items_col="items",
         )
 
-        def build_c30(pid: str, s: Mapping[str, Any]) -> C30 | None:
-            obj = C30(patient_id=pid)
-            obj.date = s["date"]
-            obj.event_name = s["event_name"]
-            for k, v in s.items():
-                m = question_text_re.search(k)
-                if m:
-                    qn = int(m.group(1))
-                    setattr(obj, f"q{qn}", v)
-                c = question_code_re.fullmatch(k)
-                if c:
-                    setattr(obj, f"q{int(c.group(1))}_code", v)
-            return obj
-
         self.hydrate_list_field(
             patients=self.patient_data,
             packed=packed,
-            builder=build_c30,
+            model=C30,
+            fields={col: col for col in value_cols},
             skip_missing=False,
             target_attr="c30_list",
         )
 
-    # TODO: refactor to not use regex later
     def _process_eq5d(self):
-        question_col_re = re.compile(r"^EQ5D_EQ5D([1-5])$")
-        question_code_re = re.compile(r"^(?:EQ5D_)?EQ5D([1-5])CD$")
+        questions = resolve_questionnaire_schema(self.data.columns, self.EQ5D_TEXT_PATTERN, self.EQ5D_CODE_PATTERN)
 
-        base = self.data.select(
-            pl.col(["SubjectId", "EQ5D_EventName", "EQ5D_EQ5DVAS", "EQ5D_EventDate"]),
-            pl.selectors.matches(question_col_re.pattern),
-            pl.selectors.matches(question_code_re.pattern),
-        )
+        base = self.data.select("SubjectId", "EQ5D_EventName", "EQ5D_EQ5DVAS", "EQ5D_EventDate", *questions.text_cols, *questions.code_cols)
 
         def process_eq5d(frame: pl.DataFrame) -> pl.DataFrame:
-            text_cols = [c for c in frame.columns if question_col_re.fullmatch(c)]
-            code_cols = [c for c in frame.columns if question_code_re.fullmatch(c)]
-
+            # question columns are renamed to their EQ5D attribute (q{i}, q{i}_code)
             out = (
                 frame.filter(pl.any_horizontal(pl.all().exclude("SubjectId").is_not_null()))
                 .with_columns(
                     event_name=PolarsParsers.to_optional_utf8(pl.col("EQ5D_EventName")).str.strip_chars(),
                     date=PolarsParsers.to_optional_date(pl.col("EQ5D_EventDate")),
                     qol_metric=PolarsParsers.to_optional_int64(pl.col("EQ5D_EQ5DVAS")),
-                    *[PolarsParsers.to_optional_utf8(pl.col(c)).str.strip_chars().alias(c) for c in text_cols],
-                    *[PolarsParsers.to_optional_int64(pl.col(c)).alias(c) for c in code_cols],
                 )
                 .select(
                     "SubjectId",
                     "date",
                     "event_name",
                     "qol_metric",
-                    *text_cols,
-                    *code_cols,
+                    *[PolarsParsers.to_optional_utf8(pl.col(c)).str.strip_chars().alias(a) for c, a in questions.text_renames().items()],
+                    *[PolarsParsers.to_optional_int64(pl.col(c)).alias(a) for c, a in questions.code_renames().items()],
                 )
             )
 
@@ -1622,25 +1376,11 @@ class ImpressHarmonizer(BaseHarmonizer):
             items_col="items",
         )
 
-        def build_eq5d(pid: str, s: Mapping[str, Any]) -> EQ5D | None:
-            obj = EQ5D(patient_id=pid)
-            obj.date = s["date"]
-            obj.event_name = s["event_name"]
-            obj.qol_metric = s["qol_metric"]
-            for k, v in s.items():
-                m = question_col_re.search(k)
-                if m:
-                    qn = int(m.group(1))
-                    setattr(obj, f"q{qn}", v)
-                c = question_code_re.fullmatch(k)
-                if c:
-                    setattr(obj, f"q{int(c.group(1))}_code", v)
-            return obj
-
         self.hydrate_list_field(
             patients=self.patient_data,
             packed=packed,
-            builder=build_eq5d,
+            model=EQ5D,
+            fields={col: col for col in value_cols},
             skip_missing=False,
             target_attr="eq5d_list",
         )
@@ -1791,32 +1531,8 @@ class ImpressHarmonizer(BaseHarmonizer):
             patient_id = row["SubjectId"]
             self.patient_data[patient_id].has_clinical_benefit_at_week16 = bool(row["benefit_w16"])
 
-    def _process_eot_reason(self):
-        filtered = (
-            self.data.select("SubjectId", "EOT_EOTREOT")
-            .with_columns(
-                eot_reason=PolarsParsers.to_optional_utf8(pl.col("EOT_EOTREOT")).str.strip_chars(),
-            )
-            .filter(pl.col("eot_reason").is_not_null())
-        )
+    def _process_eot_reason(self) -> None:
+        self._apply_spec("end_of_treatment_reason")
 
-        for row in filtered.iter_rows(named=True):
-            patient_id = row["SubjectId"]
-            self.patient_data[patient_id].end_of_treatment_reason = row["eot_reason"]
-
-    def _process_eot_date(self):
-        """
-        Note: Docs mention progression date and EventDate as well,
-        but all patients in EOT source has EOTDAT,
-        EventDate is date recorded (so it's wrong) and progression date is tracked in TumorAssessment class.
-        fixme: EOT + Other sources of EOTs are in treatment_end_date method, so this shold probablky be removed
-        """
-        filtered = (
-            self.data.select("SubjectId", "EOT_EOTDAT")
-            .filter(pl.col("EOT_EOTDAT").is_not_null())
-            .with_columns(eot_date=PolarsParsers.to_optional_date(pl.col("EOT_EOTDAT")))
-        )
-
-        for row in filtered.iter_rows(named=True):
-            patient_id = row["SubjectId"]
-            self.patient_data[patient_id].end_of_treatment_date = row["eot_date"]
+    def _process_eot_date(self) -> None:
+        self._apply_spec("end_of_treatment_date")
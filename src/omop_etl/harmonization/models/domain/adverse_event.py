@@ -1,5 +1,4 @@
 from enum import Enum
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -28,7 +27,6 @@ class AdverseEvent(TrackedValidated):
         self._treatment_2_name: str | None = None
         self._was_serious_grade_expected_treatment_1: bool | None = None
         self._was_serious_grade_expected_treatment_2: bool | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def patient_id(self) -> str:
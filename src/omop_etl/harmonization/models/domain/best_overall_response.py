@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -11,7 +10,6 @@ class BestOverallResponse(TrackedValidated):
         self._response: str | None = None
         self._code: int | None = None
         self._date: dt.date | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def patient_id(self) -> str:
@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -13,7 +12,6 @@ class Biomarkers(TrackedValidated):
         self._cohort_target_name: str | None = None
         self._cohort_target_mutation: str | None = None
         self._date: dt.date | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def gene_and_mutation(self) -> str | None:
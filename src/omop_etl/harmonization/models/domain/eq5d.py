@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.make_validated_property import make_validated_property
@@ -10,7 +9,6 @@ class EQ5D(TrackedValidated):
     Q_COUNT = 5
 
     def __init__(self, patient_id: str):
-        self.updated_fields: Set[str] = set()
         self._patient_id = patient_id
         self._date: dt.date | None = None
         self._event_name: str | None = None
@@ -74,5 +72,5 @@ class EQ5D(TrackedValidated):
 
 # generate q1-q5 and q1_code-q5_code properties at class definition time
 for _i in range(1, EQ5D.Q_COUNT + 1):
-    setattr(EQ5D, f"q{_i}", make_validated_property(f"q{_i}", StrictValidators.validate_optional_str))
-    setattr(EQ5D, f"q{_i}_code", make_validated_property(f"q{_i}_code", StrictValidators.validate_optional_int))
+    setattr(EQ5D, f"q{_i}", make_validated_property(f"q{_i}", StrictValidators.validate_optional_str, str))
+    setattr(EQ5D, f"q{_i}_code", make_validated_property(f"q{_i}_code", StrictValidators.validate_optional_int, int))
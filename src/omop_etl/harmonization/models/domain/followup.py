@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -10,7 +9,6 @@ class FollowUp(TrackedValidated):
         self._patient_id = patient_id
         self._lost_to_followup: bool | None = None
         self._date_lost_to_followup: dt.datetime | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def patient_id(self) -> str:
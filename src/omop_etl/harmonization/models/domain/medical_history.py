@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -14,7 +13,6 @@ class MedicalHistory(TrackedValidated):
         self._end_date: dt.date | None = None
         self._status: str | None = None
         self._status_code: int | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def patient_id(self) -> str:
@@ -1,5 +1,3 @@
-from typing import Set
-
 from omop_etl.harmonization.core.track_validated import TrackedValidated
 from omop_etl.harmonization.core.validators import StrictValidators
 
@@ -11,7 +9,6 @@ class StudyDrugs(TrackedValidated):
         self._primary_treatment_drug_code: int | None = None
         self._secondary_treatment_drug: str | None = None
         self._secondary_treatment_drug_code: int | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def primary_treatment_drug(self) -> str | None:
@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -32,8 +31,6 @@ class TreatmentCycle(TrackedValidated):
         self._reason_tablet_not_taken: str | None = None
         self._was_tablet_taken_to_prescription_in_previous_cycle: bool | None = None
 
-        self.updated_fields: Set[str] = set()
-
     @property
     def patient_id(self) -> str:
         return self._patient_id
@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -19,7 +18,6 @@ class TumorAssessment(TrackedValidated):
         self._recist_date_of_progression: dt.date | None = None
         self._irecist_date_of_progression: dt.date | None = None
         self._event_id: str | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def patient_id(self) -> str:
@@ -1,4 +1,3 @@
-from typing import Set
 import datetime as dt
 
 from omop_etl.harmonization.core.track_validated import TrackedValidated
@@ -15,7 +14,6 @@ class TumorAssessmentBaseline(TrackedValidated):
         self._target_lesion_measurement_date: dt.date | None = None
         self._number_off_target_lesions: int | None = None
         self._off_target_lesion_measurement_date: dt.date | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def patient_id(self) -> str:
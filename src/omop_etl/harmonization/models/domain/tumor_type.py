@@ -1,5 +1,3 @@
-from typing import Set
-
 from omop_etl.harmonization.core.track_validated import TrackedValidated
 from omop_etl.harmonization.core.validators import StrictValidators
 
@@ -13,7 +11,6 @@ class TumorType(TrackedValidated):
         self._main_tumor_type_code: int | None = None
         self._cohort_tumor_type: str | None = None
         self._other_tumor_type: str | None = None
-        self.updated_fields: Set[str] = set()
 
     @property
     def icd10_code(self) -> str | None:
@@ -26,7 +23,6 @@ class TumorType(TrackedValidated):
             value=value,
             validator=StrictValidators.validate_optional_str,
         )
-        self.updated_fields.add(self.__class__.icd10_code.fset.__name__)
 
     @property
     def icd10_description(self) -> str | None:
@@ -1,12 +1,20 @@
 from dataclasses import field, dataclass
-from typing import Iterable, Dict, Any, Callable, List
+from pathlib import Path
+from typing import Iterable, Iterator, Dict, Any, Callable, List, Sequence, Tuple
+
+import polars as pl
 
 from omop_etl.harmonization.models.patient import Patient
+from omop_etl.harmonization.core.rehydrate import patients_from_normalized, read_manifest, scan_normalized
+from omop_etl.harmonization.core.spill import PatientSpillStore
+from omop_etl.harmonization.core.track_validated import mutation_count
 from omop_etl.harmonization.core.serialize import (
     to_normalized,
     build_nested_df,
     to_wide,
+    to_wide_lazy,
     export_leaf_object,
+    _sort_wide,
 )
 
 
@@ -14,14 +22,45 @@ from omop_etl.harmonization.core.serialize import (
 class HarmonizedData:
     """
     Stores all patient data for a processed trial
+
+    The nested patient frame behind the wide and normalized views is built once and reused until
+    `patients` is replaced, any of its entries is replaced, added or removed, or any tracked patient
+    field is updated.
     """
 
     trial_id: str
     patients: List[Patient] = field(default_factory=list)
+    _nested: Tuple[List[Patient], Tuple[Patient, ...], tuple, pl.DataFrame] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.trial_id}, {self.patients}"
 
+    @classmethod
+    def from_normalized(
+        cls,
+        directory: Path,
+        patient_cls: type[Patient] = Patient,
+        subjects: Sequence[str] | None = None,
+    ) -> HarmonizedData:
+        """
+        Rehydrate a normalized Parquet or IPC output (a `harmonized_norm/<fmt>` dir) written by the exporter.
+
+        Tables are located through the manifest and read in one collect; with `subjects`, only those
+        patients are read.
+        """
+        manifest = read_manifest(directory)
+        tables = scan_normalized(directory, manifest)
+        if subjects is not None:
+            wanted = pl.Series(list(subjects), dtype=pl.Utf8).implode()
+            tables = {name: lf.filter(pl.col("patient_id").is_in(wanted)) for name, lf in tables.items()}
+
+        frames = dict(zip(tables, pl.collect_all(list(tables.values()))))
+        patients = patients_from_normalized(frames, patient_cls)
+        trial_id = patients[0].trial_id if patients else str(manifest["trial"]).upper()
+        return cls(trial_id=trial_id, patients=patients)
+
     def filter(self, predicate: Callable[[Patient], bool]) -> HarmonizedData:
         """
         Filter patients using a predicate function.
@@ -40,7 +79,7 @@ class HarmonizedData:
 
     def to_dict(self) -> Dict[str, Any]:
         patients = []
-        for p in self.patients:
+        for p in self:
             # include ids
             d = export_leaf_object(p, exclude=set())
             # trial_id present in each record
@@ -49,23 +88,120 @@ class HarmonizedData:
         return {"trial_id": self.trial_id, "patients": patients}
 
     def ndjson_iter(self) -> Iterable[Dict[str, Any]]:
-        for p in self.patients:
+        for p in self:
             d = export_leaf_object(p, exclude=set())
             d.setdefault("trial_id", self.trial_id)
             yield d
 
-    def to_dataframe_wide(self, prefix_sep="."):
+    def to_dataframe_nested(self) -> pl.DataFrame:
         patient_cls = type(next(iter(self.patients), object()))
-        df_nested = build_nested_df(self.patients, patient_cls)
-        return to_wide(df_nested, prefix_sep)
+        state = (patient_cls, mutation_count())
+        if not self._nested_is_current(state):
+            # the snapshot holds the patients themselves, so replaced ones can't be recycled to the same id
+            self._nested = (self.patients, tuple(self.patients), state, build_nested_df(self.patients, patient_cls))
+        return self._nested[3]
+
+    def _nested_is_current(self, state: tuple) -> bool:
+        if self._nested is None:
+            return False
+        patients, snapshot, built_state, _ = self._nested
+        return (
+            patients is self.patients
+            and built_state == state
+            and len(snapshot) == len(self.patients)
+            and all(a is b for a, b in zip(snapshot, self.patients))
+        )
+
+    def to_dataframe_wide(self, prefix_sep="."):
+        return to_wide(self.to_dataframe_nested(), prefix_sep)
+
+    def to_lazyframe_wide(self, prefix_sep=".") -> pl.LazyFrame:
+        """Wide view as a lazy plan, for sinking to a file without materializing the wide frame"""
+        return to_wide_lazy(self.to_dataframe_nested(), prefix_sep)
 
     def to_frames_normalized(self, **_):
-        patient_cls = type(next(iter(self.patients), object()))
-        df_nested = build_nested_df(self.patients, patient_cls)
-        return to_normalized(df_nested)
+        return to_normalized(self.to_dataframe_nested())
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Patient]]:
+        for start in range(0, len(self.patients), batch_size):
+            yield self.patients[start : start + batch_size]
 
     def __iter__(self):
         return iter(self.patients)
 
+    def __len__(self) -> int:
+        return len(self.patients)
+
+    def __getitem__(self, item):
+        return self.patients[item]
+
+
+class SpilledHarmonizedData(HarmonizedData):
+    """
+    HarmonizedData backed by a PatientSpillStore: patients are kept on disk as normalized Parquet batches
+    and rehydrated one batch at a time, so iterating and exporting hold at most one batch of Patient objects.
+
+    `patients` still works but loads every batch, prefer iterating.
+    """
+
+    def __init__(self, trial_id: str, store: PatientSpillStore):
+        self.trial_id = trial_id
+        self.store = store
+
+    @classmethod
+    def spill(
+        cls,
+        trial_id: str,
+        patients: Iterable[Patient],
+        batch_size: int = 1000,
+        directory: Path | None = None,
+    ) -> SpilledHarmonizedData:
+        store = PatientSpillStore(batch_size=batch_size, directory=directory)
+        store.append(patients)
+        store.flush()
+        return cls(trial_id=trial_id, store=store)
+
+    @property
+    def patients(self) -> List[Patient]:
+        return list(self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.trial_id}, {len(self)} patients in {self.store.directory})"
+
+    def filter(self, predicate: Callable[[Patient], bool]) -> SpilledHarmonizedData:
+        store = PatientSpillStore(batch_size=self.store.batch_size, directory=self.store.directory.parent)
+        for batch in self.iter_batches():
+            store.append(p for p in batch if predicate(p))
+        store.flush()
+        return SpilledHarmonizedData(trial_id=self.trial_id, store=store)
+
+    def iter_batches(self, batch_size: int | None = None) -> Iterator[List[Patient]]:
+        """Spilled batches, batch_size is fixed by the store"""
+        return self.store.iter_batches()
+
+    def to_dataframe_wide(self, prefix_sep="."):
+        parts = [to_wide(build_nested_df(batch, self.store.patient_cls), prefix_sep) for batch in self.iter_batches()]
+        if not parts:
+            return HarmonizedData(trial_id=self.trial_id).to_dataframe_wide(prefix_sep)
+        return _sort_wide(pl.concat(parts, how="diagonal_relaxed"))
+
+    def to_lazyframe_wide(self, prefix_sep=".") -> pl.LazyFrame:
+        # batches are re-sorted across the store, nothing to gain from a lazy plan here
+        return self.to_dataframe_wide(prefix_sep).lazy()
+
+    def to_frames_normalized(self, **_):
+        frames: Dict[str, pl.DataFrame] = {}
+        for name, lf in self.store.scan_normalized().items():
+            order = ["patient_id", "row_index"] if "row_index" in lf.collect_schema() else ["patient_id"]
+            frames[name] = lf.sort(order, maintain_order=True).collect()
+        return frames
+
+    def __iter__(self):
+        for batch in self.iter_batches():
+            yield from batch
+
+    def __len__(self) -> int:
+        return len(self.store)
+
     def __getitem__(self, item):
         return self.patients[item]
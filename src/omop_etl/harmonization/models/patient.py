@@ -31,8 +31,6 @@ class Patient(TrackedValidated):
     """
 
     def __init__(self, patient_id: str, trial_id: str):
-        self.updated_fields: Set[str] = set()
-
         # scalars
         self._patient_id = patient_id
         self._trial_id = trial_id
@@ -289,7 +287,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.tumor_type.fset.__name__,
         )
-        self.updated_fields.add(TumorType.__name__)
+        self._mark_updated("tumor_type")
 
     @property
     def study_drugs(self) -> StudyDrugs | None:
@@ -303,7 +301,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.study_drugs.fset.__name__,
         )
-        self.updated_fields.add(StudyDrugs.__name__)
+        self._mark_updated("study_drugs")
 
     @property
     def biomarkers(self) -> Biomarkers | None:
@@ -317,7 +315,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.biomarkers.fset.__name__,
         )
-        self.updated_fields.add(Biomarkers.__name__)
+        self._mark_updated("biomarkers")
 
     @property
     def lost_to_followup(self) -> FollowUp | None:
@@ -331,7 +329,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.lost_to_followup.fset.__name__,
         )
-        self.updated_fields.add(FollowUp.__name__)
+        self._mark_updated("lost_to_followup")
 
     @property
     def ecog_baseline(self) -> EcogBaseline | None:
@@ -345,7 +343,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.ecog_baseline.fset.__name__,
         )
-        self.updated_fields.add(EcogBaseline.__name__)
+        self._mark_updated("ecog_baseline")
 
     @property
     def tumor_assessment_baseline(self) -> TumorAssessmentBaseline | None:
@@ -359,7 +357,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.tumor_assessment_baseline.fset.__name__,
         )
-        self.updated_fields.add(TumorAssessmentBaseline.__name__)
+        self._mark_updated("tumor_assessment_baseline")
 
     @property
     def best_overall_response(self) -> BestOverallResponse | None:
@@ -373,7 +371,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.best_overall_response.fset.__name__,
         )
-        self.updated_fields.add(BestOverallResponse.__name__)
+        self._mark_updated("best_overall_response")
 
     # collections
     @property
@@ -385,7 +383,7 @@ class Patient(TrackedValidated):
         self._medical_histories = self.validate_collection(
             value, item_type=MedicalHistory, patient_id=self._patient_id, field_name=self.__class__.medical_histories.fset.__name__
         )
-        self.updated_fields.add(self.__class__.medical_histories.fset.__name__)
+        self._mark_updated("medical_histories")
 
     @property
     def previous_treatments(self) -> tuple[PreviousTreatments, ...]:
@@ -396,7 +394,7 @@ class Patient(TrackedValidated):
         self._previous_treatments = self.validate_collection(
             value, item_type=PreviousTreatments, patient_id=self._patient_id, field_name=self.__class__.previous_treatments.fset.__name__
         )
-        self.updated_fields.add(self.__class__.previous_treatments.fset.__name__)
+        self._mark_updated("previous_treatments")
 
     @property
     def treatment_cycles(self) -> tuple[TreatmentCycle, ...]:
@@ -407,7 +405,7 @@ class Patient(TrackedValidated):
         self._treatment_cycles = self.validate_collection(
             value, item_type=TreatmentCycle, patient_id=self._patient_id, field_name=self.__class__.treatment_cycles.fset.__name__
         )
-        self.updated_fields.add(self.__class__.treatment_cycles.fset.__name__)
+        self._mark_updated("treatment_cycles")
 
     @property
     def concomitant_medications(self) -> tuple[ConcomitantMedication, ...]:
@@ -421,7 +419,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.concomitant_medications.fset.__name__,
         )
-        self.updated_fields.add(self.__class__.concomitant_medications.fset.__name__)
+        self._mark_updated("concomitant_medications")
 
     @property
     def adverse_events(self) -> tuple[AdverseEvent, ...]:
@@ -435,7 +433,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.adverse_events.fset.__name__,
         )
-        self.updated_fields.add(self.__class__.adverse_events.fset.__name__)
+        self._mark_updated("adverse_events")
 
     @property
     def tumor_assessments(self) -> tuple[TumorAssessment, ...]:
@@ -449,7 +447,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.tumor_assessments.fset.__name__,
         )
-        self.updated_fields.add(self.__class__.tumor_assessments.fset.__name__)
+        self._mark_updated("tumor_assessments")
 
     @property
     def c30_collection(self) -> tuple[C30, ...]:
@@ -463,7 +461,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.c30_collection.fset.__name__,
         )
-        self.updated_fields.add(self.__class__.c30_collection.fset.__name__)
+        self._mark_updated("c30_collection")
 
     @property
     def eq5d_collection(self) -> tuple[EQ5D, ...]:
@@ -477,7 +475,7 @@ class Patient(TrackedValidated):
             patient_id=self._patient_id,
             field_name=self.__class__.eq5d_collection.fset.__name__,
         )
-        self.updated_fields.add(self.__class__.eq5d_collection.fset.__name__)
+        self._mark_updated("eq5d_collection")
 
     @staticmethod
     def validate_singleton(
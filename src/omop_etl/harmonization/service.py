@@ -10,6 +10,7 @@ from omop_etl.infra.io.types import (
 )
 from omop_etl.infra.utils.run_context import RunMetadata
 from omop_etl.infra.io.format_utils import expand_formats
+from omop_etl.infra.io.options import WriterOptions
 from omop_etl.harmonization.core.dispatch import resolve_harmonizer
 from omop_etl.harmonization.models.harmonized import HarmonizedData
 from omop_etl.harmonization.core.pipeline import (
@@ -37,6 +38,12 @@ class HarmonizationService:
         formats: AnyFormatToken | Sequence[AnyFormatToken] = "csv",
         write_wide: bool = True,
         write_normalized: bool = True,
+        profile: bool = False,
+        incremental_from: Path | None = None,
+        spill_batch_size: int | None = None,
+        spill_dir: Path | None = None,
+        cache_dir: Path | None = None,
+        writer_options: WriterOptions | None = None,
     ) -> HarmonizedData:
         # normalize formats
         wide_fmts: List[WideFormat] = expand_formats(formats, allowed=WIDE_FORMATS)
@@ -55,4 +62,10 @@ class HarmonizationService:
             tabular_formats=tab_fmts,
             write_wide=write_wide,
             write_normalized=write_normalized,
+            profile=profile,
+            incremental_from=incremental_from,
+            spill_batch_size=spill_batch_size,
+            spill_dir=spill_dir,
+            cache_dir=cache_dir,
+            writer_options=writer_options,
         )
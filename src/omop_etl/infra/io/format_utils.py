@@ -8,7 +8,9 @@ _EXTENSIONS: Final[Mapping[str, str]] = MappingProxyType(
         "csv": ".csv",
         "tsv": ".tsv",
         "parquet": ".parquet",
+        "ipc": ".arrow",
         "json": ".json",
+        "ndjson": ".ndjson",
     },
 )
 
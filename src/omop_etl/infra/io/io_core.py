@@ -1,23 +1,45 @@
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterable, Iterator, Mapping
+from urllib.parse import quote
 import polars as pl
+import hashlib
+import io
 import json
+import zlib
 
+from omop_etl.infra.io.format_utils import ext
 from omop_etl.infra.io.json_encoder import ISOJSONEncoder
 from omop_etl.infra.io.options import (
     JsonOptions,
     ParquetOptions,
     CsvOptions,
+    IpcOptions,
+    PARTITION_BUCKET,
 )
 from omop_etl.infra.io.types import TabularFormat, POLARS_DTYPE_TO_NAME
 
+_WRITE_BUFFER = 1 << 20
+_HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
 
 @dataclass(frozen=True)
 class TableMeta:
     rows: int
     cols: int
     schema: Dict[str, str]
+    # hive partition path (relative to the table dir) -> rows, empty for single-file tables
+    partitions: Dict[str, int] = field(default_factory=dict)
+    # content_fingerprint of the written frame, None when the frame was streamed
+    fingerprint: str | None = None
+
+
+@dataclass(frozen=True)
+class FileMeta:
+    bytes: int
+    sha256: str
 
 
 @dataclass(frozen=True)
@@ -25,70 +47,241 @@ class WriterResult:
     main_file: Path
     table_files: Dict[str, Path]
     tables: Dict[str, TableMeta]
+    # every data file written, with size and hash taken while writing
+    files: Dict[Path, FileMeta] = field(default_factory=dict)
+
+
+def content_fingerprint(df: pl.DataFrame) -> str:
+    """
+    Hash of a frame's schema and rows in order, independent of the format and compression it is written with.
+    Polars row hashes are only stable within a Polars version, so the version is part of the fingerprint.
+    """
+    rows = df.hash_rows(seed=0) if df.width else pl.Series([0] * df.height, dtype=pl.UInt64)
+    keyed = pl.DataFrame([pl.int_range(0, df.height, dtype=pl.UInt64, eager=True), rows]).hash_rows(seed=1)
+    head = [pl.__version__, df.height, [[col, str(dtype)] for col, dtype in df.schema.items()]]
+    # 32 bit halves, so the sums stay exact up to 2**32 rows
+    sums = [int((keyed // (1 << 32)).sum() or 0), int((keyed % (1 << 32)).sum() or 0)]
+    return hashlib.sha256(json.dumps([*head, sums]).encode("utf-8")).hexdigest()
 
 
 def write_frame(
     df: pl.DataFrame,
     path: Path,
     fmt: TabularFormat,  # fixme: Type hint is invalid or refers to the expression which is not a correct type
-    opts: CsvOptions | ParquetOptions | None = None,
+    opts: CsvOptions | ParquetOptions | IpcOptions | None = None,
+    partition_lookup: pl.DataFrame | None = None,
 ) -> WriterResult:
+    """
+    Write `df` to `path` in `fmt`. Partitioned Parquet goes to hive directories under `path`, partition
+    columns the frame lacks are looked up by patient_id in `partition_lookup`.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
+    partitioned = fmt == "parquet" and isinstance(opts, ParquetOptions) and bool(opts.partition_columns)
     schema_map = _schema_to_manifest(df.schema)
+    partitions: Dict[str, int] = {}
+    files: Dict[Path, FileMeta] = {}
 
     if fmt in ("csv", "tsv"):
         if not isinstance(opts, CsvOptions):
             opts = CsvOptions(separator="\t" if fmt == "tsv" else ",")
 
-        df.write_csv(
-            path,
-            include_header=opts.include_header,
-            null_value=opts.null_value,
-            float_precision=opts.float_precision,
-            separator=opts.separator,
-        )
+        with _checksummed(path, files) as fb:
+            df.write_csv(
+                fb,
+                include_header=opts.include_header,
+                null_value=opts.null_value,
+                float_precision=opts.float_precision,
+                separator=opts.separator,
+            )
+
+    elif fmt == "parquet":
+        if not isinstance(opts, ParquetOptions):
+            opts = ParquetOptions()
+        if partitioned:
+            partitions = _write_partitioned_parquet(df, _partition_keys(df, opts, partition_lookup), path, opts, files)
+        else:
+            with _checksummed(path, files) as fb:
+                df.write_parquet(
+                    fb,
+                    compression=opts.compression,
+                    statistics=opts.statistics,
+                    row_group_size=opts.row_group_size,
+                    data_page_size=opts.data_page_size,
+                )
+
+    elif fmt == "ipc":
+        if not isinstance(opts, IpcOptions):
+            opts = IpcOptions()
+        with _checksummed(path, files) as fb:
+            df.write_ipc(fb, compression=opts.compression)
+
+    else:
+        raise ValueError(f"Unsupported tabular fmt: {fmt}")
+
+    meta = TableMeta(df.height, df.width, schema_map, partitions, content_fingerprint(df))
+    return WriterResult(main_file=path, table_files={}, tables={"wide": meta}, files=files)
+
+
+def sink_frame(
+    lf: pl.LazyFrame,
+    path: Path,
+    fmt: TabularFormat,
+    opts: CsvOptions | ParquetOptions | IpcOptions | None = None,
+) -> WriterResult:
+    """
+    Like `write_frame`, but streams a lazy plan into the file without collecting it first.
+    CSV/TSV records are counted while they are written, Parquet/IPC row counts come from the file metadata.
+    There is no content fingerprint (it needs the whole frame). Partitioned Parquet is collected and
+    written by `write_frame`.
+    """
+    if fmt == "parquet" and isinstance(opts, ParquetOptions) and opts.partition_columns:
+        return write_frame(lf.collect(), path, fmt, opts)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    schema = lf.collect_schema()
+    files: Dict[Path, FileMeta] = {}
+
+    if fmt in ("csv", "tsv"):
+        if not isinstance(opts, CsvOptions):
+            opts = CsvOptions(separator="\t" if fmt == "tsv" else ",")
+        with _checksummed(path, files, count_records=True) as fb:
+            lf.sink_csv(
+                fb,
+                include_header=opts.include_header,
+                null_value=opts.null_value,
+                float_precision=opts.float_precision,
+                separator=opts.separator,
+            )
+        rows = fb.raw.records - int(opts.include_header)
 
     elif fmt == "parquet":
         if not isinstance(opts, ParquetOptions):
             opts = ParquetOptions()
-        df.write_parquet(path, compression=opts.compression, statistics=opts.statistics)
+        with _checksummed(path, files) as fb:
+            lf.sink_parquet(
+                fb,
+                compression=opts.compression,
+                statistics=opts.statistics,
+                row_group_size=opts.row_group_size,
+                data_page_size=opts.data_page_size,
+            )
+        rows = pl.scan_parquet(path).select(pl.len()).collect().item()
+
+    elif fmt == "ipc":
+        if not isinstance(opts, IpcOptions):
+            opts = IpcOptions()
+        with _checksummed(path, files) as fb:
+            lf.sink_ipc(fb, compression=opts.compression)
+        rows = pl.scan_ipc(path).select(pl.len()).collect().item()
 
     else:
         raise ValueError(f"Unsupported tabular fmt: {fmt}")
 
-    meta = TableMeta(df.height, df.width, schema_map)
-    return WriterResult(main_file=path, table_files={}, tables={"wide": meta})
+    meta = TableMeta(rows, len(schema), _schema_to_manifest(schema))
+    return WriterResult(main_file=path, table_files={}, tables={"wide": meta}, files=files)
 
 
 def write_frames_dir(
     frames: Dict[str, pl.DataFrame],
     dirpath: Path,
     fmt: TabularFormat,
-    opts: CsvOptions | ParquetOptions | None = None,
+    opts: CsvOptions | ParquetOptions | IpcOptions | None = None,
+    max_workers: int | None = None,
 ) -> WriterResult:
-    dirpath.mkdir(parents=True, exist_ok=True)
-    files, metas = {}, {}
-    for name, df in frames.items():
-        if df.height == 0:
-            continue
+    """
+    Write each non-empty frame to `dirpath/<name>.<ext>`. Tables are written concurrently on a thread
+    pool (the Polars writers release the GIL), the result lists them in `frames` order.
 
-        ext = ".tsv" if fmt == "tsv" else (".csv" if fmt == "csv" else ".parquet")
-        path = dirpath / f"{name}{ext}"
-        write_frame(df, path, fmt, opts)
+    Partitioned Parquet tables are written to `dirpath/<name>/`, partition columns missing from a
+    table (e.g. cohort_name) are looked up from the patients table by patient_id to route its rows.
+    """
+    dirpath.mkdir(parents=True, exist_ok=True)
+    partitioned = fmt == "parquet" and isinstance(opts, ParquetOptions) and bool(opts.partition_columns)
+    suffix = "" if partitioned else ext(fmt)
+    tables = {name: df for name, df in frames.items() if df.height > 0}
+    lookup = frames.get("patients") if partitioned else None
+    files = {name: dirpath / f"{name}{suffix}" for name in tables}
 
-        files[name] = path
-        metas[name] = TableMeta(df.height, df.width, {c: str(t) for c, t in df.schema.items()})
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="write_frames") as pool:
+        futures = {name: pool.submit(write_frame, df, files[name], fmt, opts, lookup) for name, df in tables.items()}
+        results = {name: future.result() for name, future in futures.items()}
 
+    metas = {
+        name: TableMeta(
+            df.height,
+            df.width,
+            {c: str(t) for c, t in df.schema.items()},
+            results[name].tables["wide"].partitions,
+            results[name].tables["wide"].fingerprint,
+        )
+        for name, df in tables.items()
+    }
     main = files.get("patients") or next(iter(files.values()))
-    return WriterResult(main_file=main, table_files=files, tables=metas)
+    file_metas = {path: meta for result in results.values() for path, meta in result.files.items()}
+    return WriterResult(main_file=main, table_files=files, tables=metas, files=file_metas)
 
 
 def write_json(obj: dict | list, path: Path, opts: JsonOptions | None = None) -> WriterResult:
     j = opts or JsonOptions()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as fp:
+    files: Dict[Path, FileMeta] = {}
+    with _checksummed(path, files) as fb, io.TextIOWrapper(fb, encoding="utf-8") as fp:
         json.dump(obj, fp, cls=ISOJSONEncoder, ensure_ascii=j.ensure_ascii, indent=j.indent)  # type: ignore
-    return WriterResult(main_file=path, table_files={}, tables={})
+    return WriterResult(main_file=path, table_files={}, tables={}, files=files)
+
+
+def write_json_stream(
+    head: Mapping[str, Any],
+    key: str,
+    records: Iterable[dict],
+    path: Path,
+    opts: JsonOptions | None = None,
+) -> WriterResult:
+    """
+    Write `{**head, key: [*records]}` like `write_json`, encoding one record at a time through a
+    buffered file, so the document is never held in memory as a whole.
+    """
+    j = opts or JsonOptions()
+    encoder = ISOJSONEncoder(ensure_ascii=j.ensure_ascii, indent=j.indent)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if j.indent is None:
+        newline, inner, item_sep = "", "", ", "
+    else:
+        newline = "\n"
+        inner = newline + " " * j.indent
+        item_sep = ","
+
+    def nested(text: str) -> str:
+        # re-indent a record encoded at top level to its depth inside the document (2 levels)
+        return text.replace("\n", inner + " " * (j.indent or 0)) if j.indent is not None else text
+
+    files: Dict[Path, FileMeta] = {}
+    with _checksummed(path, files) as fb, io.TextIOWrapper(fb, encoding="utf-8") as fp:
+        fp.write("{")
+        for name, value in head.items():
+            fp.write(f"{inner}{encoder.encode(name)}: {nested(encoder.encode(value))}{item_sep}")
+        fp.write(f"{inner}{encoder.encode(key)}: [")
+        first = True
+        for record in records:
+            fp.write(("" if first else item_sep) + inner + " " * (j.indent or 0) + nested(encoder.encode(record)))
+            first = False
+        fp.write(("" if first else inner) + "]" + newline + "}")
+    return WriterResult(main_file=path, table_files={}, tables={}, files=files)
+
+
+def write_ndjson(records: Iterable[dict], path: Path, opts: JsonOptions | None = None) -> WriterResult:
+    """One JSON document per line, written record by record."""
+    j = opts or JsonOptions()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    files: Dict[Path, FileMeta] = {}
+
+    encoder = ISOJSONEncoder(ensure_ascii=j.ensure_ascii)
+    with _checksummed(path, files) as fb, io.TextIOWrapper(fb, encoding="utf-8") as fp:
+        for record in records:
+            fp.write(encoder.encode(record))
+            fp.write("\n")
+    return WriterResult(main_file=path, table_files={}, tables={}, files=files)
 
 
 def write_manifest(doc: dict, path: Path) -> None:
@@ -96,6 +289,58 @@ def write_manifest(doc: dict, path: Path) -> None:
     path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
 
 
+class _HashingFile(io.RawIOBase):
+    """
+    Unbuffered binary file that hashes and counts the bytes written to it, so checksums need no re-read.
+    With count_records, `records` counts the line breaks outside double-quoted fields, the records of a CSV.
+    """
+
+    def __init__(self, path: Path, count_records: bool = False):
+        self._file = open(path, "wb", buffering=0)
+        self._digest = hashlib.sha256()
+        self.size = 0
+        self.records: int | None = 0 if count_records else None
+        self._quoted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        written = self._file.write(data)
+        view = memoryview(data).cast("B")[:written]
+        self._digest.update(view)
+        self.size += written
+        if self.records is not None:
+            self._count_records(view.tobytes())
+        return written
+
+    def _count_records(self, chunk: bytes) -> None:
+        # every quote toggles quoting, an escaped quote ("") toggles twice
+        parts = chunk.split(b'"')
+        self.records += sum(part.count(b"\n") for part in parts[int(self._quoted) :: 2])
+        self._quoted ^= len(parts) % 2 == 0
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def meta(self) -> FileMeta:
+        return FileMeta(self.size, self._digest.hexdigest())
+
+
+@contextmanager
+def _checksummed(path: Path, files: Dict[Path, FileMeta], count_records: bool = False) -> Iterator[io.BufferedWriter]:
+    """
+    Buffered binary writer for `path`, its size and sha256 are added to `files` once it is closed.
+    With count_records, `writer.raw.records` holds the CSV record count after closing.
+    """
+    raw = _HashingFile(path, count_records)
+    with io.BufferedWriter(raw, buffer_size=_WRITE_BUFFER) as fb:
+        yield fb
+    files[path] = raw.meta()
+
+
 def _schema_to_manifest(schema: pl.Schema) -> dict[str, str]:
     """Converts pl.Schema to json-serialized mapping"""
     out: dict[str, str] = {}
@@ -106,3 +351,63 @@ def _schema_to_manifest(schema: pl.Schema) -> dict[str, str]:
             raise ValueError(f"Unsupported drype {dtype} for column {col}, add to POALRS_DTYPE_TO_NAME and NAME_TO_POLARS_DTYPE")
 
     return out
+
+
+def _partition_keys(df: pl.DataFrame, opts: ParquetOptions, lookup: pl.DataFrame | None = None) -> pl.DataFrame:
+    """
+    Partition values per row of `df`, only used to route rows to partition directories, the files keep the
+    frame's own columns and values. Columns the frame lacks come from `lookup` by patient_id, values are
+    filled per patient so rows that only the base row carries a value for (the collection rows of a wide
+    frame) land in the patient's partition, and the bucket is derived from patient_id.
+    """
+    missing = [col for col in opts.partition_by if col not in df.columns]
+    ids = ["patient_id"] if "patient_id" in df.columns else []
+    keys = df.select(*ids, *[col for col in opts.partition_columns if col in df.columns])
+    if missing and ids and lookup is not None and all(col in lookup.columns for col in missing):
+        patients = lookup.select("patient_id", *missing).unique("patient_id", keep="first", maintain_order=True)
+        keys = keys.join(patients, on="patient_id", how="left", maintain_order="left")
+        missing = []
+    if missing:
+        raise ValueError(f"Partition columns {missing} not in frame columns {df.columns}")
+
+    if opts.partition_by and ids:
+        keys = keys.with_columns(pl.col(col).fill_null(pl.col(col).drop_nulls().first().over("patient_id")) for col in opts.partition_by)
+
+    if opts.bucket_count is not None and PARTITION_BUCKET not in keys.columns:
+        # crc32, unlike Polars' hash, is stable across versions and runs
+        pids = [pid for pid in keys.get_column("patient_id").unique().to_list() if pid is not None]
+        buckets = {pid: zlib.crc32(pid.encode("utf-8")) % opts.bucket_count for pid in pids}
+        keys = keys.with_columns(
+            pl.col("patient_id").replace_strict(buckets, default=None, return_dtype=pl.UInt32).alias(PARTITION_BUCKET),
+        )
+    return keys.select(opts.partition_columns)
+
+
+def _write_partitioned_parquet(
+    df: pl.DataFrame,
+    keys: pl.DataFrame,
+    path: Path,
+    opts: ParquetOptions,
+    files: Dict[Path, FileMeta],
+) -> Dict[str, int]:
+    route = [f"__partition_{col}" for col in keys.columns]
+    routed = pl.concat([df, keys.rename(dict(zip(keys.columns, route)))], how="horizontal")
+    path.mkdir(parents=True, exist_ok=True)
+    partitions: Dict[str, int] = {}
+    for values, part in routed.partition_by(route, as_dict=True, maintain_order=True).items():
+        rel = Path(*(f"{key}={_hive_value(value)}" for key, value in zip(keys.columns, values)))
+        (path / rel).mkdir(parents=True, exist_ok=True)
+        with _checksummed(path / rel / "part-0.parquet", files) as fb:
+            part.drop(route).write_parquet(
+                fb,
+                compression=opts.compression,
+                statistics=opts.statistics,
+                row_group_size=opts.row_group_size,
+                data_page_size=opts.data_page_size,
+            )
+        partitions[rel.as_posix()] = part.height
+    return dict(sorted(partitions.items()))
+
+
+def _hive_value(value: Any) -> str:
+    return _HIVE_NULL if value is None else quote(str(value), safe="")
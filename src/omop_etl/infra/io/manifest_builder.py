@@ -17,7 +17,17 @@ def build_manifest(
     options: dict | None = None,
 ) -> dict:
     def to_dict(m: TableMeta) -> dict:
-        return {"rows": m.rows, "cols": m.cols, "schema": m.schema}
+        out = {"rows": m.rows, "cols": m.cols, "schema": m.schema}
+        if m.partitions:
+            out["partitions"] = m.partitions
+        if m.fingerprint is not None:
+            out["fingerprint"] = m.fingerprint
+        return out
+
+    def relative(path: Path) -> str:
+        # files are keyed relative to the output directory, so manifests compare across runs
+        path, root = path.absolute(), directory.absolute()
+        return path.relative_to(root).as_posix() if path.is_relative_to(root) else str(path)
 
     return {
         "trial": trial,
@@ -35,5 +45,6 @@ def build_manifest(
             }
             for name, meta in result.tables.items()
         },
+        "files": {relative(path): {"bytes": meta.bytes, "sha256": meta.sha256} for path, meta in sorted(result.files.items())},
         "options": options or {},
     }
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from typing import Final
 
-from omop_etl.infra.io.types import ParquetCompression
+from omop_etl.infra.io.types import IpcCompression, ParquetCompression
+
+PARTITION_BUCKET: Final[str] = "patient_bucket"
 
 
 @dataclass(frozen=True)
@@ -13,8 +16,36 @@ class CsvOptions:
 
 @dataclass(frozen=True)
 class ParquetOptions:
+    """
+    With `partition_by` and/or `bucket_count`, tables are written as hive-partitioned datasets
+    (`<table>/<col>=<value>/part-0.parquet`) instead of one file. `bucket_count` adds a
+    `patient_bucket` partition column, a stable hash of patient_id modulo bucket_count.
+    Partition values only route rows to directories, the files hold the frame's own columns and
+    values, so the written content is the same as unpartitioned. Hive readers add the directory
+    values as columns, read with `hive_partitioning=False` to get the content as written.
+    """
+
     compression: ParquetCompression = "zstd"
     statistics: bool = True
+    row_group_size: int | None = None
+    data_page_size: int | None = None
+    partition_by: tuple[str, ...] = ()
+    bucket_count: int | None = None
+
+    def __post_init__(self):
+        if self.bucket_count is not None and self.bucket_count < 1:
+            raise ValueError(f"bucket_count must be positive, got {self.bucket_count}")
+
+    @property
+    def partition_columns(self) -> tuple[str, ...]:
+        return (*self.partition_by, PARTITION_BUCKET) if self.bucket_count is not None else tuple(self.partition_by)
+
+
+@dataclass(frozen=True)
+class IpcOptions:
+    """Arrow IPC (Feather v2), uncompressed by default so readers can memory-map the files."""
+
+    compression: IpcCompression = "uncompressed"
 
 
 @dataclass(frozen=True)
@@ -29,4 +60,5 @@ class WriterOptions:
     csv: CsvOptions = CsvOptions()
     tsv: CsvOptions = CsvOptions(separator="\t")
     parquet: ParquetOptions = ParquetOptions()
+    ipc: IpcOptions = IpcOptions()
     json: JsonOptions = JsonOptions()
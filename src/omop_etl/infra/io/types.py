@@ -16,17 +16,19 @@ class Layout(StrEnum):
     TRIAL_TIMESTAMP_RUN = "trial_timestamp_run"
 
 
-TabularFormat = Literal["csv", "tsv", "parquet"]
-WideFormat = Literal["csv", "tsv", "parquet", "json"]
-AnyFormatToken = Literal["csv", "tsv", "parquet", "json", "all"]
+TabularFormat = Literal["csv", "tsv", "parquet", "ipc"]
+WideFormat = Literal["csv", "tsv", "parquet", "ipc", "json", "ndjson"]
+AnyFormatToken = Literal["csv", "tsv", "parquet", "ipc", "json", "ndjson", "all"]
 
 RunSource = Literal["api", "cli"]
 
-TABULAR_FORMATS: Final[tuple[TabularFormat, ...]] = ("csv", "tsv", "parquet")
-WIDE_FORMATS: Final[tuple[WideFormat, ...]] = ("csv", "tsv", "parquet", "json")
+TABULAR_FORMATS: Final[tuple[TabularFormat, ...]] = ("csv", "tsv", "parquet", "ipc")
+WIDE_FORMATS: Final[tuple[WideFormat, ...]] = ("csv", "tsv", "parquet", "ipc", "json", "ndjson")
 RUN_SOURCES: Final[frozenset[str]] = frozenset({"api", "cli"})
 
-ALIASES: Final[Mapping[str, str]] = MappingProxyType({"txt": "tsv"})
+IPC_SUFFIXES: Final[tuple[str, ...]] = (".arrow", ".ipc", ".feather")
+
+ALIASES: Final[Mapping[str, str]] = MappingProxyType({"txt": "tsv", "arrow": "ipc", "feather": "ipc"})
 
 FORMATS_BY_MODE: Final[Mapping[OutputMode, Sequence[str]]] = MappingProxyType(
     {OutputMode.WIDE: WIDE_FORMATS, OutputMode.NORMALIZED: TABULAR_FORMATS},
@@ -50,6 +52,8 @@ ParquetCompression: TypeAlias = Literal[
     "zstd",
 ]
 
+IpcCompression: TypeAlias = Literal["uncompressed", "lz4", "zstd"]
+
 POLARS_DTYPE_TO_NAME: dict[type[String | Int64 | Int32 | UInt64 | UInt32 | Float64 | Float32 | Boolean | Date | Datetime | Time], str] = {
     pl.String: "string",
     pl.Int64: "int64",
@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterable
 
 from omop_etl.harmonization.models.patient import Patient
 from omop_etl.concept_mapping.service import ConceptLookupService
@@ -27,7 +27,7 @@ class OmopService:
             VisitOccurrenceBuilder(concepts),
         ]
 
-    def build(self, patients: Sequence[Patient]) -> OmopTables:
+    def build(self, patients: Iterable[Patient]) -> OmopTables:
         """
         Build all OMOP tables from patient data.
         """
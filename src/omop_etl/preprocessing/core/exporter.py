@@ -87,7 +87,7 @@ class PreprocessExporter:
                     extra={"input": str(input_path), "output_dir": str(ctx.base_dir)},
                 )
 
-                wopts = opts.csv if fmt == "csv" else (opts.tsv if fmt == "tsv" else opts.parquet)
+                wopts = {"csv": opts.csv, "tsv": opts.tsv, "parquet": opts.parquet, "ipc": opts.ipc}.get(fmt)
                 result: WriterResult = write_frame(df, ctx.data_path, fmt, wopts)
 
                 manifest = build_manifest(
@@ -37,7 +37,7 @@ class PreprocessingRunOptions:
     combine_key: str = "SubjectId"
 
 
-OutputFormat = Literal["csv", "tsv", "parquet"]
+OutputFormat = Literal["csv", "tsv", "parquet", "ipc"]
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,74 @@
+import argparse
+import datetime as dt
+import random
+import time
+from typing import Callable
+
+import polars as pl
+
+from omop_etl.harmonization.core.parsers import PolarsParsers
+
+
+def make_date_frame(n_rows: int, partial_share: float = 0.05, seed: int = 0) -> pl.DataFrame:
+    """
+    eCRF-like date columns: mostly clean ISO strings with some NA markers, partial and NK dates,
+    plus the same values already typed as Date.
+    """
+    rng = random.Random(seed)
+    start = dt.date(2015, 1, 1)
+    partial = ["2020", "2020-05", "2020-NK-NK", "2020-NK-03", "2020-07-NK", "nk", "NA", ""]
+
+    values: list[str | None] = []
+    for _ in range(n_rows):
+        r = rng.random()
+        if r < 0.1:
+            values.append(None)
+        elif r < 0.1 + partial_share:
+            values.append(rng.choice(partial))
+        else:
+            values.append((start + dt.timedelta(days=rng.randrange(3650))).isoformat())
+
+    frame = pl.DataFrame({"iso": values}, schema={"iso": pl.Utf8})
+    return frame.with_columns(typed=pl.col("iso").str.strptime(pl.Date, "%Y-%m-%d", strict=False))
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def run(n_rows: int, repeat: int) -> dict[str, float]:
+    frame = make_date_frame(n_rows)
+    legacy = PolarsParsers._impute_partial_date
+
+    cases = {
+        "str_legacy": lambda: frame.select(legacy(pl.col("iso"), 15, 7)),
+        "str_fast": lambda: frame.select(PolarsParsers.to_optional_date("iso")),
+        "date_legacy": lambda: frame.select(legacy(pl.col("typed").cast(pl.Utf8), 15, 7)),
+        "date_fast": lambda: frame.select(PolarsParsers.to_optional_date("typed")),
+    }
+
+    expected = frame.select(legacy(pl.col("iso"), 15, 7)).to_series()
+    if not frame.select(PolarsParsers.to_optional_date("iso")).to_series().equals(expected):
+        raise AssertionError("fast path and legacy parser disagree")
+
+    return {name: _best_of(fn, repeat) for name, fn in cases.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark-date-parser", description="Benchmark PolarsParsers.to_optional_date.")
+    parser.add_argument("-n", "--rows", type=int, default=1_000_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, seconds in run(args.rows, args.repeat).items():
+        print(f"{name:<12} {seconds * 1000:9.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
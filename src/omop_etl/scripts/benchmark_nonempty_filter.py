@@ -0,0 +1,86 @@
+import argparse
+import datetime as dt
+import random
+import time
+from typing import Callable
+
+import polars as pl
+
+from omop_etl.harmonization.core.serialize import _filter_nonempty_rows
+
+
+def make_wide_frame(n_rows: int, n_columns: int = 60, fill: float = 0.15, seed: int = 0) -> pl.DataFrame:
+    """
+    Base-branch-like frame: ids plus sparse typed data columns (strings with some blanks, ints, floats,
+    dates and bools). Roughly a third of the rows are ids only.
+    """
+    rng = random.Random(seed)
+    kinds = [pl.Utf8, pl.Int64, pl.Float64, pl.Date, pl.Boolean]
+    start = dt.date(2015, 1, 1)
+    empty_rows = {i for i in range(n_rows) if rng.random() < 0.33}
+
+    def value(kind: pl.DataType) -> object:
+        if kind == pl.Utf8:
+            return rng.choice(["", " ", "Headache", "Grade 2", "NA"])
+        if kind == pl.Int64:
+            return rng.randrange(1000)
+        if kind == pl.Float64:
+            return rng.random() * 100
+        if kind == pl.Date:
+            return start + dt.timedelta(days=rng.randrange(3650))
+        return rng.random() < 0.5
+
+    columns: dict[str, pl.Series] = {
+        "patient_id": pl.Series([f"P{i:07d}" for i in range(n_rows)]),
+        "trial_id": pl.Series(["T"] * n_rows),
+    }
+    for c in range(n_columns):
+        kind = kinds[c % len(kinds)]
+        values = [value(kind) if i not in empty_rows and rng.random() < fill else None for i in range(n_rows)]
+        columns[f"col{c}"] = pl.Series(values, dtype=kind)
+    return pl.DataFrame(columns)
+
+
+def _legacy_filter(df: pl.DataFrame, data_columns: list[str]) -> pl.DataFrame:
+    # previous implementation, every column cast to a string and stripped
+    return df.filter(
+        pl.any_horizontal([pl.col(col).is_not_null() & (pl.col(col).cast(pl.Utf8).str.strip_chars() != "") for col in data_columns])
+    )
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def run(n_rows: int, n_columns: int, repeat: int) -> dict[str, float]:
+    frame = make_wide_frame(n_rows, n_columns)
+    data_columns = frame.columns[2:]
+
+    if not _filter_nonempty_rows(frame, data_columns).equals(_legacy_filter(frame, data_columns)):
+        raise AssertionError("dtype-aware filter and legacy filter disagree")
+
+    return {
+        "legacy": _best_of(lambda: _legacy_filter(frame, data_columns), repeat),
+        "dtype_aware": _best_of(lambda: _filter_nonempty_rows(frame, data_columns), repeat),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark-nonempty-filter", description="Benchmark serialize._filter_nonempty_rows.")
+    parser.add_argument("-n", "--rows", type=int, default=200_000)
+    parser.add_argument("-c", "--columns", type=int, default=60)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, seconds in run(args.rows, args.columns, args.repeat).items():
+        print(f"{name:<12} {seconds * 1000:9.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -17,6 +17,7 @@ from omop_etl.infra.io.io_core import (
     write_frame,
     write_manifest,
     write_json,
+    write_ndjson,
 )
 from omop_etl.infra.io.path_planner import (
     plan_single_file,
@@ -104,6 +105,13 @@ class SemanticExporter:
                     write_json(missing_dict, missing_path, opts.json)
                     matches_count = len(matches_dict)
                     missing_count = len(missing_dict)
+                elif fmt == "ndjson":
+                    matches_dict = batch_result.to_matches_dict()
+                    missing_dict = batch_result.to_missing_dict()
+                    matches_result = write_ndjson(matches_dict, matches_path, opts.json)
+                    write_ndjson(missing_dict, missing_path, opts.json)
+                    matches_count = len(matches_dict)
+                    missing_count = len(missing_dict)
                 elif fmt in {"csv", "tsv"}:
                     matches_df = batch_result.to_matches_df()
                     missing_df = batch_result.to_missing_df()
@@ -112,11 +120,12 @@ class SemanticExporter:
                     write_frame(missing_df, missing_path, fmt, format_opts)
                     matches_count = matches_df.height
                     missing_count = missing_df.height
-                elif fmt == "parquet":
+                elif fmt in {"parquet", "ipc"}:
                     matches_df = batch_result.to_matches_df()
                     missing_df = batch_result.to_missing_df()
-                    matches_result = write_frame(matches_df, matches_path, fmt, opts.parquet)
-                    write_frame(missing_df, missing_path, fmt, opts.parquet)
+                    format_opts = opts.parquet if fmt == "parquet" else opts.ipc
+                    matches_result = write_frame(matches_df, matches_path, fmt, format_opts)
+                    write_frame(missing_df, missing_path, fmt, format_opts)
                     matches_count = matches_df.height
                     missing_count = missing_df.height
                 else:
@@ -1,3 +1,4 @@
+from itertools import islice
 from pathlib import Path
 from typing import Set, Sequence, Dict
 
@@ -69,9 +70,11 @@ class SemanticLookupPipeline:
         )
 
         # validate FieldConfig against first 10 Patient instances
-        if not self._validated and harmonized_data.patients:
-            validate_field_paths(harmonized_data.patients[:10], configs)
-            self._validated = True
+        if not self._validated:
+            sample = list(islice(harmonized_data, 10))
+            if sample:
+                validate_field_paths(sample, configs)
+                self._validated = True
 
         # run lookup & collect queries
         all_queries = self._build_queries(harmonized_data=harmonized_data, configs=configs)
@@ -121,7 +124,7 @@ class SemanticLookupPipeline:
         configs: list[FieldConfig],
     ) -> list[Query]:
         all_queries: list[Query] = []
-        for patient in harmonized_data.patients:
+        for patient in harmonized_data:
             all_queries.extend(extract_queries(patient=patient, configs=configs))
         return all_queries
 
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from omop_etl.cli import main as cli
+
+
+def _load_args(*source: str) -> list[str]:
+    return ["load", *source, "--outdir", "out", "--static-mapping", "s.csv", "--structural-mapping", "m.csv"]
+
+
+@pytest.mark.parametrize("source", [(), ("--input", "in.csv", "--from-harmonized", "harmonized")])
+def test_load_requires_exactly_one_input_source(source: tuple[str, ...], capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(_load_args(*source))
+
+    assert exc.value.code == 2
+    assert "--input" in capsys.readouterr().err
+
+
+class _Writer:
+    def __init__(self, dsn: str, truncate_first: bool):
+        pass
+
+    def write(self, tables) -> None:
+        pass
+
+
+def test_load_from_harmonized_skips_the_pipeline(monkeypatch: pytest.MonkeyPatch):
+    loaded: list[Path] = []
+    monkeypatch.setattr(cli.HarmonizedData, "from_normalized", staticmethod(loaded.append))
+    monkeypatch.setattr(cli, "run_pipeline", lambda **_: pytest.fail("pipeline run for --from-harmonized"))
+    monkeypatch.setattr(cli, "_build_tables", lambda *_, **__: None)
+    monkeypatch.setattr(cli, "PostgresOmopWriter", _Writer)
+    monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/omop")
+
+    assert cli.main(_load_args("--from-harmonized", "harmonized")) == 0
+    assert loaded == [Path("harmonized")]
@@ -1774,3 +1774,45 @@ def eot_fixture() -> pl.DataFrame:
 
     records = [asdict(r) for r in rows]  # type: ignore
     return pl.from_dicts(records)
+
+
+_COHORT_FIXTURES = (
+    "subject_id_fixture",
+    "cohort_name_fixture",
+    "age_fixture",
+    "gender_fixture",
+    "tumor_type_fixture",
+    "study_drugs_fixture",
+    "biomarkers_fixture",
+    "date_of_death_fixture",
+    "lost_to_followup_fixture",
+    "evaluability_fixture",
+    "ecog_fixture",
+    "medical_history_fixture",
+    "adverse_event_number_fixture",
+    "serious_adverse_event_number_fixture",
+    "baseline_tumor_assessment_fixture",
+    "previous_treatment_fixture",
+    "treatment_start_fixture",
+    "treatment_stop_fixture",
+    "last_treatment_start_fixture",
+    "treatment_cycle_fixture",
+    "concomitant_medication_fixture",
+    "adverse_events_flag_fixture",
+    "adverse_events_fixture",
+    "tumor_assessments_fixture",
+    "best_overall_response_fixture",
+    "clinical_benefit_fixture",
+    "eot_fixture",
+)
+
+# columns read by processors that no fixture above covers
+_COHORT_EXTRA_COLUMNS = ("C30_EventName", "C30_EventDate", "EQ5D_EventName", "EQ5D_EQ5DVAS", "EQ5D_EventDate")
+
+
+@pytest.fixture
+def impress_cohort_fixture(request) -> pl.DataFrame:
+    """All processor fixtures stacked into one input, so a full harmonizer run touches every field."""
+    frames = [request.getfixturevalue(name) for name in _COHORT_FIXTURES]
+    cohort = pl.concat(frames, how="diagonal_relaxed").with_columns(pl.col(pl.Utf8).replace("", None))
+    return cohort.with_columns(pl.lit(None, dtype=pl.Utf8).alias(col) for col in _COHORT_EXTRA_COLUMNS)
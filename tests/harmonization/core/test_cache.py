@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from omop_etl.harmonization.core.cache import HarmonizationCache
+from omop_etl.harmonization.models.harmonized import HarmonizedData
+from omop_etl.harmonization.models.patient import Patient
+
+
+class _Harmonizer:
+    VERSION = "1"
+
+
+class _BumpedHarmonizer(_Harmonizer):
+    VERSION = "2"
+
+
+def test_cache_key_covers_input_bytes_and_harmonizer_version(tmp_path: Path):
+    inp = tmp_path / "input.csv"
+    inp.write_text("SubjectId\nP1\n")
+    key = HarmonizationCache.key(inp, _Harmonizer)
+
+    assert HarmonizationCache.key(inp, _Harmonizer) == key
+    assert HarmonizationCache.key(inp, _BumpedHarmonizer) != key
+
+    inp.write_text("SubjectId\nP2\n")
+    assert HarmonizationCache.key(inp, _Harmonizer) != key
+
+
+def test_cache_round_trips_patients(tmp_path: Path):
+    cache = HarmonizationCache(tmp_path / "cache")
+    patient = Patient("P1", "T")
+    patient.age = 50
+    patient.cohort_name = "A"
+
+    assert cache.load("k", trial_id="T") is None
+    cache.store("k", HarmonizedData("T", [patient]))
+
+    loaded = cache.load("k", trial_id="T")
+    assert [(p.patient_id, p.trial_id, p.age, p.cohort_name) for p in loaded] == [("P1", "T", 50, "A")]
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == ["k"]
@@ -1,11 +1,14 @@
 import json
+import logging
 from pathlib import Path
 from typing import Dict
 import polars as pl
 import pytest
 import datetime as dt
 
+from omop_etl.harmonization.core import exporter as exporter_module
 from omop_etl.harmonization.core.exporter import HarmonizedExporter
+from omop_etl.infra.io.io_core import write_frames_dir
 from omop_etl.infra.utils.run_context import RunMetadata
 from omop_etl.infra.io.types import (
     Layout,
@@ -58,11 +61,19 @@ class FakeHarmonizedData:
         }
 
         # for json output size
+        self.trial_id = "T"
         self.patients = [{"id": "P1"}, {"id": "P2"}]
+        self.wide_calls = 0
+        self.lazy_wide_calls = 0
 
     def to_dataframe_wide(self) -> pl.DataFrame:
+        self.wide_calls += 1
         return self._wide
 
+    def to_lazyframe_wide(self) -> pl.LazyFrame:
+        self.lazy_wide_calls += 1
+        return self._wide.lazy()
+
     def to_frames_normalized(self) -> Dict[str, pl.DataFrame]:
         return self._norm
 
@@ -73,6 +84,12 @@ class FakeHarmonizedData:
             "patients": [{"patient_id": "P1"}, {"patient_id": "P2"}],
         }
 
+    def ndjson_iter(self):
+        yield from self.to_dict()["patients"]
+
+    def __len__(self) -> int:
+        return len(self.patients)
+
 
 @pytest.fixture
 def fake_hd() -> FakeHarmonizedData:
@@ -107,7 +124,7 @@ def test_export_wide_csv(exporter: HarmonizedExporter, run_context: RunMetadata,
     assert Path(manifest["output"]).name == ctx.data_path.name
 
 
-@pytest.mark.parametrize("fmt", ["parquet", "json"])
+@pytest.mark.parametrize("fmt", ["parquet", "json", "ndjson"])
 def test_export_wide_other_formats(
     fmt: WideFormat, exporter: HarmonizedExporter, run_context: RunMetadata, fake_hd: FakeHarmonizedData, tmp_path: Path
 ):
@@ -129,7 +146,11 @@ def test_export_wide_other_formats(
     elif fmt == "json":
         assert ctx.data_path.suffix == ".json"
         data = json.loads(ctx.data_path.read_text())
-        assert "patients" in data
+        assert data == fake_hd.to_dict()
+    elif fmt == "ndjson":
+        assert ctx.data_path.suffix == ".ndjson"
+        lines = ctx.data_path.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == fake_hd.to_dict()["patients"]
 
     manifest = json.loads(ctx.manifest_path.read_text())
     assert manifest["format"] == fmt
@@ -173,3 +194,83 @@ def test_export_normalized(
     assert manifest["format"] == fmt
     assert manifest["mode"] == "normalized"
     assert Path(manifest["output"]).exists()
+
+
+def test_export_normalized_shares_table_writers_and_logs_start_on_submit(
+    exporter: HarmonizedExporter,
+    run_context: RunMetadata,
+    fake_hd: FakeHarmonizedData,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+):
+    calls = {}
+
+    def recording_write(frames, dirpath, fmt, opts, max_workers=None):
+        started = [r.fmt for r in caplog.records if r.getMessage() == "harmonize.export_normalized.start"]
+        calls[fmt] = (max_workers, fmt in started)
+        return write_frames_dir(frames, dirpath, fmt, opts, max_workers)
+
+    monkeypatch.setattr(exporter_module, "write_frames_dir", recording_write)
+    monkeypatch.setattr(exporter_module, "_WRITE_WORKERS", 4)
+    caplog.set_level(logging.INFO)
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("dummy\n")
+
+    exporter.export_normalized(hd=fake_hd, meta=run_context, input_path=input_path, formats=["csv", "parquet"])  # type: ignore
+
+    assert calls == {"csv": (2, True), "parquet": (2, True)}
+
+
+def test_export_wide_builds_frame_once_for_all_formats(
+    exporter: HarmonizedExporter, run_context: RunMetadata, fake_hd: FakeHarmonizedData, tmp_path: Path
+):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("dummy\n")
+
+    out = exporter.export_wide(hd=fake_hd, meta=run_context, input_path=input_path, formats=["csv", "tsv", "parquet", "json", "ndjson"])  # type: ignore
+
+    assert set(out) == {"csv", "tsv", "parquet", "json", "ndjson"}
+    assert fake_hd.wide_calls == 1
+    assert fake_hd.lazy_wide_calls == 0
+
+
+def test_export_wide_streams_single_tabular_format(
+    exporter: HarmonizedExporter, run_context: RunMetadata, fake_hd: FakeHarmonizedData, tmp_path: Path
+):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("dummy\n")
+
+    out = exporter.export_wide(hd=fake_hd, meta=run_context, input_path=input_path, formats=["parquet", "ndjson"])  # type: ignore
+
+    assert (fake_hd.wide_calls, fake_hd.lazy_wide_calls) == (0, 1)
+    assert pl.read_parquet(out["parquet"].data_path).equals(fake_hd._wide)
+    manifest = json.loads(out["parquet"].manifest_path.read_text())
+    assert manifest["tables"]["wide"]["rows"] == fake_hd._wide.height
+
+
+def test_harmonized_data_reuses_nested_frame_until_patients_change():
+    from omop_etl.harmonization.models.harmonized import HarmonizedData
+    from omop_etl.harmonization.models.patient import Patient
+
+    patient = Patient("P1", "T")
+    patient.age = 60
+    hd = HarmonizedData("T", [patient])
+
+    nested = hd.to_dataframe_nested()
+    assert hd.to_dataframe_nested() is nested
+    assert hd.to_frames_normalized()["patients"]["age"].to_list() == [60]
+
+    patient.age = 61
+    assert hd.to_dataframe_nested() is not nested
+    assert hd.to_frames_normalized()["patients"]["age"].to_list() == [61]
+
+    hd.patients.append(Patient("P2", "T"))
+    assert hd.to_dataframe_nested().height == 2
+
+    other = Patient("P3", "T")
+    other.age = 70
+    nested = hd.to_dataframe_nested()
+    hd.patients[0] = other
+    assert hd.to_dataframe_nested() is not nested
+    assert hd.to_frames_normalized()["patients"]["patient_id"].to_list() == ["P2", "P3"]
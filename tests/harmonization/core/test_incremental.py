@@ -0,0 +1,46 @@
+import polars as pl
+
+from omop_etl.harmonization.core.incremental import IncrementalState, plan_incremental, subject_hashes
+
+
+class _Harmonizer:
+    VERSION = "1"
+
+
+def test_subject_hashes_change_only_for_changed_subjects():
+    before = pl.DataFrame({"SubjectId": ["P1", "P1", "P2"], "x": [1, 2, 3]})
+    after = pl.DataFrame({"SubjectId": ["P2", "P1", "P1"], "x": [4, 1, 2]})
+
+    a, b = subject_hashes(before), subject_hashes(after)
+    assert a["P1"] == b["P1"]
+    assert a["P2"] != b["P2"]
+
+
+def test_plan_incremental_requires_matching_fingerprint():
+    df = pl.DataFrame({"SubjectId": ["P1", "P2"], "x": [1, 2]})
+    previous = IncrementalState.from_input(df, _Harmonizer)
+    current = IncrementalState.from_input(
+        df.with_columns(pl.when(pl.col("SubjectId") == "P2").then(9).otherwise(pl.col("x")).alias("x")), _Harmonizer
+    )
+
+    plan = plan_incremental(current, previous)
+    assert plan.unchanged == ["P1"]
+    assert plan.changed == ["P2"]
+
+    # schema change invalidates every subject
+    widened = IncrementalState.from_input(df.with_columns(y=pl.lit(0)), _Harmonizer)
+    assert plan_incremental(widened, previous).unchanged == []
+    assert plan_incremental(current, None).changed == ["P1", "P2"]
+
+
+def test_plan_incremental_reharmonizes_everything_after_a_version_bump():
+    df = pl.DataFrame({"SubjectId": ["P1", "P2"], "x": [1, 2]})
+    previous = IncrementalState.from_input(df, _Harmonizer)
+
+    class _Bumped(_Harmonizer):
+        VERSION = "2"
+
+    _Bumped.__qualname__ = _Harmonizer.__qualname__
+    plan = plan_incremental(IncrementalState.from_input(df, _Bumped), previous)
+    assert plan.unchanged == []
+    assert plan.changed == ["P1", "P2"]
@@ -65,6 +65,25 @@ def test_to_optional_date_partial_and_nk():
     ]
 
 
+def test_to_optional_date_passes_through_date_and_datetime():
+    dates = [dt.date(2020, 1, 2), None]
+    assert eval_expr(pp.to_optional_date("x"), dates, dtype=pl.Date) == dates
+
+    stamps = [dt.datetime(2020, 1, 2, 13, 45), None]
+    assert eval_expr(pp.to_optional_date("x"), stamps, dtype=pl.Datetime) == dates
+
+    assert eval_expr(pp.to_optional_date("x"), [None, None], dtype=pl.Null) == [None, None]
+
+
+def test_to_optional_date_fast_path_matches_full_imputation():
+    vals = ["2021-02-03", "nk", "2020-nk-nk", None, "2019-11", "garbage", "2018-12-31", "NA", ""]
+    fast = eval_expr(pp.to_optional_date("x"), vals, dtype=pl.Utf8)
+    full = eval_expr(pp._impute_partial_date(pl.col("x"), 15, 7), vals, dtype=pl.Utf8)
+    assert fast == full
+    assert fast[0] == dt.date(2021, 2, 3)
+    assert fast[2] == dt.date(2020, 7, 15)
+
+
 def test__as_expr_variants_equivalence():
     df = pl.DataFrame({"x": [1, 2, 3]})
     a = df.select(pp._as_expr("x").alias("out"))["out"].to_list()
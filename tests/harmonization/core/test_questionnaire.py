@@ -0,0 +1,27 @@
+from omop_etl.harmonization.core.questionnaire import resolve_questionnaire_schema
+from omop_etl.harmonization.harmonizers.impress import ImpressHarmonizer
+from omop_etl.harmonization.models.domain.c30 import C30
+
+
+def test_resolve_questionnaire_schema_maps_indices_to_columns():
+    columns = ["SubjectId", "C30_C30Q2", "C30_C30Q1CD", "C30_C30Q1", "C30_C30Q31", "C30_EventDate"]
+    schema = resolve_questionnaire_schema(columns, ImpressHarmonizer.C30_TEXT_PATTERN, ImpressHarmonizer.C30_CODE_PATTERN)
+
+    assert [q.index for q in schema.questions] == [1, 2]
+    assert schema.text_renames() == {"C30_C30Q1": "q1", "C30_C30Q2": "q2"}
+    assert schema.code_renames() == {"C30_C30Q1CD": "q1_code"}
+    assert schema.attributes() == ["q1", "q2", "q1_code"]
+
+
+def test_resolve_questionnaire_schema_is_cached_per_column_set():
+    columns = ["EQ5D_EQ5D1", "EQ5D_EQ5D1CD", "EQ5D_EQ5DVAS"]
+    a = resolve_questionnaire_schema(columns, ImpressHarmonizer.EQ5D_TEXT_PATTERN, ImpressHarmonizer.EQ5D_CODE_PATTERN)
+    b = resolve_questionnaire_schema(list(columns), ImpressHarmonizer.EQ5D_TEXT_PATTERN, ImpressHarmonizer.EQ5D_CODE_PATTERN)
+    assert a is b
+    assert a.text_cols == ["EQ5D_EQ5D1"]
+
+
+def test_generated_question_properties_have_declared_types():
+    types = C30.field_types()
+    assert types["q1"] is str
+    assert types["q30_code"] is int
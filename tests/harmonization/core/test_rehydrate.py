@@ -0,0 +1,118 @@
+import datetime as dt
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from omop_etl.harmonization.core.exporter import HarmonizedExporter
+from omop_etl.harmonization.core.rehydrate import patients_from_normalized
+from omop_etl.harmonization.harmonizers.impress import ImpressHarmonizer
+from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent, RelatedStatus
+from omop_etl.harmonization.models.domain.treatment_cycle import TreatmentCycle
+from omop_etl.harmonization.models.domain.tumor_type import TumorType
+from omop_etl.harmonization.models.harmonized import HarmonizedData
+from omop_etl.harmonization.models.patient import Patient
+from omop_etl.infra.io.types import TabularFormat
+from omop_etl.infra.utils.run_context import RunMetadata
+
+
+def _harmonized() -> HarmonizedData:
+    p1 = Patient("P1", "T")
+    p1.age = 50
+    p1.sex = "male"
+    p1.date_of_birth = dt.date(1970, 1, 1)
+    p1.has_any_adverse_events = True
+
+    ae = AdverseEvent("P1")
+    ae.term = "Nausea"
+    ae.grade = 2
+    ae.related_to_treatment_1_status = RelatedStatus.RELATED
+    ae.was_serious = False
+    ae2 = AdverseEvent("P1")
+    ae2.term = "Rash"
+    p1.adverse_events = [ae, ae2]
+
+    tt = TumorType("P1")
+    tt.icd10_code = "C25"
+    tt.main_tumor_type = "Pancreatic"
+    p1.tumor_type = tt
+
+    tc = TreatmentCycle("P1")
+    tc.cycle_type = "iv"
+    tc.was_total_dose_delivered = True
+    tc.start_date = dt.date(2020, 1, 1)
+    p1.treatment_cycles = [tc]
+
+    return HarmonizedData("T", [p1, Patient("P2", "T")])
+
+
+def test_patients_from_normalized_round_trips_parquet(tmp_path: Path):
+    frames = _harmonized().to_frames_normalized()
+    for name, frame in frames.items():
+        frame.write_parquet(tmp_path / f"{name}.parquet")
+
+    patients = patients_from_normalized({p.stem: pl.read_parquet(p) for p in tmp_path.glob("*.parquet")})
+    rebuilt = HarmonizedData("T", patients).to_frames_normalized()
+
+    assert rebuilt.keys() == frames.keys()
+    for name, frame in frames.items():
+        assert rebuilt[name].equals(frame), name
+
+    p1 = next(p for p in patients if p.patient_id == "P1")
+    assert p1.adverse_events[0].related_to_treatment_1_status is RelatedStatus.RELATED
+    assert p1.tumor_type.main_tumor_type == "Pancreatic"
+    assert "adverse_events" in p1.updated_fields
+
+
+def test_patients_from_normalized_empty():
+    frames = HarmonizedData("T", [Patient("P1", "T")]).to_frames_normalized()
+    assert patients_from_normalized({"patients": frames["patients"].head(0)}) == []
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "ipc"])
+def test_harmonized_data_from_normalized_export(tmp_path: Path, fmt: TabularFormat):
+    hd = _harmonized()
+    meta = RunMetadata(trial="t", run_id="r1", started_at="20240101T000000Z")
+    ctx = HarmonizedExporter(base_out=tmp_path).export_normalized(hd, meta=meta, input_path=tmp_path, formats=[fmt])[fmt]
+
+    loaded = HarmonizedData.from_normalized(ctx.data_dir)
+    assert loaded.trial_id == "T"
+    rebuilt = loaded.to_frames_normalized()
+    for name, frame in hd.to_frames_normalized().items():
+        assert rebuilt[name].equals(frame), name
+
+    subset = HarmonizedData.from_normalized(ctx.data_dir, subjects=["P2"])
+    assert [p.patient_id for p in subset] == ["P2"]
+    assert not subset[0].adverse_events
+
+
+def test_harmonized_data_from_normalized_rejects_wide_output(tmp_path: Path):
+    meta = RunMetadata(trial="t", run_id="r1", started_at="20240101T000000Z")
+    ctx = HarmonizedExporter(base_out=tmp_path).export_wide(_harmonized(), meta=meta, input_path=tmp_path, formats=["parquet"])["parquet"]
+
+    with pytest.raises(ValueError, match="not normalized"):
+        HarmonizedData.from_normalized(ctx.base_dir)
+
+
+def test_harmonized_cohort_round_trips_through_normalized(impress_cohort_fixture: pl.DataFrame):
+    harmonized = ImpressHarmonizer(data=impress_cohort_fixture, trial_id="IMPRESS").process()
+    frames = harmonized.to_frames_normalized()
+    assert frames["lost_to_followup"]["lost_to_followup.lost_to_followup"].drop_nulls().len() > 0
+
+    rebuilt = HarmonizedData("IMPRESS", patients_from_normalized(frames)).to_dict()
+    expected = harmonized.to_dict()
+
+    # normalized tables are ordered by patient_id
+    assert rebuilt["patients"] == sorted(expected["patients"], key=lambda p: p["patient_id"])
+    assert rebuilt == {**expected, "patients": rebuilt["patients"]}
+
+
+def test_patients_from_normalized_parses_string_dates():
+    frames = _harmonized().to_frames_normalized()
+    as_text = {name: frame.with_columns(pl.col(pl.Date).cast(pl.Utf8)) for name, frame in frames.items()}
+
+    patients = patients_from_normalized(as_text)
+
+    p1 = next(p for p in patients if p.patient_id == "P1")
+    assert p1.date_of_birth == dt.date(1970, 1, 1)
+    assert p1.treatment_cycles[0].start_date == dt.date(2020, 1, 1)
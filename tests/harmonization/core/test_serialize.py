@@ -8,7 +8,10 @@ from omop_etl.harmonization.core.serialize import (
     build_nested_schema,
     build_nested_df,
     to_wide,
+    to_wide_lazy,
     to_normalized,
+    _sort_wide,
+    _filter_nonempty_rows,
 )
 
 
@@ -168,6 +171,41 @@ def test_to_wide_no_nested_types(nested_df):
     assert all(not isinstance(tp, pl.List) and tp != pl.Struct for tp in wide.schema.values()), "ensure final frame is flat"
 
 
+def test_to_wide_orders_rows_by_patient_then_part(patients):
+    shuffled = build_nested_df(patients * 3, SerializeTestPatient).with_columns(
+        pl.Series("patient_id", ["P3", "P1", "P2", "P0", "P5", "P4"])
+    )
+    wide = to_wide(shuffled, prefix_sep=".")
+
+    assert wide.equals(_sort_wide(wide.sample(fraction=1.0, shuffle=True, seed=0)))
+    assert wide["patient_id"].unique(maintain_order=True).to_list() == ["P2", "P3", "P5"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_to_wide_lazy_matches_to_wide(nested_df, chunk_size):
+    frame = pl.concat([nested_df, nested_df.with_columns(pl.col("patient_id") + "b")])
+    assert to_wide_lazy(frame, ".", chunk_size=chunk_size).collect().equals(to_wide(frame, "."))
+
+
+def test_to_wide_lazy_ranks_patients_once(nested_df):
+    # the chunks slice an already keyed frame instead of re-ranking every patient per chunk
+    assert "arg_sort" not in to_wide_lazy(nested_df, ".", chunk_size=1).explain()
+
+
+def test_filter_nonempty_rows_strips_only_string_columns():
+    df = pl.DataFrame(
+        {
+            "s": [" ", None, None, None, None, "x"],
+            "n": [None, 0, None, None, None, None],
+            "b": [None, None, False, None, None, None],
+            "c": pl.Series([None, None, None, "  ", "y", None], dtype=pl.Categorical),
+        }
+    )
+    kept = _filter_nonempty_rows(df, df.columns)
+    assert kept.equals(df[[1, 2, 4, 5]])
+    assert _filter_nonempty_rows(df.lazy(), df.columns).collect().equals(kept)
+
+
 def test_to_normalized_tables_and_filters(nested_df):
     tables = to_normalized(nested_df)
     # patients table keeps both rows, IDs + primitives
@@ -188,3 +226,93 @@ def test_to_normalized_tables_and_filters(nested_df):
     assert ae.height == 2
     assert all(c in ae.columns for c in [*SerializeTypes.ID_COLUMNS, "row_index"])
     assert any(c.startswith("adverse_events.") for c in ae.columns)
+
+
+def test_export_skips_unset_tracked_fields_without_changing_output(monkeypatch):
+    from omop_etl.harmonization.core import serialize
+    from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent as TrackedAdverseEvent
+    from omop_etl.harmonization.models.patient import Patient
+
+    patient = Patient("P1", "T")
+    patient.age = 60
+    ae = TrackedAdverseEvent("P1")
+    ae.term = "Nausea"
+    patient.adverse_events = [ae]
+
+    skipped = serialize.build_nested_df([patient, Patient("P2", "T")], Patient)
+    monkeypatch.setattr(serialize, "_skippable_bits", lambda cls: {})
+    monkeypatch.setattr(serialize, "_serialization_plan", serialize._serialization_plan.__wrapped__)
+    monkeypatch.setattr(serialize, "_leaf_export_plan", serialize._leaf_export_plan.__wrapped__)
+    read_all = serialize.build_nested_df([patient, Patient("P2", "T")], Patient)
+
+    assert skipped.equals(read_all)
+
+
+def test_to_dict_keeps_empty_collections_and_hides_update_tracking():
+    from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent as TrackedAdverseEvent
+    from omop_etl.harmonization.models.domain.followup import FollowUp
+    from omop_etl.harmonization.models.harmonized import HarmonizedData
+    from omop_etl.harmonization.models.patient import Patient
+
+    patient = Patient("P1", "T")
+    followup = FollowUp("P1")
+    followup.lost_to_followup = False
+    patient.lost_to_followup = followup
+    ae = TrackedAdverseEvent("P1")
+    ae.term = "Rash"
+    patient.adverse_events = [ae]
+
+    p1, p2 = HarmonizedData("T", [patient, Patient("P2", "T")]).to_dict()["patients"]
+
+    assert p1["lost_to_followup"] == {"patient_id": "P1", "lost_to_followup": False, "date_lost_to_followup": None}
+    assert [event["term"] for event in p1["adverse_events"]] == ["Rash"]
+    assert "updated_mask" not in p1["adverse_events"][0]
+    for name in ("treatment_cycles", "medical_histories", "concomitant_medications", "tumor_assessments", "c30_collection"):
+        assert p1[name] == [] and p2[name] == [], name
+    assert p2["adverse_events"] == [] and p2["lost_to_followup"] is None
+
+
+def test_serialization_plan_resolves_field_kinds_once():
+    from omop_etl.harmonization.core.serialize import _serialization_plan
+
+    plan = _serialization_plan(SerializeTestPatient)
+
+    assert _serialization_plan(SerializeTestPatient) is plan
+    kinds = {field.name: field.kind for field in plan}
+    assert kinds["age"] == "scalar"
+    assert kinds["best_overall_response"] == "singleton"
+    assert kinds["adverse_events"] == "collection"
+
+
+def test_build_nested_df_columnar_matches_row_construction(patients):
+    from omop_etl.harmonization.core.serialize import export_leaf_object
+
+    rows = [
+        {
+            "patient_id": p.patient_id,
+            "trial_id": p.trial_id,
+            "age": p.age,
+            "best_overall_response": export_leaf_object(p.best_overall_response) if p.best_overall_response else None,
+            "adverse_events": [export_leaf_object(ae) for ae in p.adverse_events],
+        }
+        for p in patients
+    ]
+    schema = build_nested_schema(patients, SerializeTestPatient)
+    expected = pl.DataFrame(rows, schema=schema, strict=False, infer_schema_length=0)
+
+    assert build_nested_df(patients, SerializeTestPatient).equals(expected)
+
+
+def test_build_nested_df_reads_singleton_leaf_fields_once(patients, monkeypatch):
+    reads = []
+
+    def code(self) -> Optional[int]:
+        reads.append(self)
+        return self._code
+
+    monkeypatch.setattr(BestOverallResponse, "code", property(code))
+
+    df = build_nested_df(patients, SerializeTestPatient)
+
+    assert df.schema["best_overall_response"] == pl.Struct({"code": pl.Int64, "date": pl.Date})
+    assert len(reads) == 1
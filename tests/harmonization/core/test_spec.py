@@ -0,0 +1,71 @@
+import datetime as dt
+
+import polars as pl
+
+from omop_etl.harmonization.core.parsers import PolarsParsers
+from omop_etl.harmonization.core.spec import CollectionSpec, DerivedSpec, HarmonizerSpec, ScalarSpec, compile_spec
+from omop_etl.harmonization.models.domain.medical_history import MedicalHistory
+
+SPEC = HarmonizerSpec(
+    scalars=[
+        ScalarSpec("first_seen", source=pl.col("visit"), agg="first", parser=PolarsParsers.to_optional_date),
+        ScalarSpec("_last_seen", source=pl.col("visit"), agg="max", parser=PolarsParsers.to_optional_date),
+        ScalarSpec("flagged", source=pl.col("flag") == "y", agg="any"),
+    ],
+    derived=[
+        DerivedSpec(
+            "days_followed", expr=(pl.col("_last_seen") - pl.col("first_seen")).dt.total_days(), inputs=("first_seen", "_last_seen")
+        ),
+    ],
+    collections=[
+        CollectionSpec(
+            "medical_histories",
+            model=MedicalHistory,
+            fields={"term": PolarsParsers.to_optional_utf8(pl.col("term")), "sequence_id": PolarsParsers.to_optional_int64(pl.col("seq"))},
+            where=pl.col("term").is_not_null(),
+            order_by=("sequence_id",),
+        ),
+    ],
+)
+
+DATA = pl.DataFrame(
+    {
+        "SubjectId": ["P1", "P1", "P1", "P2"],
+        "visit": [None, "2020-01-01", "2020-01-11", "2021-05-05"],
+        "flag": ["n", "y", None, "n"],
+        "term": ["b", "a", "NA", None],
+        "seq": ["2", "1", "3", None],
+    }
+)
+
+
+def test_compile_spec_aggregates_scalars_per_subject():
+    scalars, collections = compile_spec(SPEC, DATA).collect()
+
+    assert scalars.columns == ["SubjectId", "first_seen", "flagged", "days_followed"]
+    assert scalars.rows() == [
+        ("P1", dt.date(2020, 1, 1), True, 10),
+        ("P2", dt.date(2021, 5, 5), False, 0),
+    ]
+
+    packed = collections["medical_histories"]
+    assert packed.get_column("SubjectId").to_list() == ["P1"]
+    assert [item["term"] for item in packed.get_column("items")[0]] == ["a", "b"]
+
+
+def test_select_keeps_inputs_of_derived_targets_but_only_assigns_selected():
+    selected = SPEC.select("days_followed")
+
+    assert [s.target for s in selected.scalars] == ["first_seen", "_last_seen"]
+    assert selected.assigned_scalars == ["days_followed"]
+    assert selected.collections == []
+
+    scalars, collections = compile_spec(selected, DATA).collect()
+    assert scalars.columns == ["SubjectId", "days_followed"]
+    assert collections == {}
+
+
+def test_scalars_share_one_group_by():
+    plan = compile_spec(SPEC, DATA).scalar_plan
+
+    assert plan.explain().count("AGGREGATE") == 1
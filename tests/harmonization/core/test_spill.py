@@ -0,0 +1,57 @@
+import datetime as dt
+from pathlib import Path
+
+from omop_etl.harmonization.core.spill import PatientSpillStore
+from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent
+from omop_etl.harmonization.models.harmonized import HarmonizedData, SpilledHarmonizedData
+from omop_etl.harmonization.models.patient import Patient
+
+
+def _patients(n: int) -> list[Patient]:
+    patients = []
+    for i in range(n):
+        p = Patient(f"P{i}", "T")
+        p.age = 40 + i
+        p.date_of_birth = dt.date(1980, 1, 1 + i)
+        events = []
+        for term in ["Nausea", "Rash"][: i % 3]:
+            ae = AdverseEvent(p.patient_id)
+            ae.term = term
+            events.append(ae)
+        p.adverse_events = events
+        patients.append(p)
+    return patients
+
+
+def test_spill_store_writes_full_batches_and_rehydrates(tmp_path: Path):
+    store = PatientSpillStore(batch_size=2, directory=tmp_path)
+    store.append(_patients(5))
+
+    assert len(store) == 5
+    assert len(list(store.directory.iterdir())) == 2
+
+    batches = list(store.iter_batches())
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [p.patient_id for b in batches for p in b] == ["P0", "P1", "P2", "P3", "P4"]
+    assert [ae.term for ae in batches[1][0].adverse_events] == ["Nausea", "Rash"]
+
+    store.close()
+    assert not store.directory.exists()
+
+
+def test_spilled_harmonized_data_exports_like_in_memory(tmp_path: Path):
+    in_memory = HarmonizedData("T", _patients(7))
+    spilled = SpilledHarmonizedData.spill("T", _patients(7), batch_size=3, directory=tmp_path)
+
+    assert len(spilled) == 7
+    assert [p.patient_id for p in spilled] == [p.patient_id for p in in_memory]
+    assert spilled.to_dataframe_wide().equals(in_memory.to_dataframe_wide())
+
+    expected = in_memory.to_frames_normalized()
+    frames = spilled.to_frames_normalized()
+    assert frames.keys() == expected.keys()
+    for name, frame in expected.items():
+        assert frames[name].equals(frame), name
+
+    adults = spilled.filter(lambda p: p.age >= 45)
+    assert [p.patient_id for p in adults] == ["P5", "P6"]
@@ -0,0 +1,143 @@
+import datetime as dt
+import polars as pl
+import pytest
+
+from omop_etl.harmonization.core.track_validated import UpdatedFields, mutation_count
+from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent, RelatedStatus
+from omop_etl.harmonization.models.domain.c30 import C30
+from omop_etl.harmonization.models.domain.tumor_type import TumorType
+from omop_etl.harmonization.models.patient import Patient
+
+AE_FIELDS = {
+    "term": "term",
+    "grade": "grade",
+    "start": "start_date",
+    "serious": "was_serious",
+    "rel": "related_to_treatment_1_status",
+}
+
+
+@pytest.fixture
+def ae_struct_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "term": ["Nausea", None],
+            "grade": [2, None],
+            "start": [dt.date(2020, 1, 2), None],
+            "serious": [True, None],
+            "rel": pl.Series(["related", None], dtype=pl.Enum(["related", "not_related", "unknown"])),
+        }
+    )
+
+
+def test_field_types_from_getter_annotations():
+    types = AdverseEvent.field_types()
+    assert types["term"] is str
+    assert types["grade"] is int
+    assert types["start_date"] is dt.date
+    assert types["related_to_treatment_1_status"] is RelatedStatus
+    # read-only identity is not settable
+    assert "patient_id" not in types
+
+
+def test_verify_struct_schema_accepts_typed_columns(ae_struct_frame):
+    AdverseEvent.verify_struct_schema(ae_struct_frame.schema, AE_FIELDS)
+
+
+@pytest.mark.parametrize(
+    "column,dtype",
+    [
+        ("term", pl.Int64),
+        ("grade", pl.Float64),
+        ("start", pl.Utf8),
+        ("serious", pl.Int8),
+        ("rel", pl.Utf8),
+    ],
+)
+def test_verify_struct_schema_rejects_mismatched_dtype(ae_struct_frame, column, dtype):
+    schema = dict(ae_struct_frame.schema)
+    schema[column] = dtype
+    with pytest.raises(TypeError):
+        AdverseEvent.verify_struct_schema(schema, AE_FIELDS)
+
+
+def test_verify_struct_schema_rejects_unknown_enum_categories(ae_struct_frame):
+    schema = dict(ae_struct_frame.schema)
+    schema["rel"] = pl.Enum(["related", "maybe"])
+    with pytest.raises(TypeError):
+        AdverseEvent.verify_struct_schema(schema, AE_FIELDS)
+
+
+def test_verify_struct_schema_null_columns_always_match(ae_struct_frame):
+    schema = {name: pl.Null for name in ae_struct_frame.columns}
+    AdverseEvent.verify_struct_schema(schema, AE_FIELDS)
+
+
+def test_from_struct_matches_validated_setters(ae_struct_frame):
+    AdverseEvent.verify_struct_schema(ae_struct_frame.schema, AE_FIELDS)
+    rows = ae_struct_frame.to_dicts()
+
+    fast = AdverseEvent.from_struct("P1", rows[0], AE_FIELDS)
+
+    slow = AdverseEvent("P1")
+    slow.term = "Nausea"
+    slow.grade = 2
+    slow.start_date = dt.date(2020, 1, 2)
+    slow.was_serious = True
+    slow.related_to_treatment_1_status = RelatedStatus.RELATED
+
+    assert repr(fast) == repr(slow)
+    assert fast.related_to_treatment_1_status is RelatedStatus.RELATED
+    assert fast.updated_fields == slow.updated_fields
+
+    empty = AdverseEvent.from_struct("P1", rows[1], AE_FIELDS)
+    assert empty.term is None
+    assert empty.related_to_treatment_1_status is None
+
+
+def test_from_columns_builds_one_object_per_position(ae_struct_frame):
+    columns = {name: ae_struct_frame.get_column(name).to_list() for name in AE_FIELDS}
+    objs = AdverseEvent.from_columns(["P1", "P2"], columns, AE_FIELDS)
+
+    assert [o.patient_id for o in objs] == ["P1", "P2"]
+    assert [o.term for o in objs] == ["Nausea", None]
+    assert [o.related_to_treatment_1_status for o in objs] == [RelatedStatus.RELATED, None]
+    assert all(o.updated_fields == set(AE_FIELDS.values()) for o in objs)
+
+
+def test_updated_fields_is_a_bitmask_backed_set_view():
+    ae = AdverseEvent("P1")
+    assert ae.updated_fields == set()
+
+    ae.term = "Nausea"
+    ae.grade = 2
+    assert ae.updated_fields == {"term", "grade"}
+    assert "term" in ae.updated_fields and "start_date" not in ae.updated_fields
+    assert ae._updated_mask.bit_count() == 2
+
+    ae.updated_fields.discard("grade")
+    ae.updated_fields.add("custom_marker")
+    assert set(ae.updated_fields) == {"term", "custom_marker"}
+
+    [bulk] = AdverseEvent.from_columns(["P2"], {"t": ["Rash"]}, {"t": "term"})
+    assert bulk.updated_fields == {"term"}
+    assert "_updated_mask" in vars(bulk) and "updated_fields" not in vars(bulk)
+
+
+def test_setters_mark_fields_without_the_updated_fields_view(monkeypatch: pytest.MonkeyPatch):
+    patient = Patient(patient_id="P1", trial_id="T")
+    tumor = TumorType("P1")
+    c30 = C30("P1")
+    before = mutation_count()
+
+    monkeypatch.setattr(UpdatedFields, "__init__", lambda *_: pytest.fail("updated_fields view built on set"))
+    tumor.icd10_code = "C18"
+    patient.tumor_type = tumor
+    patient.adverse_events = [AdverseEvent("P1")]
+    c30.q1 = "Not at all"
+    monkeypatch.undo()
+
+    assert mutation_count() - before == 4
+    assert {"tumor_type", "adverse_events"} <= set(patient.updated_fields)
+    assert set(tumor.updated_fields) == {"icd10_code"}
+    assert set(c30.updated_fields) == {"q1"}
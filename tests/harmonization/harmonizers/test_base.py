@@ -0,0 +1,79 @@
+import datetime as dt
+from typing import Any, Mapping
+import polars as pl
+import pytest
+
+from omop_etl.harmonization.harmonizers.base import BaseHarmonizer
+from omop_etl.harmonization.models.domain.medical_history import MedicalHistory
+from omop_etl.harmonization.models.patient import Patient
+
+MH_FIELDS = {"term": "term", "seq": "sequence_id", "start": "start_date"}
+
+
+@pytest.fixture
+def mh_frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "SubjectId": ["P2", "P1", "P1", "P3"],
+            "term": ["Asthma", "Diabetes", "Gout", None],
+            "seq": [1, 2, 1, None],
+            "start": [dt.date(2020, 1, 1), None, dt.date(2019, 5, 5), None],
+        }
+    )
+
+
+@pytest.fixture
+def patients() -> dict[str, Patient]:
+    return {pid: Patient(patient_id=pid, trial_id="T") for pid in ("P1", "P2", "P3")}
+
+
+def _build_mh(pid: str, s: Mapping[str, Any]) -> MedicalHistory:
+    obj = MedicalHistory(pid)
+    obj.term = s["term"]
+    obj.sequence_id = s["seq"]
+    obj.start_date = s["start"]
+    return obj
+
+
+def test_hydrate_list_field_fields_matches_builder(mh_frame, patients):
+    packed = BaseHarmonizer.pack_structs(mh_frame, value_cols=["term", "seq", "start"], order_by_cols=["seq"])
+
+    BaseHarmonizer.hydrate_list_field(packed, model=MedicalHistory, fields=MH_FIELDS, target_attr="medical_histories", patients=patients)
+    bulk = {pid: [repr(mh) for mh in p.medical_histories] for pid, p in patients.items()}
+
+    BaseHarmonizer.hydrate_list_field(packed, builder=_build_mh, target_attr="medical_histories", patients=patients)
+    per_item = {pid: [repr(mh) for mh in p.medical_histories] for pid, p in patients.items()}
+
+    assert bulk == per_item
+    assert [mh.term for mh in patients["P1"].medical_histories] == ["Gout", "Diabetes"]
+    assert len(patients["P3"].medical_histories) == 1
+
+
+def test_hydrate_list_field_fields_rejects_mismatched_schema(mh_frame, patients):
+    packed = BaseHarmonizer.pack_structs(mh_frame.with_columns(pl.col("seq").cast(pl.Utf8)), value_cols=["term", "seq", "start"])
+    with pytest.raises(TypeError):
+        BaseHarmonizer.hydrate_list_field(
+            packed, model=MedicalHistory, fields=MH_FIELDS, target_attr="medical_histories", patients=patients
+        )
+
+
+def test_hydrate_list_field_fields_missing_patient(mh_frame, patients):
+    packed = BaseHarmonizer.pack_structs(mh_frame, value_cols=["term", "seq", "start"])
+    patients.pop("P2")
+    with pytest.raises(KeyError):
+        BaseHarmonizer.hydrate_list_field(
+            packed, model=MedicalHistory, fields=MH_FIELDS, target_attr="medical_histories", patients=patients
+        )
+
+    BaseHarmonizer.hydrate_list_field(
+        packed, model=MedicalHistory, fields=MH_FIELDS, target_attr="medical_histories", patients=patients, skip_missing=True
+    )
+    assert len(patients["P1"].medical_histories) == 2
+
+
+def test_hydrate_list_field_requires_one_build_mode(mh_frame, patients):
+    packed = BaseHarmonizer.pack_structs(mh_frame, value_cols=["term", "seq", "start"])
+    with pytest.raises(ValueError):
+        BaseHarmonizer.hydrate_list_field(packed, target_attr="medical_histories", patients=patients)
+    with pytest.raises(ValueError):
+        BaseHarmonizer.hydrate_list_field(packed, fields=MH_FIELDS, target_attr="medical_histories", patients=patients)
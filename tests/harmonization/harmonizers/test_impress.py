@@ -1,6 +1,7 @@
 import datetime as dt
 import pytest
 
+from omop_etl.harmonization.core.profiling import HarmonizerProfiler
 from omop_etl.harmonization.harmonizers.impress import ImpressHarmonizer
 from omop_etl.harmonization.models.patient import Patient
 
@@ -46,6 +47,34 @@ def test_impress_cohort_name_processing(cohort_name_fixture):
     assert harmonizer.patient_data["cohort_hit_2"].cohort_name == "HER2exp/Cholangiocarcinoma/Pertuzumab+Traztuzumab"
 
 
+def test_run_processors_records_timings(cohort_name_fixture):
+    profiler = HarmonizerProfiler(trace_memory=True)
+    harmonizer = ImpressHarmonizer(data=cohort_name_fixture, trial_id="IMPRESS_TEST", profiler=profiler)
+    harmonizer._run_processors([harmonizer._process_patient_id, harmonizer._process_cohort_name])
+
+    timings = profiler.to_frame()
+    assert timings["processor"].to_list() == ["_process_patient_id", "_process_cohort_name"]
+    assert timings["rows_in"].to_list() == [cohort_name_fixture.height] * 2
+    # one record per patient, then one value per non-empty cohort name
+    assert timings["rows_out"].to_list() == [len(harmonizer.patient_data), 2]
+    assert timings["peak_python_bytes"].min() > 0
+    assert (timings["wall_s"] >= 0).all()
+
+
+def test_run_processors_counts_rows_without_walking_patients(cohort_name_fixture, monkeypatch):
+    harmonizer = ImpressHarmonizer(data=cohort_name_fixture, trial_id="IMPRESS_TEST", profiler=HarmonizerProfiler())
+    harmonizer._run_processors([harmonizer._process_patient_id])
+    monkeypatch.setattr(harmonizer, "patient_data", _UnwalkableDict(harmonizer.patient_data))
+    harmonizer._run_processors([harmonizer._process_cohort_name])
+
+    assert harmonizer.profiler.to_frame()["rows_out"].to_list() == [len(harmonizer.patient_data), 2]
+
+
+class _UnwalkableDict(dict):
+    def values(self):
+        pytest.fail("patient records walked")
+
+
 def test_gender_processing(gender_fixture):
     harmonizer = ImpressHarmonizer(data=gender_fixture, trial_id="IMPRESS_TEST")
 
@@ -722,6 +751,20 @@ def test_treatment_cycles(treatment_cycle_fixture):
     assert both_row_cycle.end_date == dt.date(1900, 1, 10)
 
 
+def test_treatment_cycles_frame_shared_with_evaluability(treatment_cycle_fixture):
+    harmonizer = ImpressHarmonizer(data=treatment_cycle_fixture, trial_id="IMPRESS_TEST")
+    for pid in treatment_cycle_fixture.select("SubjectId").unique().to_series().to_list():
+        harmonizer.patient_data[pid] = Patient(patient_id=pid, trial_id="IMPRESS_TEST")
+
+    harmonizer._process_evaluability()
+    base = harmonizer._treatment_cycles_frame()
+    harmonizer._process_treatment_cycle()
+
+    assert harmonizer._treatment_cycles_frame() is base
+    assert len(harmonizer.patient_data["iv_two_cycles"].treatment_cycles) == 2
+    assert harmonizer.patient_data["iv_two_cycles"].evaluable_for_efficacy_analysis is False
+
+
 def test_concomitant_medications(concomitant_medication_fixture):
     harmonizer = ImpressHarmonizer(data=concomitant_medication_fixture, trial_id="IMPRESS_TEST")
     for pid in concomitant_medication_fixture.select("SubjectId").unique().to_series().to_list():
@@ -4,7 +4,13 @@ import polars as pl
 import pytest
 
 from omop_etl.harmonization.service import HarmonizationService
+from omop_etl.harmonization.models.harmonized import HarmonizedData, SpilledHarmonizedData
+from omop_etl.harmonization.models.patient import Patient
+from omop_etl.harmonization.core import pipeline as pipeline_module
+from omop_etl.harmonization.core.incremental import load_previous_patients
 from omop_etl.harmonization.core.pipeline import HarmonizationPipeline
+from omop_etl.infra.io.format_utils import ext
+from omop_etl.infra.io.options import ParquetOptions, WriterOptions
 from omop_etl.infra.io.types import Layout
 from omop_etl.infra.utils.run_context import RunMetadata
 
@@ -19,12 +25,16 @@ def custom_config_file():
 
 class _FakeHD:
     def __init__(self):
-        self.patients = [{"patient_id": "P1"}]
+        self.patients = [Patient(patient_id="P1", trial_id="IMPRESS")]
 
     @staticmethod
     def to_dataframe_wide():
         return pl.DataFrame({"patient_id": ["P1"], "trial_id": ["IMPRESS"]})
 
+    @staticmethod
+    def to_lazyframe_wide():
+        return _FakeHD.to_dataframe_wide().lazy()
+
     @staticmethod
     def to_frames_normalized():
         return {"patients": pl.DataFrame({"patient_id": ["P1"], "trial_id": ["IMPRESS"]})}
@@ -47,19 +57,40 @@ def test__read_input_routes_by_suffix(tmp_path: Path):
     csv = tmp_path / "x.csv"
     tsv = tmp_path / "x.tsv"
     pq = tmp_path / "x.parquet"
+    ipc = tmp_path / "x.arrow"
 
     pl.DataFrame({"a": [1]}).write_csv(csv)
     pl.DataFrame({"a": [2]}).write_csv(tsv, separator="\t")
     pl.DataFrame({"a": [3]}).write_parquet(pq)
+    pl.DataFrame({"a": [4]}).write_ipc(ipc)
 
-    assert HarmonizationPipeline._read_input(csv)["a"].to_list() == [1]
-    assert HarmonizationPipeline._read_input(tsv)["a"].to_list() == [2]
-    assert HarmonizationPipeline._read_input(pq)["a"].to_list() == [3]
+    assert HarmonizationPipeline._read_input(csv).collect()["a"].to_list() == [1]
+    assert HarmonizationPipeline._read_input(tsv).collect()["a"].to_list() == [2]
+    assert HarmonizationPipeline._read_input(pq).collect()["a"].to_list() == [3]
+    assert HarmonizationPipeline._read_input(ipc).collect()["a"].to_list() == [4]
 
     with pytest.raises(ValueError):
         HarmonizationPipeline._read_input(tmp_path / "x.xlsx")
 
 
+def test__read_input_prunes_columns_and_reads_multi_file_dirs(tmp_path: Path):
+    frame = pl.DataFrame({"SubjectId": ["P1", "P2"], "AE_AETERM": ["x", "y"], "XX_OTHER": [1, 2]})
+    pq = tmp_path / "x.parquet"
+    frame.write_parquet(pq)
+
+    pruned = HarmonizationPipeline._read_input(pq, columns=("SubjectId", "^AE_.*$"))
+    assert pruned.collect_schema().names() == ["SubjectId", "AE_AETERM"]
+
+    parts = tmp_path / "parts"
+    for i in range(2):
+        (parts / f"part={i}").mkdir(parents=True)
+        frame.slice(i, 1).write_parquet(parts / f"part={i}" / "data.parquet")
+        frame.slice(i, 1).write_csv(tmp_path / f"part-{i}.csv")
+
+    assert HarmonizationPipeline._read_input(parts, columns=("SubjectId",)).collect()["SubjectId"].sort().to_list() == ["P1", "P2"]
+    assert HarmonizationPipeline._read_input(tmp_path / "part-*.csv").collect().height == 2
+
+
 @pytest.fixture
 def run_meta() -> RunMetadata:
     return RunMetadata(trial="impress", run_id="abc123", started_at="20240101T000000Z")
@@ -107,7 +138,7 @@ def test_service_wide_csv(tmp_path: Path, run_meta: RunMetadata, monkeypatch):
     json.loads(manifest_p.read_text())
 
 
-@pytest.mark.parametrize("fmt", ["csv", "tsv", "parquet"])
+@pytest.mark.parametrize("fmt", ["csv", "tsv", "parquet", "ipc"])
 def test_service_normalized_tabular(tmp_path: Path, run_meta: RunMetadata, fmt: str, monkeypatch):
     _patch_resolver(monkeypatch)
     svc = HarmonizationService(
@@ -129,8 +160,7 @@ def test_service_normalized_tabular(tmp_path: Path, run_meta: RunMetadata, fmt:
     seg = f"{run_meta.started_at}_{run_meta.run_id}"
     base = tmp_path / "runs" / seg / "harmonized" / "impress" / "harmonized_norm" / fmt
     # patients table should exist
-    ext = ".tsv" if fmt == "tsv" else (".csv" if fmt == "csv" else ".parquet")
-    patients = base / f"patients{ext}"
+    patients = base / f"patients{ext(fmt)}"
     assert patients.is_file()
 
 
@@ -162,3 +192,284 @@ def test_service_both_modes_multiple_formats(tmp_path: Path, run_meta: RunMetada
     assert any(p.suffix == ".parquet" for p in wide_pq.glob("*.parquet"))
     assert (norm_csv / "patients.csv").is_file()
     assert (norm_pq / "patients.parquet").is_file()
+
+
+class _ProfiledFakeHarmonizer:
+    def __init__(self, df: pl.DataFrame, trial_id: str, profiler=None):
+        self.df = df
+        self.profiler = profiler
+
+    def process(self):
+        with self.profiler.measure("_process_patient_id", rows_in=2):
+            pass
+        return _FakeHD()
+
+
+def test_service_profile_writes_timings_next_to_manifest(tmp_path: Path, run_meta: RunMetadata):
+    svc = HarmonizationService(
+        outdir=tmp_path,
+        layout=Layout.TRIAL_RUN,
+        harmonizer_resolver=lambda _: _ProfiledFakeHarmonizer,
+    )
+    inp = _make_input_csv(tmp_path)
+
+    svc.run(
+        trial="IMPRESS",
+        write_wide=True,
+        write_normalized=False,
+        input_path=inp,
+        meta=run_meta,
+        formats=["csv"],
+        profile=True,
+    )
+
+    seg = f"{run_meta.started_at}_{run_meta.run_id}"
+    base = tmp_path / "runs" / seg / "harmonized" / "impress" / "harmonized_wide" / "csv"
+    timings = pl.read_csv(base / f"impress_{run_meta.run_id}_{run_meta.started_at}_harmonized_wide_timings.csv")
+    assert timings["processor"].to_list() == ["_process_patient_id"]
+    assert timings["rows_in"].to_list() == [2]
+    assert timings["rows_out"].to_list() == [0]
+
+
+class _CohortHarmonizer:
+    seen: list[str] = []
+
+    def __init__(self, df: pl.DataFrame, trial_id: str):
+        self.df = df
+        self.trial_id = trial_id
+
+    def process(self):
+        patients = []
+        for sid, cohort in self.df.select("SubjectId", "COH_COHORTNAME").iter_rows():
+            patient = Patient(patient_id=sid, trial_id=self.trial_id)
+            patient.cohort_name = cohort
+            patients.append(patient)
+        _CohortHarmonizer.seen.extend(p.patient_id for p in patients)
+        return HarmonizedData(trial_id=self.trial_id, patients=patients)
+
+
+def test_service_incremental_reuses_unchanged_subjects(tmp_path: Path):
+    svc = HarmonizationService(
+        outdir=tmp_path,
+        layout=Layout.TRIAL_RUN,
+        harmonizer_resolver=lambda _: _CohortHarmonizer,
+    )
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B"]}).write_csv(inp)
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["parquet"], write_wide=False)
+    previous = tmp_path / "runs" / f"{first.started_at}_{first.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+    assert (previous / f"impress_{first.run_id}_{first.started_at}_harmonized_norm_subject_hashes.json").is_file()
+
+    pl.DataFrame({"SubjectId": ["P1", "P2", "P3"], "COH_COHORTNAME": ["A", "B2", "C"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+
+    second = RunMetadata(trial="impress", run_id="run2", started_at="20240108T000000Z")
+    hd = svc.run(trial="IMPRESS", input_path=inp, meta=second, formats=["parquet"], write_wide=False, incremental_from=previous)
+
+    assert sorted(_CohortHarmonizer.seen) == ["P2", "P3"]
+    assert [(p.patient_id, p.cohort_name) for p in hd.patients] == [("P1", "A"), ("P2", "B2"), ("P3", "C")]
+
+    out = tmp_path / "runs" / f"{second.started_at}_{second.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+    assert pl.read_parquet(out / "patients.parquet")["cohort_name"].to_list() == ["A", "B2", "C"]
+
+
+def test_service_incremental_reharmonizes_all_subjects_after_a_version_bump(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    svc = HarmonizationService(outdir=tmp_path, layout=Layout.TRIAL_RUN, harmonizer_resolver=lambda _: _CohortHarmonizer)
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B"]}).write_csv(inp)
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["parquet"], write_wide=False)
+    previous = tmp_path / "runs" / f"{first.started_at}_{first.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+
+    monkeypatch.setattr(_CohortHarmonizer, "VERSION", "2", raising=False)
+    _CohortHarmonizer.seen = []
+    second = RunMetadata(trial="impress", run_id="run2", started_at="20240108T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=second, formats=["parquet"], write_wide=False, incremental_from=previous)
+
+    assert sorted(_CohortHarmonizer.seen) == ["P1", "P2"]
+
+
+def test_service_incremental_and_full_runs_write_the_same_rows(tmp_path: Path):
+    svc = HarmonizationService(outdir=tmp_path, layout=Layout.TRIAL_RUN, harmonizer_resolver=lambda _: _CohortHarmonizer)
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P3", "P1", "P2"], "COH_COHORTNAME": ["C", "A", "B"]}).write_csv(inp)
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["parquet"], write_wide=False)
+    previous = tmp_path / "runs" / f"{first.started_at}_{first.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+
+    pl.DataFrame({"SubjectId": ["P3", "P1", "P2"], "COH_COHORTNAME": ["C2", "A", "B"]}).write_csv(inp)
+    runs = {}
+    for run_id, incremental_from in (("full", None), ("incr", previous)):
+        meta = RunMetadata(trial="impress", run_id=run_id, started_at="20240108T000000Z")
+        pipeline = HarmonizationPipeline(trial="IMPRESS", meta=meta, outdir=tmp_path, resolver=lambda _: _CohortHarmonizer)
+        pipeline.run(input_path=inp, wide_formats=["ndjson"], tabular_formats=[], incremental_from=incremental_from)
+        out = tmp_path / "runs" / f"{meta.started_at}_{run_id}" / "harmonized" / "impress" / "harmonized_wide" / "ndjson"
+        runs[run_id] = [json.loads(line) for line in next(out.glob("*.ndjson")).read_text().splitlines()]
+
+    assert [(p["patient_id"], p["cohort_name"]) for p in runs["full"]] == [("P1", "A"), ("P2", "B"), ("P3", "C2")]
+    assert runs["full"] == runs["incr"]
+
+
+def test_service_incremental_reads_previous_ipc_output(tmp_path: Path):
+    svc = HarmonizationService(
+        outdir=tmp_path,
+        layout=Layout.TRIAL_RUN,
+        harmonizer_resolver=lambda _: _CohortHarmonizer,
+    )
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B"]}).write_csv(inp)
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["ipc"], write_wide=False)
+    previous = tmp_path / "runs" / f"{first.started_at}_{first.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "ipc"
+
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B2"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+    second = RunMetadata(trial="impress", run_id="run2", started_at="20240108T000000Z")
+    hd = svc.run(trial="IMPRESS", input_path=inp, meta=second, formats=["ipc"], write_wide=False, incremental_from=previous)
+
+    assert _CohortHarmonizer.seen == ["P2"]
+    assert [(p.patient_id, p.cohort_name) for p in hd.patients] == [("P1", "A"), ("P2", "B2")]
+
+
+def test_service_partitioned_parquet_lists_partitions_and_feeds_incremental(tmp_path: Path):
+    svc = HarmonizationService(
+        outdir=tmp_path,
+        layout=Layout.TRIAL_RUN,
+        harmonizer_resolver=lambda _: _CohortHarmonizer,
+    )
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B"]}).write_csv(inp)
+    opts = WriterOptions(parquet=ParquetOptions(partition_by=("trial_id", "cohort_name")))
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["parquet"], write_wide=False, writer_options=opts)
+    previous = tmp_path / "runs" / f"{first.started_at}_{first.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+
+    manifest = json.loads(next(previous.glob("*_manifest.json")).read_text())
+    assert manifest["tables"]["patients"]["partitions"] == {"trial_id=IMPRESS/cohort_name=A": 1, "trial_id=IMPRESS/cohort_name=B": 1}
+    assert (previous / "patients" / "trial_id=IMPRESS" / "cohort_name=B" / "part-0.parquet").is_file()
+
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B2"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+    second = RunMetadata(trial="impress", run_id="run2", started_at="20240108T000000Z")
+    hd = svc.run(trial="IMPRESS", input_path=inp, meta=second, formats=["parquet"], write_wide=False, incremental_from=previous)
+
+    assert _CohortHarmonizer.seen == ["P2"]
+    assert [(p.patient_id, p.cohort_name) for p in hd.patients] == [("P1", "A"), ("P2", "B2")]
+
+
+def test_service_spill_harmonizes_subject_batches(tmp_path: Path, run_meta: RunMetadata):
+    svc = HarmonizationService(
+        outdir=tmp_path,
+        layout=Layout.TRIAL_RUN,
+        harmonizer_resolver=lambda _: _CohortHarmonizer,
+    )
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P3", "P1", "P2"], "COH_COHORTNAME": ["C", "A", "B"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+
+    hd = svc.run(
+        trial="IMPRESS",
+        input_path=inp,
+        meta=run_meta,
+        formats=["parquet"],
+        write_wide=False,
+        spill_batch_size=2,
+        spill_dir=tmp_path,
+    )
+
+    assert isinstance(hd, SpilledHarmonizedData)
+    assert _CohortHarmonizer.seen == ["P1", "P2", "P3"]
+    assert [len(batch) for batch in hd.iter_batches()] == [2, 1]
+
+    seg = f"{run_meta.started_at}_{run_meta.run_id}"
+    out = tmp_path / "runs" / seg / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+    assert pl.read_parquet(out / "patients.parquet")["cohort_name"].to_list() == ["A", "B", "C"]
+
+
+def test_service_spill_streams_reused_subjects_in_batches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    svc = HarmonizationService(outdir=tmp_path, layout=Layout.TRIAL_RUN, harmonizer_resolver=lambda _: _CohortHarmonizer)
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P1", "P2", "P3", "P4", "P5"], "COH_COHORTNAME": ["A", "B", "C", "D", "E"]}).write_csv(inp)
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["parquet"], write_wide=False)
+    previous = tmp_path / "runs" / f"{first.started_at}_{first.run_id}" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+
+    loaded: list[list[str]] = []
+
+    def load_batch(directory: Path, subjects: list[str]):
+        loaded.append(list(subjects))
+        return load_previous_patients(directory, subjects)
+
+    monkeypatch.setattr(pipeline_module, "load_previous_patients", load_batch)
+    pl.DataFrame({"SubjectId": ["P1", "P2", "P3", "P4", "P5"], "COH_COHORTNAME": ["A", "B", "C", "D", "E2"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+    second = RunMetadata(trial="impress", run_id="run2", started_at="20240108T000000Z")
+    hd = svc.run(
+        trial="IMPRESS",
+        input_path=inp,
+        meta=second,
+        formats=["parquet"],
+        write_wide=False,
+        incremental_from=previous,
+        spill_batch_size=2,
+        spill_dir=tmp_path,
+    )
+
+    assert _CohortHarmonizer.seen == ["P5"]
+    assert sorted(loaded) == [["P1", "P2"], ["P3", "P4"]]
+    assert sorted((p.patient_id, p.cohort_name) for p in hd) == [("P1", "A"), ("P2", "B"), ("P3", "C"), ("P4", "D"), ("P5", "E2")]
+
+
+def test_service_cache_skips_harmonization_for_unchanged_input(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    svc = HarmonizationService(
+        outdir=tmp_path,
+        layout=Layout.TRIAL_RUN,
+        harmonizer_resolver=lambda _: _CohortHarmonizer,
+    )
+    inp = tmp_path / "input.csv"
+    cache_dir = tmp_path / "cache"
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+
+    first = RunMetadata(trial="impress", run_id="run1", started_at="20240101T000000Z")
+    svc.run(trial="IMPRESS", input_path=inp, meta=first, formats=["csv"], write_normalized=False, cache_dir=cache_dir)
+    assert _CohortHarmonizer.seen == ["P1", "P2"]
+    assert len(list(cache_dir.iterdir())) == 1
+
+    second = RunMetadata(trial="impress", run_id="run2", started_at="20240108T000000Z")
+    with monkeypatch.context() as m:
+        # a hit must not parse the input
+        m.setattr(HarmonizationPipeline, "_read_input", staticmethod(lambda *_, **__: pytest.fail("input read on a cache hit")))
+        hd = svc.run(trial="IMPRESS", input_path=inp, meta=second, formats=["csv"], write_normalized=False, cache_dir=cache_dir)
+
+    assert _CohortHarmonizer.seen == ["P1", "P2"]
+    assert [(p.patient_id, p.cohort_name) for p in hd.patients] == [("P1", "A"), ("P2", "B")]
+
+    pl.DataFrame({"SubjectId": ["P1", "P2"], "COH_COHORTNAME": ["A", "B2"]}).write_csv(inp)
+    hd = svc.run(trial="IMPRESS", input_path=inp, meta=second, formats=["csv"], write_normalized=False, cache_dir=cache_dir)
+
+    assert _CohortHarmonizer.seen == ["P1", "P2", "P1", "P2"]
+    assert [p.cohort_name for p in hd.patients] == ["A", "B2"]
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_service_cache_hit_still_writes_subject_hashes(tmp_path: Path):
+    svc = HarmonizationService(outdir=tmp_path, layout=Layout.TRIAL_RUN, harmonizer_resolver=lambda _: _CohortHarmonizer)
+    inp = tmp_path / "input.csv"
+    pl.DataFrame({"SubjectId": ["P1"], "COH_COHORTNAME": ["A"]}).write_csv(inp)
+    _CohortHarmonizer.seen = []
+
+    for run_id in ("run1", "run2"):
+        meta = RunMetadata(trial="impress", run_id=run_id, started_at="20240101T000000Z")
+        svc.run(trial="IMPRESS", input_path=inp, meta=meta, formats=["parquet"], write_wide=False, cache_dir=tmp_path / "cache")
+
+    assert _CohortHarmonizer.seen == ["P1"]
+    out = tmp_path / "runs" / "20240101T000000Z_run2" / "harmonized" / "impress" / "harmonized_norm" / "parquet"
+    assert list(out.glob("*_subject_hashes.json"))
@@ -14,14 +14,16 @@ def allowed_tabular():
 
 @pytest.fixture
 def allowed_wide():
-    return "csv", "tsv", "parquet", "json"
+    return "csv", "tsv", "parquet", "json", "ndjson"
 
 
 def test_ext_valid():
     assert ext("csv") == ".csv"
     assert ext("tsv") == ".tsv"
     assert ext("parquet") == ".parquet"
+    assert ext("ipc") == ".arrow"
     assert ext("json") == ".json"
+    assert ext("ndjson") == ".ndjson"
 
 
 def test_ext_invalid_raises():
@@ -36,6 +38,7 @@ def test_expand_formats_simple_and_casefold(allowed_tabular):
 
 def test_expand_formats_aliases(allowed_tabular):
     assert expand_formats("txt", allowed=allowed_tabular) == ["tsv"]  # type: ignore
+    assert expand_formats(["feather", "arrow"], allowed=("csv", "ipc")) == ["ipc"]  # type: ignore
 
 
 def test_expand_formats_nested_lists(allowed_tabular):
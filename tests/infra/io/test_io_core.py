@@ -1,14 +1,23 @@
+import hashlib
 import json
+import zlib
 import datetime as dt
 from pathlib import Path
 import polars as pl
 import pytest
 
+from omop_etl.harmonization.models.domain.adverse_event import AdverseEvent
+from omop_etl.harmonization.models.harmonized import HarmonizedData
+from omop_etl.harmonization.models.patient import Patient
 from omop_etl.infra.io.io_core import (
+    content_fingerprint,
+    sink_frame,
     write_frame,
     write_frames_dir,
     write_json,
+    write_json_stream,
     write_manifest,
+    write_ndjson,
     TableMeta,
 )
 from omop_etl.infra.io.options import (
@@ -61,6 +70,56 @@ def test_write_frame_parquet(tmp_path: Path, df_people: pl.DataFrame):
     assert res.main_file == p
 
 
+def test_write_frame_ipc_round_trips(tmp_path: Path, df_people: pl.DataFrame):
+    p = tmp_path / "people.arrow"
+    res = write_frame(df_people, p, "ipc")
+    assert res.tables["wide"].rows == 2
+    assert pl.scan_ipc(p).collect().equals(df_people)
+
+
+@pytest.mark.parametrize("fmt, read", [("csv", pl.read_csv), ("parquet", pl.read_parquet), ("ipc", pl.read_ipc)])
+def test_sink_frame_streams_lazy_frame(tmp_path: Path, df_people: pl.DataFrame, fmt, read):
+    p = tmp_path / f"people.{fmt}"
+    res = sink_frame(df_people.lazy(), p, fmt)
+    assert read(p).equals(df_people)
+    assert (res.tables["wide"].rows, res.tables["wide"].cols) == df_people.shape
+    assert res.tables["wide"].schema == write_frame(df_people, tmp_path / f"eager.{fmt}", fmt).tables["wide"].schema
+
+
+@pytest.mark.parametrize("include_header", [True, False])
+def test_sink_frame_counts_csv_records_while_writing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, include_header: bool):
+    df = pl.DataFrame({"id": [1, 2, 3, 4], "note": ["two\nlines", 'say "hi"', None, '"\n"']})
+    monkeypatch.setattr(pl, "scan_csv", lambda *_, **__: pytest.fail("csv read back"))
+
+    res = sink_frame(df.lazy(), tmp_path / "notes.csv", "csv", CsvOptions(include_header=include_header))
+    assert res.tables["wide"].rows == df.height
+    monkeypatch.undo()
+    assert pl.read_csv(tmp_path / "notes.csv", has_header=include_header).height == df.height
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "ipc"])
+def test_write_frame_records_file_size_and_hash(tmp_path: Path, df_people: pl.DataFrame, fmt):
+    p = tmp_path / f"people.{fmt}"
+    res = write_frame(df_people, p, fmt)
+    data = p.read_bytes()
+    assert res.files[p].bytes == len(data)
+    assert res.files[p].sha256 == hashlib.sha256(data).hexdigest()
+    assert res.tables["wide"].fingerprint == content_fingerprint(df_people)
+
+    streamed = sink_frame(df_people.lazy(), tmp_path / f"sunk.{fmt}", fmt)
+    assert streamed.files[tmp_path / f"sunk.{fmt}"].sha256 == hashlib.sha256((tmp_path / f"sunk.{fmt}").read_bytes()).hexdigest()
+    assert streamed.tables["wide"].fingerprint is None
+
+
+def test_content_fingerprint_tracks_rows_order_and_schema(df_people: pl.DataFrame):
+    fp = content_fingerprint(df_people)
+    assert fp == content_fingerprint(df_people.clone())
+    assert fp != content_fingerprint(df_people.reverse())
+    assert fp != content_fingerprint(df_people.with_columns(pl.col("age").cast(pl.Int32)))
+    assert fp != content_fingerprint(df_people.with_columns(pl.when(pl.col("id") == 2).then(21).otherwise(pl.col("age")).alias("age")))
+    assert content_fingerprint(df_people.head(0)) != content_fingerprint(df_people.head(0).drop("age"))
+
+
 def test_write_frame_invalid_raises(tmp_path: Path, df_people: pl.DataFrame):
     with pytest.raises(ValueError, match="Unsupported tabular fmt"):
         write_frame(df_people, tmp_path / "x.xlsx", "xlsx")  # type: ignore
@@ -92,6 +151,87 @@ def test_write_frames_dir_parquet(tmp_path: Path, frames_norm: dict[str, pl.Data
     assert res.main_file == outdir / "patients.parquet"
 
 
+def test_write_frames_dir_ipc(tmp_path: Path, frames_norm: dict[str, pl.DataFrame]):
+    res = write_frames_dir(frames_norm, tmp_path / "dir_ipc", "ipc")
+    assert res.main_file == tmp_path / "dir_ipc" / "patients.arrow"
+    assert pl.scan_ipc(res.table_files["visits"]).collect().equals(frames_norm["visits"])
+
+
+def test_write_frames_dir_concurrent_keeps_table_order(tmp_path: Path):
+    frames = {f"t{i:02d}": pl.DataFrame({"patient_id": [f"p{i}"] * (i + 1), "v": list(range(i + 1))}) for i in range(20)}
+    res = write_frames_dir(frames, tmp_path / "many", "parquet", max_workers=4)
+
+    assert list(res.table_files) == list(frames)
+    assert list(res.tables) == list(frames)
+    for name, df in frames.items():
+        assert pl.read_parquet(res.table_files[name]).equals(df)
+
+
+def test_write_frames_dir_propagates_write_errors(tmp_path: Path, frames_norm: dict[str, pl.DataFrame]):
+    frames = {**frames_norm, "nested": pl.DataFrame({"patient_id": ["p1"], "items": [[1, 2]]})}
+    with pytest.raises(ValueError, match="column items"):
+        write_frames_dir(frames, tmp_path / "bad", "csv")
+
+
+def test_write_frames_dir_hive_partitioned_parquet(tmp_path: Path):
+    frames = {
+        "patients": pl.DataFrame({"patient_id": ["p1", "p2", "p3"], "trial_id": ["t", "t", "t"], "cohort_name": ["A b", "C", None]}),
+        "visits": pl.DataFrame({"patient_id": ["p1", "p1", "p3"], "trial_id": ["t", "t", "t"], "row_index": [0, 1, 0]}),
+    }
+    opts = ParquetOptions(partition_by=("trial_id", "cohort_name"), bucket_count=4, row_group_size=1)
+    res = write_frames_dir(frames, tmp_path / "hive", "parquet", opts)
+
+    assert res.main_file == tmp_path / "hive" / "patients"
+    bucket = {pid: zlib.crc32(pid.encode("utf-8")) % 4 for pid in ("p1", "p3")}
+    assert res.tables["visits"].partitions == {
+        f"trial_id=t/cohort_name=A%20b/patient_bucket={bucket['p1']}": 2,
+        f"trial_id=t/cohort_name=__HIVE_DEFAULT_PARTITION__/patient_bucket={bucket['p3']}": 1,
+    }
+    assert sum(res.tables["patients"].partitions.values()) == 3
+    # routed by the patients' cohort, written with the table's own columns
+    assert "cohort_name" not in res.tables["visits"].schema
+    assert (
+        res.tables["visits"].fingerprint == write_frame(frames["visits"], tmp_path / "visits.parquet", "parquet").tables["wide"].fingerprint
+    )
+    assert pl.read_parquet(res.table_files["visits"], hive_partitioning=False).columns == frames["visits"].columns
+
+    visits = pl.scan_parquet(res.table_files["visits"]).filter(pl.col("cohort_name") == "A b").collect()
+    assert visits.sort("row_index")["row_index"].to_list() == [0, 1]
+    again = write_frames_dir(frames, tmp_path / "again", "parquet", opts)
+    assert again.tables["patients"].partitions == res.tables["patients"].partitions
+    assert again.tables["patients"].fingerprint == res.tables["patients"].fingerprint
+
+    part_files = sorted(p for p in (tmp_path / "hive").rglob("*.parquet"))
+    assert sorted(res.files) == part_files
+    assert all(res.files[p].bytes == p.stat().st_size for p in part_files)
+
+
+def test_write_frame_partitions_wide_collection_rows_with_their_patient(tmp_path: Path):
+    patient = Patient(patient_id="p1", trial_id="t")
+    patient.cohort_name = "A"
+    event = AdverseEvent("p1")
+    event.term = "Headache"
+    patient.adverse_events = [event]
+    wide = HarmonizedData(trial_id="t", patients=[patient]).to_dataframe_wide()
+    assert wide.filter(pl.col("row_type") == "adverse_events")["cohort_name"].is_null().all()
+
+    res = write_frame(wide, tmp_path / "wide", "parquet", ParquetOptions(partition_by=("cohort_name",)))
+
+    assert res.tables["wide"].partitions == {"cohort_name=A": 2}
+    cohort = pl.scan_parquet(tmp_path / "wide").filter(pl.col("cohort_name") == "A").collect()
+    assert sorted(cohort["row_type"].to_list()) == ["adverse_events", "base"]
+
+    # the files hold the wide rows as they are, same content as the unpartitioned export
+    written = pl.read_parquet(tmp_path / "wide", hive_partitioning=False)
+    assert written.sort("row_type").equals(wide.sort("row_type"))
+    assert res.tables["wide"].fingerprint == write_frame(wide, tmp_path / "wide.parquet", "parquet").tables["wide"].fingerprint
+
+
+def test_write_frame_partition_column_missing_raises(tmp_path: Path, df_people: pl.DataFrame):
+    with pytest.raises(ValueError, match="Partition columns"):
+        write_frame(df_people, tmp_path / "x", "parquet", ParquetOptions(partition_by=("cohort_name",)))
+
+
 def test_write_json_serializes_dates(tmp_path: Path):
     p = tmp_path / "obj.json"
     obj = {"d": dt.date(2020, 1, 2), "ts": dt.datetime(2020, 1, 2, 3, 4, 5)}
@@ -104,6 +244,35 @@ def test_write_json_serializes_dates(tmp_path: Path):
     assert res.main_file == p
 
 
+@pytest.mark.parametrize("indent", [2, None])
+@pytest.mark.parametrize("n_records", [0, 2])
+def test_write_json_stream_matches_write_json(tmp_path: Path, indent: int | None, n_records: int):
+    records = [{"d": dt.date(2020, 1, 2), "items": [{"x": 1}], "name": "ø"}, {"items": []}][:n_records]
+    opts = JsonOptions(indent=indent)
+
+    write_json({"trial_id": "T", "patients": records}, tmp_path / "doc.json", opts)
+    res = write_json_stream({"trial_id": "T"}, "patients", iter(records), tmp_path / "stream.json", opts)
+
+    assert (tmp_path / "stream.json").read_text() == (tmp_path / "doc.json").read_text()
+    assert res.main_file == tmp_path / "stream.json"
+    assert res.files[res.main_file].sha256 == hashlib.sha256((tmp_path / "doc.json").read_bytes()).hexdigest()
+
+
+def test_write_ndjson_one_record_per_line(tmp_path: Path):
+    p = tmp_path / "records.ndjson"
+    res = write_ndjson(iter([{"d": dt.date(2020, 1, 2)}, {"n": 1}]), p)
+
+    assert [json.loads(line) for line in p.read_text().splitlines()] == [{"d": "2020-01-02"}, {"n": 1}]
+    assert res.files[p].bytes == p.stat().st_size
+
+
+def test_write_ndjson_bytes_do_not_depend_on_installed_encoders(tmp_path: Path):
+    p = tmp_path / "records.ndjson"
+    write_ndjson(iter([{"d": dt.date(2020, 1, 2)}, {"s": "é"}]), p, JsonOptions(ensure_ascii=False))
+
+    assert p.read_text(encoding="utf-8") == '{"d": "2020-01-02"}\n{"s": "é"}\n'
+
+
 def test_write_manifest_writes_pretty_json(tmp_path: Path):
     p = tmp_path / "manifest.json"
     doc = {"trial": "X", "fmt": "csv"}
@@ -205,3 +205,26 @@ def test_manifest_schema_columns(
     wide = manifest["tables"]["wide"]
     schema = wide["schema"]
     assert {"SubjectId", "age", "sex"}.issubset(schema.keys())
+
+
+def test_manifest_records_file_checksums_and_fingerprint(
+    exporter: PreprocessExporter,
+    run_context: RunMetadata,
+    sample_dataframe: pl.DataFrame,
+    tmp_path: Path,
+):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("dummy\n")
+
+    out = exporter.export_wide(df=sample_dataframe, meta=run_context, input_path=input_path, formats=["csv", "parquet"])
+    manifests = {fmt: json.loads(ctx.manifest_path.read_text()) for fmt, ctx in out.items()}
+
+    for fmt, ctx in out.items():
+        files = manifests[fmt]["files"]
+        assert list(files) == [ctx.data_path.name]
+        assert files[ctx.data_path.name]["bytes"] == ctx.data_path.stat().st_size
+        assert len(files[ctx.data_path.name]["sha256"]) == 64
+
+    # fingerprints depend on the frame, not on the format it was written in
+    assert manifests["csv"]["tables"]["wide"]["fingerprint"] == manifests["parquet"]["tables"]["wide"]["fingerprint"]
+    assert manifests["csv"]["files"] != manifests["parquet"]["files"]